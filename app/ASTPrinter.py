@@ -1,11 +1,16 @@
 from typing import List
 
-from app.Expr import ExprVisitor, Binary, Unary, Grouping, Literal, Variable
+from app.Dispatch import DispatchTable
+from app.Expr import ExprVisitor, Binary, Unary, Grouping, Literal, Variable, ArrayLiteral, Index, Call, expr_dispatch
 
 
 class AstPrinter(ExprVisitor):
+
+    def __init__(self) -> None:
+        self._handlers = DispatchTable(self, expr_dispatch)
+
     def print(self, expr):
-        return expr.accept(self)
+        return self._handlers[type(expr)](expr)
 
     def visit_binary(self, expr: Binary) -> str:
         return self.parenthesize(expr.operator.lexeme,
@@ -29,11 +34,20 @@ class AstPrinter(ExprVisitor):
     def visit_variable(self, expr: Variable) -> str:
         return f"var {expr.name}"
 
+    def visit_array_literal(self, expr: ArrayLiteral) -> str:
+        return self.parenthesize("array", *expr.elements)
+
+    def visit_index(self, expr: Index) -> str:
+        return self.parenthesize("index", expr.target, expr.index)
+
+    def visit_call(self, expr: Call) -> str:
+        return self.parenthesize("call", expr.callee, *expr.arguments)
+
     def parenthesize(self, name: str, *args) -> str:
         builder: List[str] = ["(", name]
         for expr in args:
             builder.append(" ")
-            builder.append(expr.accept(self))
+            builder.append(self._handlers[type(expr)](expr))
         builder.append(")")
         return ''.join(builder)
 
@@ -0,0 +1,120 @@
+"""Lox's numeric array value. The elements live in a NumPy float64 array when NumPy is installed and in an
+array('d') otherwise, and every whole-array operation is a single call into either: a NumPy ufunc, or map() of
+the operator over the elements. NumPy is imported by the first array a program builds, not at startup.
+
+Arrays are immutable. Arithmetic and comparisons broadcast a number over every element or pair up two arrays
+of the same length; a comparison gives a boolean array, which prints as true/false and is not a number."""
+import math
+import operator
+from array import array
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from app.Token import TokenType
+
+# Longer arrays print their first and last edge elements only
+print_limit = 10
+edge = 3
+
+_numpy: Any = False
+
+
+def numpy_module() -> Optional[Any]:
+    """numpy, or None when it is not installed"""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
+def divide(left: float, right: float) -> float:
+    """IEEE division as NumPy does it, x / 0 is an infinity or nan instead of an exception"""
+    if right:
+        return left / right
+    if left != left or not left:
+        return math.nan
+    return math.copysign(math.inf, left) * math.copysign(1.0, right)
+
+
+# Token type -> (NumPy ufunc name, Python function, result is boolean)
+operations: Dict[str, Any] = {
+    TokenType.PLUS: ('add', operator.add, False),
+    TokenType.MINUS: ('subtract', operator.sub, False),
+    TokenType.STAR: ('multiply', operator.mul, False),
+    TokenType.SLASH: ('true_divide', divide, False),
+    TokenType.GREATER: ('greater', operator.gt, True),
+    TokenType.GREATER_EQUAL: ('greater_equal', operator.ge, True),
+    TokenType.LESS: ('less', operator.lt, True),
+    TokenType.LESS_EQUAL: ('less_equal', operator.le, True),
+}
+
+
+def number_text(value: float) -> str:
+    text = str(float(value))
+    return text[:-2] if text.endswith(".0") else text
+
+
+class Array:
+    __slots__ = ('values', 'boolean')
+
+    def __init__(self, values: Any, boolean: bool = False) -> None:
+        self.values = values
+        self.boolean = boolean
+
+    @staticmethod
+    def of(numbers: Iterable[float]) -> 'Array':
+        numpy = numpy_module()
+        if numpy is not None:
+            return Array(numpy.array(list(numbers), dtype=numpy.float64))
+        return Array(array('d', numbers))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get(self, index: int) -> Union[float, bool]:
+        value = self.values[index]
+        return bool(value) if self.boolean else float(value)
+
+    def broadcast(self, token_type: str, other: Union['Array', float], reflected: bool = False) -> 'Array':
+        """self <op> other, other <op> self when reflected. Raises ValueError for arrays of different lengths."""
+        name, function, boolean = operations[token_type]
+        if type(other) is Array and len(other) != len(self):
+            raise ValueError("length mismatch")
+        numpy = numpy_module()
+        operand = other.values if type(other) is Array else other
+        left, right = (operand, self.values) if reflected else (self.values, operand)
+        if numpy is not None:
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                return Array(getattr(numpy, name)(left, right), boolean)
+        if type(other) is not Array:
+            left, right = (repeat(left), right) if reflected else (left, repeat(right))
+        return Array(array('d', map(function, left, right)), boolean)
+
+    def negate(self) -> 'Array':
+        numpy = numpy_module()
+        if numpy is not None:
+            return Array(numpy.negative(self.values))
+        return Array(array('d', map(operator.neg, self.values)))
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not Array or other.boolean != self.boolean or len(other) != len(self):
+            return False
+        numpy = numpy_module()
+        if numpy is not None:
+            return bool(numpy.array_equal(self.values, other.values))
+        return self.values == other.values
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __str__(self) -> str:
+        text: Callable[[Any], str] = (lambda value: "true" if value else "false") if self.boolean else number_text
+        values = self.values
+        if len(values) <= print_limit:
+            return "[" + ", ".join(map(text, values)) + "]"
+        return "[" + ", ".join(map(text, values[:edge])) + ", ..., " + ", ".join(map(text, values[-edge:])) + "]"
+
+    def __repr__(self) -> str:
+        return f"Array({self})"
@@ -0,0 +1,91 @@
+import math
+from array import array
+from typing import Any, List
+
+
+class OpCode:
+    CONSTANT = 0
+    NIL = 1
+    TRUE = 2
+    FALSE = 3
+    POP = 4
+    GET_LOCAL = 5
+    SET_LOCAL = 6
+    GET_GLOBAL = 7
+    DEFINE_GLOBAL = 8
+    SET_GLOBAL = 9
+    RESERVE = 10
+    POPN = 11
+    EQUAL = 12
+    NOT_EQUAL = 13
+    GREATER = 14
+    GREATER_EQUAL = 15
+    LESS = 16
+    LESS_EQUAL = 17
+    ADD = 18
+    SUBTRACT = 19
+    MULTIPLY = 20
+    DIVIDE = 21
+    NOT = 22
+    NEGATE = 23
+    PRINT = 24
+    RETURN = 25
+
+
+# Index is the opcode, used by the disassembler
+op_names: List[str] = [name for name, _ in sorted(
+    ((name, value) for name, value in vars(OpCode).items() if not name.startswith('_')), key=lambda item: item[1])]
+
+# Opcodes followed by one operand word
+with_operand = {
+    OpCode.CONSTANT, OpCode.GET_LOCAL, OpCode.SET_LOCAL, OpCode.GET_GLOBAL, OpCode.DEFINE_GLOBAL,
+    OpCode.SET_GLOBAL, OpCode.RESERVE, OpCode.POPN,
+}
+
+# Opcodes whose operand is an index into the constant pool
+with_constant = {OpCode.CONSTANT, OpCode.GET_GLOBAL, OpCode.DEFINE_GLOBAL, OpCode.SET_GLOBAL}
+
+
+class Chunk:
+    """Compiled program. Opcodes and operands share one word array, lines[i] is the source line of code[i]"""
+
+    def __init__(self) -> None:
+        self.code: array = array('I')
+        self.lines: array = array('I')
+        self.constants: List[Any] = []
+        self._constant_index = {}
+
+    def write(self, word: int, line: int) -> None:
+        self.code.append(word)
+        self.lines.append(line)
+
+    def add_constant(self, value: Any) -> int:
+        """Interns constants, type is part of the key so 1.0 and true do not collapse into one entry. 0.0 and -0.0
+        compare equal but print differently, a float's sign is part of the key too."""
+        key = (type(value), value, math.copysign(1.0, value)) if type(value) is float else (type(value), value)
+        index = self._constant_index.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self._constant_index[key] = index
+        return index
+
+    def disassemble(self, name: str = "script") -> str:
+        from app.Interpreter import Interpreter
+        lines: List[str] = [f"== {name} =="]
+        offset = 0
+        while offset < len(self.code):
+            op = self.code[offset]
+            line = '   |' if offset > 0 and self.lines[offset] == self.lines[offset - 1] else f"{self.lines[offset]:4d}"
+            text = f"{offset:04d} {line} OP_{op_names[op]}"
+            if op in with_operand:
+                operand = self.code[offset + 1]
+                text = f"{text:<32}{operand:4d}"
+                if op in with_constant:
+                    constant = self.constants[operand]
+                    text += f" '{constant if op != OpCode.CONSTANT else Interpreter.stringify(constant)}'"
+                offset += 2
+            else:
+                offset += 1
+            lines.append(text)
+        return '\n'.join(lines)
@@ -0,0 +1,78 @@
+import os
+import sys
+
+# Startup time is the point of the client: no typing (builtin generics instead), and no socket module, which pulls
+# in enum, selectors and friends
+import _socket
+
+# Request: the working directory and the arguments, NUL separated, behind a 4 byte big endian length.
+# Response frames: one kind byte, a 4 byte big endian length, then the payload.
+STDOUT, STDERR, EXIT = b'o', b'e', b'x'
+
+
+def socket_path() -> str:
+    """Where the server listens, LOX_SOCKET or a per-user socket in the temp directory"""
+    return os.environ.get('LOX_SOCKET') or os.path.join(os.environ.get('TMPDIR', '/tmp'), f'lox-{os.getuid()}.sock')
+
+
+def encode_request(cwd: str, args: list[str]) -> bytes:
+    payload = '\0'.join([cwd] + args).encode('utf-8', 'surrogateescape')
+    return len(payload).to_bytes(4, 'big') + payload
+
+
+def decode_request(payload: bytes) -> tuple[str, list[str]]:
+    cwd, *args = payload.decode('utf-8', 'surrogateescape').split('\0')
+    return cwd, args
+
+
+def encode_frame(kind: bytes, payload: bytes) -> bytes:
+    return kind + len(payload).to_bytes(4, 'big') + payload
+
+
+def receive(connection, size: int) -> bytes:
+    data = b''
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("server closed the connection")
+        data += chunk
+    return data
+
+
+def request(args: list[str], path: str | None = None, echo: bool = True) -> tuple[str, str, int]:
+    """Runs args (argv as the CLI gets it) on the server, returns (stdout, stderr, exit code).
+    With echo the output is also written to our stdout and stderr as it arrives."""
+    out: list[str] = []
+    err: list[str] = []
+    connection = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        connection.connect(path or socket_path())
+        connection.sendall(encode_request(os.getcwd(), args))
+        while True:
+            header = receive(connection, 5)
+            payload = receive(connection, int.from_bytes(header[1:], 'big')).decode('utf-8', 'surrogateescape')
+            kind = header[:1]
+            if kind == EXIT:
+                return ''.join(out), ''.join(err), int(payload)
+            stream, collected = (sys.stdout, out) if kind == STDOUT else (sys.stderr, err)
+            collected.append(payload)
+            if echo:
+                stream.write(payload)
+    finally:
+        connection.close()
+
+
+def main(args: list[str]) -> None:
+    """Drop-in for app.main: runs on the warm server when one is listening, in this process otherwise"""
+    try:
+        _, _, code = request(args)
+    except (FileNotFoundError, ConnectionRefusedError):
+        from app.Lox import Lox
+        Lox.main(args)
+        return
+    sys.stdout.flush()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
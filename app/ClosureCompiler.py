@@ -0,0 +1,271 @@
+import gc
+from typing import Any, Callable, Dict, List, Optional
+
+from app.Environment import LocalEnvironment
+from app.Errors import ErrorReporter, RuntimeException
+from app.Expr import ExprVisitor, Binary, Grouping, Literal, Unary, Variable, Assign
+from app.Interpreter import Interpreter
+from app.Output import Output
+from app.Stmt import StmtVisitor, Stmt, Expression, Print, Var, Block
+from app.Token import Token, TokenType
+
+# Compiled node: takes the innermost block scope (None at top level), returns the node's value
+Node = Callable[[Optional[LocalEnvironment]], Any]
+
+
+def add(left: Node, right: Node, operator: Token) -> Node:
+    def run(env):
+        a = left(env)
+        b = right(env)
+        if isinstance(a, str) and isinstance(b, str):
+            return a + b
+        if isinstance(a, float) and isinstance(b, float):
+            return a + b
+        raise RuntimeException(operator, "Operands must be two numbers or two strings.")
+    return run
+
+
+def subtract(left: Node, right: Node, operator: Token) -> Node:
+    def run(env):
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a - b
+        raise RuntimeException(operator, "Operands must be a numbers.")
+    return run
+
+
+def multiply(left: Node, right: Node, operator: Token) -> Node:
+    def run(env):
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a * b
+        raise RuntimeException(operator, "Operands must be a numbers.")
+    return run
+
+
+def divide(left: Node, right: Node, operator: Token) -> Node:
+    def run(env):
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a / b
+        raise RuntimeException(operator, "Operands must be a numbers.")
+    return run
+
+
+def greater(left: Node, right: Node, operator: Token) -> Node:
+    def run(env):
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a > b
+        raise RuntimeException(operator, "Operands must be a numbers.")
+    return run
+
+
+def greater_equal(left: Node, right: Node, operator: Token) -> Node:
+    def run(env):
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a >= b
+        raise RuntimeException(operator, "Operands must be a numbers.")
+    return run
+
+
+def less(left: Node, right: Node, operator: Token) -> Node:
+    def run(env):
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a < b
+        raise RuntimeException(operator, "Operands must be a numbers.")
+    return run
+
+
+def less_equal(left: Node, right: Node, operator: Token) -> Node:
+    def run(env):
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a <= b
+        raise RuntimeException(operator, "Operands must be a numbers.")
+    return run
+
+
+def equal(left: Node, right: Node, operator: Token) -> Node:
+    is_equal = Interpreter.is_equal
+    return lambda env: is_equal(left(env), right(env))
+
+
+def not_equal(left: Node, right: Node, operator: Token) -> Node:
+    is_equal = Interpreter.is_equal
+    return lambda env: not is_equal(left(env), right(env))
+
+
+binary_factories: Dict[TokenType, Callable[[Node, Node, Token], Node]] = {
+    TokenType.PLUS: add,
+    TokenType.MINUS: subtract,
+    TokenType.STAR: multiply,
+    TokenType.SLASH: divide,
+    TokenType.GREATER: greater,
+    TokenType.GREATER_EQUAL: greater_equal,
+    TokenType.LESS: less,
+    TokenType.LESS_EQUAL: less_equal,
+    TokenType.EQUAL_EQUAL: equal,
+    TokenType.BANG_EQUAL: not_equal,
+}
+
+
+class ClosureCompiler(ExprVisitor, StmtVisitor):
+    """Walks a resolved tree once and turns every node into a specialized Python closure.
+
+    Running the result costs one call per node: no accept/visit double dispatch and no operator
+    if-chain. Semantics and error messages are the Interpreter's."""
+
+    def __init__(self) -> None:
+        self.globals: Dict[str, Any] = {}
+        # Set at a parse error, the tree-walker stops the whole program there
+        self._stopped = False
+
+    def compile(self, statements: List[Optional[Stmt]]) -> Callable[[], None]:
+        # Compiling allocates a closure and cells per node but no garbage, yet the allocations keep triggering
+        # full collections over the whole tree. Pausing the collector makes compiling several times faster.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            compiled = self.compile_all(statements)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        def program() -> None:
+            for node in compiled:
+                node(None)
+        return program
+
+    def compile_all(self, statements: List[Optional[Stmt]]) -> List[Node]:
+        """Nodes of the statements up to a parse error's None. Once one is seen, no statement after it is compiled,
+        in its own block or any enclosing one."""
+        compiled: List[Node] = []
+        for stmt in statements:
+            if stmt is None:
+                self._stopped = True
+            if self._stopped:
+                break
+            compiled.append(stmt.accept(self))
+        return compiled
+
+    def interpret(self, statements: List[Optional[Stmt]]) -> None:
+        program = self.compile(statements)
+        try:
+            program()
+        except RuntimeException as e:
+            ErrorReporter.runtime_error(e)
+        finally:
+            Output.sink.flush()
+
+    def visit_expression(self, stmt: Expression) -> Node:
+        return stmt.expression.accept(self)
+
+    def visit_print(self, stmt: Print) -> Node:
+        expression: Node = stmt.expression.accept(self)
+        stringify = Interpreter.stringify
+        # The sink is looked up per print, a program may be compiled before Output.use() swaps it
+        output = Output
+
+        def run(env):
+            output.sink.write(stringify(expression(env)) + "\n")
+        return run
+
+    def visit_variable_stm(self, stmt: Var) -> Node:
+        initializer: Node = stmt.initializer.accept(self) if stmt.initializer is not None else (lambda env: None)
+        if stmt.slot is None:
+            values = self.globals
+            name = stmt.name.lexeme
+
+            def define(env):
+                values[name] = initializer(env)
+            return define
+        slot = stmt.slot
+
+        def store(env):
+            env.slots[slot] = initializer(env)
+        return store
+
+    def visit_block_stmt(self, stmt: Block) -> Node:
+        statements: List[Node] = self.compile_all(stmt.statements)
+        size = stmt.slot_count
+
+        def run(env):
+            scope = LocalEnvironment(size, env)
+            for node in statements:
+                node(scope)
+        return run
+
+    def visit_literal(self, expr: Literal) -> Node:
+        value = expr.value
+        return lambda env: value
+
+    def visit_grouping(self, expr: Grouping) -> Node:
+        return expr.expression.accept(self)
+
+    def visit_unary(self, expr: Unary) -> Node:
+        right: Node = expr.right.accept(self)
+        operator = expr.operator
+        if operator.token_type == TokenType.BANG:
+            is_truthy = Interpreter.is_truthy
+            return lambda env: not is_truthy(right(env))
+
+        def negate(env):
+            value = right(env)
+            if isinstance(value, float):
+                return -value
+            raise RuntimeException(operator, "Operand must be a number.")
+        return negate
+
+    def visit_binary(self, expr: Binary) -> Node:
+        return binary_factories[expr.operator.token_type](expr.left.accept(self), expr.right.accept(self),
+                                                          expr.operator)
+
+    def visit_variable_expr(self, expr: Variable) -> Node:
+        name = expr.name
+        slot = expr.slot
+        if expr.depth is None:
+            values = self.globals
+
+            def get_global(env):
+                if name.lexeme in values:
+                    return values[name.lexeme]
+                raise RuntimeException(name, f"Undefined variable '{name.lexeme}'.")
+            return get_global
+        if expr.depth == 0:
+            return lambda env: env.slots[slot]
+        if expr.depth == 1:
+            return lambda env: env.enclosing.slots[slot]
+        depth = expr.depth
+        return lambda env: env.get_at(depth, slot)
+
+    def visit_assign(self, expr: Assign) -> Node:
+        value: Node = expr.value.accept(self)
+        name = expr.name
+        slot = expr.slot
+        if expr.depth is None:
+            values = self.globals
+
+            def set_global(env):
+                result = value(env)
+                if name.lexeme not in values:
+                    raise RuntimeException(name, f"Undefined variable '{name.lexeme}'.")
+                values[name.lexeme] = result
+                return result
+            return set_global
+        depth = expr.depth
+
+        def set_local(env):
+            result = value(env)
+            env.assign_at(depth, slot, result)
+            return result
+        return set_local
@@ -0,0 +1,134 @@
+from typing import Any, List, Optional
+
+from app.Chunk import Chunk, OpCode
+from app.Expr import ExprVisitor, Binary, Grouping, Literal, Unary, Variable, Assign
+from app.Stmt import StmtVisitor, Stmt, Expression, Print, Var, Block
+from app.Token import TokenType
+
+binary_ops = {
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.STAR: OpCode.MULTIPLY,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+    TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+}
+
+
+class Compiler(ExprVisitor, StmtVisitor):
+    """Lowers resolved Stmt/Expr trees into a Chunk for the VM.
+
+    Locals live on the VM stack: a block reserves its slot_count slots on entry and pops them on exit,
+    so the Resolver's (depth, slot) becomes an absolute stack index known at compile time."""
+
+    def __init__(self) -> None:
+        self._chunk = Chunk()
+        self._bases: List[int] = []
+        self._height = 0
+        self._line = 1
+        # Set at a parse error, the tree-walker stops the whole program there
+        self._stopped = False
+
+    def compile(self, statements: List[Optional[Stmt]]) -> Chunk:
+        self.compile_all(statements)
+        self.emit(OpCode.RETURN)
+        return self._chunk
+
+    def compile_all(self, statements: List[Optional[Stmt]]) -> None:
+        """Compiles the statements up to a parse error's None. Once one is seen, no statement after it is compiled,
+        in its own block or any enclosing one: blocks only close their scopes on the way out to OP_RETURN."""
+        for stmt in statements:
+            if stmt is None:
+                self._stopped = True
+            if self._stopped:
+                return
+            stmt.accept(self)
+
+    def emit(self, op: int, operand: Optional[int] = None) -> None:
+        self._chunk.write(op, self._line)
+        if operand is not None:
+            self._chunk.write(operand, self._line)
+
+    def emit_constant(self, value: Any) -> None:
+        self.emit(OpCode.CONSTANT, self._chunk.add_constant(value))
+
+    def local_index(self, depth: int, slot: int) -> int:
+        return self._bases[-1 - depth] + slot
+
+    def visit_expression(self, stmt: Expression) -> None:
+        stmt.expression.accept(self)
+        self.emit(OpCode.POP)
+
+    def visit_print(self, stmt: Print) -> None:
+        stmt.expression.accept(self)
+        self.emit(OpCode.PRINT)
+
+    def visit_variable_stm(self, stmt: Var) -> None:
+        self._line = stmt.name.line
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+        else:
+            self.emit(OpCode.NIL)
+        self._line = stmt.name.line
+        if stmt.slot is None:
+            self.emit(OpCode.DEFINE_GLOBAL, self._chunk.add_constant(stmt.name.lexeme))
+        else:
+            self.emit(OpCode.SET_LOCAL, self.local_index(0, stmt.slot))
+            self.emit(OpCode.POP)
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        self._bases.append(self._height)
+        if stmt.slot_count:
+            self.emit(OpCode.RESERVE, stmt.slot_count)
+        self._height += stmt.slot_count
+        self.compile_all(stmt.statements)
+        if stmt.slot_count:
+            self.emit(OpCode.POPN, stmt.slot_count)
+        self._height -= stmt.slot_count
+        self._bases.pop()
+
+    def visit_literal(self, expr: Literal) -> None:
+        if expr.value is None:
+            self.emit(OpCode.NIL)
+        elif expr.value is True:
+            self.emit(OpCode.TRUE)
+        elif expr.value is False:
+            self.emit(OpCode.FALSE)
+        else:
+            self.emit_constant(expr.value)
+
+    def visit_grouping(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    def visit_unary(self, expr: Unary) -> None:
+        expr.right.accept(self)
+        self._line = expr.operator.line
+        if expr.operator.token_type == TokenType.BANG:
+            self.emit(OpCode.NOT)
+        elif expr.operator.token_type == TokenType.MINUS:
+            self.emit(OpCode.NEGATE)
+
+    def visit_binary(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+        self._line = expr.operator.line
+        self.emit(binary_ops[expr.operator.token_type])
+
+    def visit_variable_expr(self, expr: Variable) -> None:
+        self._line = expr.name.line
+        if expr.depth is None:
+            self.emit(OpCode.GET_GLOBAL, self._chunk.add_constant(expr.name.lexeme))
+        else:
+            self.emit(OpCode.GET_LOCAL, self.local_index(expr.depth, expr.slot))
+
+    def visit_assign(self, expr: Assign) -> None:
+        expr.value.accept(self)
+        self._line = expr.name.line
+        if expr.depth is None:
+            self.emit(OpCode.SET_GLOBAL, self._chunk.add_constant(expr.name.lexeme))
+        else:
+            self.emit(OpCode.SET_LOCAL, self.local_index(expr.depth, expr.slot))
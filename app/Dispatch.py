@@ -0,0 +1,14 @@
+from typing import Any, Callable, Dict
+
+
+class DispatchTable(dict):
+    """Node type -> the visitor's bound method for it, built once from the generated expr_dispatch and
+    stmt_dispatch tables. Looking up type(node) replaces the accept() round trip. A type without an entry falls
+    back to accept(), so a None left by a parse error still fails the way it always did."""
+
+    def __init__(self, visitor: Any, *dispatches: Dict[type, str]) -> None:
+        super().__init__((cls, getattr(visitor, method)) for dispatch in dispatches for cls, method in dispatch.items())
+        self.visitor = visitor
+
+    def __missing__(self, cls: type) -> Callable[[Any], Any]:
+        return lambda node: node.accept(self.visitor)
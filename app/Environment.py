@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from app.Errors import RuntimeException
 from app.Token import Token
 
 
 class Environment:
+    """Global scope. Globals stay late-bound by name, so using one before its declaration is a runtime error."""
 
     def __init__(self, enclosing: Environment = None):
         self.values: Dict[str, Any] = {}
@@ -32,3 +33,41 @@ class Environment:
             return
 
         raise RuntimeException(name, f"Undefined variable '{name.lexeme}'.")
+
+
+class LocalEnvironment:
+    """Block scope. The Resolver has already numbered every local, so a scope is just a list of slots
+    and a lookup is (depth, slot) instead of a dict probe per enclosing level."""
+    __slots__ = ('slots', 'enclosing')
+
+    def __init__(self, size: int, enclosing: Optional[Any] = None):
+        self.slots: List[Any] = [None] * size
+        self.enclosing = enclosing
+
+    @staticmethod
+    def frame(arguments: List[Any], size: int, enclosing: Any) -> LocalEnvironment:
+        """Scope of one call: the arguments list itself becomes the slots, the parameters first and the function's
+        other locals after them, so a call allocates one list of exactly the size the Resolver counted"""
+        environment = LocalEnvironment.__new__(LocalEnvironment)
+        if size > len(arguments):
+            arguments += [None] * (size - len(arguments))
+        environment.slots = arguments
+        environment.enclosing = enclosing
+        return environment
+
+    def ancestor(self, distance: int) -> LocalEnvironment:
+        environment = self
+        for _ in range(distance):
+            environment = environment.enclosing
+        return environment
+
+    def get_at(self, distance: int, slot: int) -> Any:
+        if distance == 0:
+            return self.slots[slot]
+        return self.ancestor(distance).slots[slot]
+
+    def assign_at(self, distance: int, slot: int, value: Any) -> None:
+        if distance == 0:
+            self.slots[slot] = value
+            return
+        self.ancestor(distance).slots[slot] = value
@@ -1,4 +1,8 @@
-from app.Token import Token
+import sys
+from typing import Optional
+
+from app.Output import Output
+from app.Token import Token, TokenType
 
 
 class RuntimeException(Exception):
@@ -12,4 +16,38 @@ class RuntimeException(Exception):
         return super().__str__()
 
 
+class ParserError(Exception):
+    ...
+
+
+class ErrorReporter:
+    """Error state and reporting shared by every phase. It lives here and not on Lox so the scanners, parsers and
+    engines can report without importing the driver, Lox only reads the flags to pick the exit code. Buffered
+    program output is flushed before each message so the two streams keep their order."""
+    had_error = False
+    had_runtime_error = False
+
+    @staticmethod
+    def reset() -> None:
+        ErrorReporter.had_error = False
+        ErrorReporter.had_runtime_error = False
+
+    @staticmethod
+    def error(token: Token, message: str) -> None:
+        if token.token_type == TokenType.EOF:
+            ErrorReporter.report(token.line, message=message, where=" at end")
+        else:
+            ErrorReporter.report(token.line, message=message, where=" at '" + token.lexeme + "'")
+
+    @staticmethod
+    def report(line: int, message: str, char: Optional[str] = None, where: str = '') -> None:
+        ErrorReporter.had_error = True
+        Output.sink.flush()
+        print(f"[line {line}] Error{where}: {message}{char if char is not None else ''}", file=sys.stderr)
 
+    @staticmethod
+    def runtime_error(error: RuntimeException) -> None:
+        Output.sink.flush()
+        print(f"{error}\n[line {error.token.line}]", file=sys.stderr)
+        exit(70)
+        ErrorReporter.had_runtime_error = True
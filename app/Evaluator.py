@@ -1,26 +1,33 @@
-import sys
 from typing import Any
 
-from app.Errors import RuntimeException
-from app.Expr import ExprVisitor, Literal, Grouping, Unary, Binary
-from app.Token import TokenType, Token
+from app import Operators
+from app.Dispatch import DispatchTable
+from app.Errors import ErrorReporter, RuntimeException
+from app.Expr import ExprVisitor, Literal, Grouping, Unary, Binary, ArrayLiteral, Index, expr_dispatch
+from app.Log import DEBUG, Log
+from app.Output import Output
+from app.Token import Token
 
 
 class Evaluator(ExprVisitor):
 
+    def __init__(self) -> None:
+        self._handlers = DispatchTable(self, expr_dispatch)
+
     def interpret(self, expression: Any) -> None:
-        from app.Lox import Lox
         try:
             value: Any = self.evaluate(expression)
-            print(self.stringify(value))
+            Output.sink.write(self.stringify(value) + "\n")
         except RuntimeException as e:
-            Lox.runtime_error(e)
+            ErrorReporter.runtime_error(e)
+        finally:
+            Output.sink.flush()
 
     @staticmethod
     def stringify(value: Any) -> str:
-        print(f"From {Evaluator.stringify.__qualname__} being called with {value} of type {type(value)}",
-              file=sys.stderr)
         """Java's stringify"""
+        if Log.level <= DEBUG:
+            Log.debug("stringify called with %r of type %s", value, type(value).__name__)
         if value is None:
             return "nil"
         if value is False:
@@ -32,7 +39,6 @@ class Evaluator(ExprVisitor):
         if text.endswith(".0"):
             text = text[:-2]  # Trim zeroes for decimal
             return text
-        print(f"From {Evaluator.stringify.__qualname__} returning {value} of type {type(value)}", file=sys.stderr)
         return str(value)
 
     def visit_literal(self, expr: Literal) -> Any:
@@ -42,20 +48,11 @@ class Evaluator(ExprVisitor):
         return self.evaluate(expr.expression)
 
     def evaluate(self, expr) -> Any:
-        return expr.accept(self)
+        return self._handlers[type(expr)](expr)
 
     def visit_unary(self, expr: Unary) -> Any:
         """This method is likely to throw a runtime error if operand is not a number"""
-        right: Any = self.evaluate(expr.right)
-
-        if expr.operator.token_type == TokenType.BANG:
-            print(f"from{self.visit_unary.__qualname__} entering is_truthy with {right}", file=sys.stderr)
-            return not self.is_truthy(right)
-        if expr.operator.token_type == TokenType.MINUS:
-            self.check_number_operands(expr.operator, right=right)
-            return -float(right)
-
-        return None
+        return expr.op(expr, self.evaluate(expr.right))
 
     @staticmethod
     def is_truthy(obj: Any) -> bool:
@@ -67,61 +64,13 @@ class Evaluator(ExprVisitor):
 
     def visit_binary(self, expr: Binary) -> Any:
         """This method is likely to throw a runtime error if operand is not a number"""
-        left: Any = self.evaluate(expr.left)
-        right: Any = self.evaluate(expr.right)
-
-        if expr.operator.token_type == TokenType.MINUS:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) - float(right)
-
-        if expr.operator.token_type == TokenType.STAR:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) * float(right)
-
-        if expr.operator.token_type == TokenType.SLASH:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) / float(right)
-
-        if expr.operator.token_type == TokenType.PLUS:
-            print(f"From {Evaluator.visit_binary.__qualname__} entering + if clause with left{left} right{right}",
-                  file=sys.stderr)
-            if isinstance(left, str) and isinstance(right, str):
-                print(f"From {Evaluator.visit_binary.__qualname__} entered concat left is str{isinstance(left, str)}"
-                      f"right is str {isinstance(right, str)}", file=sys.stderr)
-                return str(left) + str(right)
-            if isinstance(left, float) and isinstance(right, float):
-                print(f"From {Evaluator.visit_binary.__qualname__} entered + left is str{isinstance(left, str)}"
-                      f"right is str {isinstance(right, str)}", file=sys.stderr)
-                self.check_number_operands(expr.operator, left, right)
-                return float(left) + float(right)
-            else:
-                print(f"From {Evaluator.visit_binary.__qualname__} entered else left is str{isinstance(left, str)}"
-                      f"right is str {isinstance(right, str)} operator = {expr.operator}", file=sys.stderr)
-                raise RuntimeException(expr.operator, "Operands must be two numbers or two strings.")
-
-        if expr.operator.token_type == TokenType.GREATER:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) > float(right)
-
-        if expr.operator.token_type == TokenType.GREATER_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) >= float(right)
-
-        if expr.operator.token_type == TokenType.LESS:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) < float(right)
-
-        if expr.operator.token_type == TokenType.LESS_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) <= float(right)
-
-        if expr.operator.token_type == TokenType.BANG_EQUAL:
-            return not self.is_equal(left, right)
+        return expr.op(expr, self.evaluate(expr.left), self.evaluate(expr.right))
 
-        if expr.operator.token_type == TokenType.EQUAL_EQUAL:
-            return self.is_equal(left, right)
+    def visit_array_literal(self, expr: ArrayLiteral) -> Any:
+        return Operators.array(expr, [self.evaluate(element) for element in expr.elements])
 
-        return None
+    def visit_index(self, expr: Index) -> Any:
+        return Operators.index(expr, self.evaluate(expr.target), self.evaluate(expr.index))
 
     @staticmethod
     def is_equal(left: Any, right: Any) -> bool:
@@ -1,11 +1,15 @@
+# Generated by tools/tools.py from tools/ast_spec.py, do not edit by hand.
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Dict, List, Optional
 
+from app import LazyOperators
 from app.Token import Token
 
 
 class Expr:
+    __slots__ = ()
+
     def accept(self, visitor: ExprVisitor) -> Any:
         raise NotImplementedError()
 
@@ -29,60 +33,157 @@ class ExprVisitor:
     def visit_assign(self, expr: Assign) -> Any:
         raise NotImplementedError()
 
+    def visit_array_literal(self, expr: ArrayLiteral) -> Any:
+        raise NotImplementedError()
+
+    def visit_index(self, expr: Index) -> Any:
+        raise NotImplementedError()
+
+    def visit_call(self, expr: Call) -> Any:
+        raise NotImplementedError()
+
 
 class Binary(Expr):
+    __slots__ = ('left', 'operator', 'right', 'op')
+
     def __init__(self, left: Expr, operator: Token, right: Expr) -> None:
         self.left = left
         self.operator = operator
         self.right = right
+        self.op: Any = LazyOperators.binary
 
     def accept(self, visitor: ExprVisitor) -> Any:
         return visitor.visit_binary(self)
 
     def __repr__(self) -> str:
-        return f"From {self.__class__}Left Operand: {self.left} Operator: {self.operator} Right Operand: {self.right}"
+        return f"Binary(left={self.left!r}, operator={self.operator!r}, right={self.right!r})"
 
 
 class Grouping(Expr):
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
     def accept(self, visitor: ExprVisitor) -> Any:
         return visitor.visit_grouping(self)
 
+    def __repr__(self) -> str:
+        return f"Grouping(expression={self.expression!r})"
+
 
 class Literal(Expr):
+    __slots__ = ('value',)
+
     def __init__(self, value: Any) -> None:
         self.value = value
 
     def accept(self, visitor: ExprVisitor) -> Any:
         return visitor.visit_literal(self)
 
-    def __repr__(self):
-        return f" VALUE: {self.value}"
+    def __repr__(self) -> str:
+        return f"Literal(value={self.value!r})"
 
 
 class Unary(Expr):
+    __slots__ = ('operator', 'right', 'op')
+
     def __init__(self, operator: Token, right: Expr) -> None:
         self.operator = operator
         self.right = right
+        self.op: Any = LazyOperators.unary
 
     def accept(self, visitor: ExprVisitor) -> Any:
         return visitor.visit_unary(self)
 
+    def __repr__(self) -> str:
+        return f"Unary(operator={self.operator!r}, right={self.right!r})"
+
 
 class Variable(Expr):
+    __slots__ = ('name', 'depth', 'slot')
+
     def __init__(self, name: Token) -> None:
         self.name = name
+        self.depth: Optional[int] = None
+        self.slot: Optional[int] = None
 
     def accept(self, visitor: ExprVisitor) -> Any:
         return visitor.visit_variable_expr(self)
 
+    def __repr__(self) -> str:
+        return f"Variable(name={self.name!r})"
+
 
 class Assign(Expr):
-    def __init__(self, name: Token, value: Expr):
+    __slots__ = ('name', 'value', 'depth', 'slot')
+
+    def __init__(self, name: Token, value: Expr) -> None:
         self.name = name
         self.value = value
+        self.depth: Optional[int] = None
+        self.slot: Optional[int] = None
 
     def accept(self, visitor: ExprVisitor) -> Any:
         return visitor.visit_assign(self)
+
+    def __repr__(self) -> str:
+        return f"Assign(name={self.name!r}, value={self.value!r})"
+
+
+class ArrayLiteral(Expr):
+    __slots__ = ('bracket', 'elements')
+
+    def __init__(self, bracket: Token, elements: List[Expr]) -> None:
+        self.bracket = bracket
+        self.elements = elements
+
+    def accept(self, visitor: ExprVisitor) -> Any:
+        return visitor.visit_array_literal(self)
+
+    def __repr__(self) -> str:
+        return f"ArrayLiteral(bracket={self.bracket!r}, elements={self.elements!r})"
+
+
+class Index(Expr):
+    __slots__ = ('target', 'bracket', 'index')
+
+    def __init__(self, target: Expr, bracket: Token, index: Expr) -> None:
+        self.target = target
+        self.bracket = bracket
+        self.index = index
+
+    def accept(self, visitor: ExprVisitor) -> Any:
+        return visitor.visit_index(self)
+
+    def __repr__(self) -> str:
+        return f"Index(target={self.target!r}, bracket={self.bracket!r}, index={self.index!r})"
+
+
+class Call(Expr):
+    __slots__ = ('callee', 'paren', 'arguments')
+
+    def __init__(self, callee: Expr, paren: Token, arguments: List[Expr]) -> None:
+        self.callee = callee
+        self.paren = paren
+        self.arguments = arguments
+
+    def accept(self, visitor: ExprVisitor) -> Any:
+        return visitor.visit_call(self)
+
+    def __repr__(self) -> str:
+        return f"Call(callee={self.callee!r}, paren={self.paren!r}, arguments={self.arguments!r})"
+
+
+# Node class -> visitor method name, for visitors that dispatch on type(node) instead of accept()
+expr_dispatch: Dict[type, str] = {
+    Binary: 'visit_binary',
+    Grouping: 'visit_grouping',
+    Literal: 'visit_literal',
+    Unary: 'visit_unary',
+    Variable: 'visit_variable_expr',
+    Assign: 'visit_assign',
+    ArrayLiteral: 'visit_array_literal',
+    Index: 'visit_index',
+    Call: 'visit_call',
+}
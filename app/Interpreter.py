@@ -1,52 +1,138 @@
 import sys
+import time
 from typing import Any, List
 
-from app.Environment import Environment
-from app.Errors import RuntimeException
-from app.Expr import ExprVisitor, Literal, Grouping, Unary, Binary, Variable, Assign
-from app.Stmt import StmtVisitor, Expression, Print, Var, Stmt
-from app.Token import TokenType, Token
+from app import Operators
+from app.Dispatch import DispatchTable
+from app.Environment import Environment, LocalEnvironment
+from app.Errors import ErrorReporter, RuntimeException
+from app.Expr import (ExprVisitor, Literal, Grouping, Unary, Binary, Variable, Assign, ArrayLiteral, Index, Call,
+                      expr_dispatch)
+from app.Log import DEBUG, Log
+from app.LoxFunction import LoxCallable, LoxFunction, NativeFunction
+from app.Output import Output
+from app.Stmt import StmtVisitor, Expression, Print, Var, Stmt, Block, Function, Return, stmt_dispatch
+from app.Token import Token
 
 
 class Interpreter(ExprVisitor, StmtVisitor):
-    environment: Environment = Environment()
+    """Tree-walking engine. A call runs its body in a slot frame sized by the Resolver, and `return` stores its
+    value and raises a flag that every statement loop checks, no exception unwinds a normal return. Calls nested
+    deeper than max_depth are a "Stack overflow." runtime error."""
+    max_depth = 1000
+    # Python frames one Lox call takes at least, interpret() raises the recursion limit to fit max_depth calls
+    frames_per_call = 8
+
+    def __init__(self) -> None:
+        self.globals: Environment = Environment()
+        self.globals.define("clock", NativeFunction("clock", 0, time.time))
+        # Innermost block scope, or the globals at top level
+        self.environment: Any = self.globals
+        self._handlers = DispatchTable(self, expr_dispatch, stmt_dispatch)
+        self._depth = 0
+        self._returning = False
+        self._return_value: Any = None
 
     def interpret(self, statements: List[Any]) -> None:
-        from app.Lox import Lox
+        limit = self.max_depth * self.frames_per_call + 1000
+        if sys.getrecursionlimit() < limit:
+            sys.setrecursionlimit(limit)
         try:
             for statement in statements:
                 self.execute(statement)
         except RuntimeException as e:
-            Lox.runtime_error(e)
+            ErrorReporter.runtime_error(e)
+        finally:
+            Output.sink.flush()
 
     def execute(self, stmt) -> None:
-        stmt.accept(self)
+        self._handlers[type(stmt)](stmt)
 
-    def visit_block_stmt(self, stmt) -> None:
-        self.execute_block(stmt.statements, Environment(enclosing=self.environment))
+    def visit_block_stmt(self, stmt: Block) -> None:
+        self.execute_block(stmt.statements, LocalEnvironment(stmt.slot_count, enclosing=self.environment))
         return None
 
     def visit_variable_stm(self, stmt: Var) -> Any:
         value = None
         if stmt.initializer is not None:
             value = self.evaluate(stmt.initializer)
-        self.environment.define(stmt.name.lexeme, value)
+        if stmt.slot is None:
+            self.globals.define(stmt.name.lexeme, value)
+        else:
+            self.environment.slots[stmt.slot] = value
         return None
 
-    def execute_block(self, stmts: List[Stmt], environ: Environment) -> None:
-        previous: Environment = self.environment
+    def execute_block(self, stmts: List[Stmt], environ: LocalEnvironment) -> None:
+        previous: Any = self.environment
         try:
             self.environment = environ
             for stm in stmts:
                 self.execute(stm)
+                if self._returning:
+                    return
         finally:
             self.environment = previous
 
+    def execute_function(self, body: List[Stmt], frame: LocalEnvironment) -> Any:
+        """Runs a function body in its frame, returns what its return statement left, nil without one"""
+        previous: Any = self.environment
+        try:
+            self.environment = frame
+            for stmt in body:
+                self.execute(stmt)
+                if self._returning:
+                    value = self._return_value
+                    self._returning = False
+                    self._return_value = None
+                    return value
+            return None
+        finally:
+            self.environment = previous
+
+    def visit_function(self, stmt: Function) -> None:
+        function = LoxFunction(stmt, self.environment)
+        if stmt.slot is None:
+            self.globals.define(stmt.name.lexeme, function)
+        else:
+            self.environment.slots[stmt.slot] = function
+
+    def visit_return(self, stmt: Return) -> None:
+        self._return_value = self.evaluate(stmt.value) if stmt.value is not None else None
+        self._returning = True
+
+    def visit_call(self, expr: Call) -> Any:
+        callee: Any = self.evaluate(expr.callee)
+        arguments: List[Any] = [self.evaluate(argument) for argument in expr.arguments]
+        if type(callee) is LoxFunction:
+            # LoxFunction.call inlined, the common case skips two method calls
+            declaration = callee.declaration
+            arity = len(declaration.params)
+        elif isinstance(callee, LoxCallable):
+            declaration = None
+            arity = callee.arity()
+        else:
+            raise RuntimeException(expr.paren, "Can only call functions and classes.")
+        if len(arguments) != arity:
+            raise RuntimeException(expr.paren, f"Expected {arity} arguments but got {len(arguments)}.")
+        if self._depth >= self.max_depth:
+            raise RuntimeException(expr.paren, "Stack overflow.")
+        self._depth += 1
+        try:
+            if declaration is not None:
+                frame = LocalEnvironment.frame(arguments, declaration.slot_count, callee.closure)
+                return self.execute_function(declaration.body, frame)
+            return callee.call(self, arguments)
+        except RecursionError:
+            # Expressions nested deep inside each call can still exhaust the Python stack first
+            raise RuntimeException(expr.paren, "Stack overflow.") from None
+        finally:
+            self._depth -= 1
+
     @staticmethod
     def stringify(value: Any) -> str:
-        print(f"From {Interpreter.stringify.__qualname__} being called with {value} of type {type(value)}",
-              file=sys.stderr)
         """Java's stringify"""
+        if Log.level <= DEBUG:
+            Log.debug("stringify called with %r of type %s", value, type(value).__name__)
         if value is None:
             return "nil"
         if value is False:
@@ -58,7 +144,6 @@ class Interpreter(ExprVisitor, StmtVisitor):
         if text.endswith(".0"):
             text = text[:-2]  # Trim zeroes for decimal
             return text
-        print(f"From {Interpreter.stringify.__qualname__} returning {value} of type {type(value)}", file=sys.stderr)
         return str(value)
 
     def visit_literal(self, expr: Literal) -> Any:
@@ -68,26 +153,23 @@ class Interpreter(ExprVisitor, StmtVisitor):
         return self.evaluate(expr.expression)
 
     def evaluate(self, expr) -> Any:
-        return expr.accept(self)
+        return self._handlers[type(expr)](expr)
 
     def visit_unary(self, expr: Unary) -> Any:
         """This method is likely to throw a runtime error if operand is not a number"""
-        right: Any = self.evaluate(expr.right)
-
-        if expr.operator.token_type == TokenType.BANG:
-            return not self.is_truthy(right)
-        if expr.operator.token_type == TokenType.MINUS:
-            self.check_number_operands(expr.operator, right=right)
-            return -float(right)
-
-        return None
+        return expr.op(expr, self.evaluate(expr.right))
 
     def visit_variable_expr(self, expr: Variable) -> Any:
-        return self.environment.get(expr.name)
+        if expr.depth is None:
+            return self.globals.get(expr.name)
+        return self.environment.get_at(expr.depth, expr.slot)
 
     def visit_assign(self, expr: Assign) -> Any:
         value: Any = self.evaluate(expr.value)
-        self.environment.assign(expr.name, value)
+        if expr.depth is None:
+            self.globals.assign(expr.name, value)
+        else:
+            self.environment.assign_at(expr.depth, expr.slot, value)
         return value
 
     @staticmethod
@@ -100,53 +182,13 @@ class Interpreter(ExprVisitor, StmtVisitor):
 
     def visit_binary(self, expr: Binary) -> Any:
         """This method is likely to throw a runtime error if operand is not a number"""
-        left: Any = self.evaluate(expr.left)
-        right: Any = self.evaluate(expr.right)
-
-        if expr.operator.token_type == TokenType.MINUS:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) - float(right)
-
-        if expr.operator.token_type == TokenType.STAR:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) * float(right)
-
-        if expr.operator.token_type == TokenType.SLASH:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) / float(right)
-
-        if expr.operator.token_type == TokenType.PLUS:
-            if isinstance(left, str) and isinstance(right, str):
-                return str(left) + str(right)
-            if isinstance(left, float) and isinstance(right, float):
-                self.check_number_operands(expr.operator, left, right)
-                return float(left) + float(right)
-            else:
-                raise RuntimeException(expr.operator, "Operands must be two numbers or two strings.")
-
-        if expr.operator.token_type == TokenType.GREATER:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) > float(right)
-
-        if expr.operator.token_type == TokenType.GREATER_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) >= float(right)
+        return expr.op(expr, self.evaluate(expr.left), self.evaluate(expr.right))
 
-        if expr.operator.token_type == TokenType.LESS:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) < float(right)
+    def visit_array_literal(self, expr: ArrayLiteral) -> Any:
+        return Operators.array(expr, [self.evaluate(element) for element in expr.elements])
 
-        if expr.operator.token_type == TokenType.LESS_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) <= float(right)
-
-        if expr.operator.token_type == TokenType.BANG_EQUAL:
-            return not self.is_equal(left, right)
-
-        if expr.operator.token_type == TokenType.EQUAL_EQUAL:
-            return self.is_equal(left, right)
-
-        return None
+    def visit_index(self, expr: Index) -> Any:
+        return Operators.index(expr, self.evaluate(expr.target), self.evaluate(expr.index))
 
     def visit_expression(self, stmt: 'Expression') -> None:
         self.evaluate(stmt.expression)
@@ -154,15 +196,7 @@ class Interpreter(ExprVisitor, StmtVisitor):
 
     def visit_print(self, stmt: 'Print') -> None:
         value: Any = self.evaluate(stmt.expression)
-        print(self.stringify(value))
-        return None
-
-    def visit_variable_stmt(self, stmt: 'Var') -> None:
-        value: Any = None
-        if stmt.initializer is not None:
-            value = self.evaluate(stmt.initializer)
-
-        self.environment.define(stmt.name.lexeme, value)
+        Output.sink.write(self.stringify(value) + "\n")
         return None
 
     @staticmethod
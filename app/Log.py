@@ -0,0 +1,42 @@
+import sys
+from typing import Any
+
+from app.Output import Output
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+OFF = 100
+levels = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'off': OFF}
+
+
+class Log:
+    """Leveled diagnostics of the interpreter itself, off by default. Call sites check the level first
+    (`if Log.level <= DEBUG:`) so a disabled message costs one comparison. The logging module is only imported
+    once a level is configured (--log=level or LOX_LOG), it costs more startup than the whole scanner."""
+    level = OFF
+    _logger: Any = None
+
+    @staticmethod
+    def configure(name: str) -> None:
+        if name.lower() not in levels:
+            raise ValueError(f"Unknown log level {name!r}, expected one of {', '.join(levels)}")
+        Log.level = levels[name.lower()]
+        if Log.level < OFF and Log._logger is None:
+            import logging
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("lox %(levelname)s: %(message)s"))
+            Log._logger = logging.getLogger("lox")
+            Log._logger.addHandler(handler)
+            Log._logger.propagate = False
+        if Log._logger is not None:
+            Log._logger.setLevel(Log.level)
+
+    @staticmethod
+    def log(level: int, message: str, *args: Any) -> None:
+        if level >= Log.level and Log._logger is not None:
+            # Program output written so far goes first, as with errors
+            Output.sink.flush()
+            Log._logger.log(level, message, *args)
+
+    @staticmethod
+    def debug(message: str, *args: Any) -> None:
+        Log.log(DEBUG, message, *args)
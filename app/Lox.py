@@ -1,33 +1,83 @@
+import os
 import sys
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple, Union
 
-from app.Errors import RuntimeException
-from app.Evaluator import Evaluator
-from app.Interpreter import Interpreter
-from app.Token import Token, TokenType
+from app.Errors import ErrorReporter
+from app.Output import Output, OutputSink
+from app.Token import Token
+
+
+usage = """Usage: ./your_program.sh <tokenize|parse|evaluate|run|disassemble|run-batch> [options] <filename>
+Options:
+  --engine=tree|stack|vm|closure|python  --emit-python  --no-optimize  --max-depth=n
+  --scanner=regex  --stream  --compact-tokens  --scan-jobs[=n]  --cache[=dir]
+  --profile[=file]  --sample[=file]  --sample-interval=ms  --quicken-stats
+  --flush=line|size|exit  --log=level
+  run-batch: --jobs=n  --report=file"""
 
 
 class Lox:
-    had_error = False
-    had_runtime_error = False
-    interpreter = Interpreter()
-    evaluator = Evaluator()
+    """Command line driver. Every phase is imported by the command that needs it, so `tokenize` loads only the
+    scanner and `parse` never loads the runtime. Error state lives in ErrorReporter."""
+    # Created on first use, kept so globals survive between runs in one process
+    interpreter: Optional[Any] = None
+    evaluator: Optional[Any] = None
+    # Recursion limit the front end may raise to under --engine=stack, about a million nesting levels
+    max_front_end_frames = 1 << 22
 
     @staticmethod
     def main(args: List[str]):
-        if len(args) < 3:
-            print("Usage: ./your_program.sh tokenize <filename>", file=sys.stderr)
+        options: Dict[str, Any] = {}
+        paths: List[str] = []
+        for arg in args[2:]:
+            if arg.startswith('--'):
+                key, equals, value = arg[2:].partition('=')
+                options[key] = value if equals else True
+            else:
+                paths.append(arg)
+        if len(paths) != 1:
+            print(usage, file=sys.stderr)
             exit(1)
-        elif len(args) == 3:
-            Lox.run_file(args[2], args[1])
+        if args[1] == 'run-batch':
+            from app.Batch import run_batch
+            exit(run_batch(paths[0], options))
+        Lox.run_file(paths[0], args[1], options)
         # else:
         #     Lox.run_prompt()
 
     @staticmethod
-    def run_file(path: str, command: str) -> None:
+    def run_file(path: str, command: str, options: Optional[Dict[str, Any]] = None) -> None:
+        options = options or {}
         with open(path, 'r') as file:
+            if ((command == 'tokenize' or options.get('stream')) and not options.get('compact-tokens')
+                    and not options.get('scan-jobs')):
+                # Scanned chunk by chunk straight from the file, memory stays constant
+                Lox.run(file, command, options)
+                return
             source = file.read()
-        Lox.run(source, command)
+        Lox.run(source, command, options)
+
+    @staticmethod
+    def run_captured(path: str, command: str, options: Optional[Dict[str, Any]] = None) -> Tuple[str, str, int]:
+        """Runs one file like the CLI would but returns (stdout, stderr, exit code) instead of exiting. Every call
+        starts from fresh globals, so nothing one script does is visible to the next."""
+        import io
+        import traceback
+        from contextlib import redirect_stderr, redirect_stdout
+        out, err = io.StringIO(), io.StringIO()
+        code = 0
+        Lox.interpreter = None
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                Lox.run_file(path, command, options)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+            except Exception:
+                # Whatever the script manages to crash with is that script's failure, not the caller's
+                traceback.print_exc()
+                code = 1
+        Lox.interpreter = None
+        return out.getvalue(), err.getvalue(), code
 
     # @staticmethod
     # def run_prompt() -> None:
@@ -41,67 +91,236 @@ class Lox:
     #             break
 
     @staticmethod
-    def run(source: str, command: str) -> None:
-        from app.ExprParser import ExprParser
-        from app.Scanner import Scanner
-        from app.Parser import E, Parser
-        from app.ASTPrinter import AstPrinter  # We do not want circular import
-        Lox.had_error = False
-        Lox.had_runtime_error = False
-        if command == 'tokenize':
-            scanner: Scanner = Scanner(source)
-            tokens: List[Token] = scanner.scan_tokens()
-            for token in tokens:
-                print(token)
-        elif command == 'parse':
-            scanner: Scanner = Scanner(source)
-            tokens: List[Token] = scanner.scan_tokens()
-            parser: ExprParser = ExprParser(tokens)
-            expr: E = parser.parse()
-            try:
-                print(AstPrinter().print(expr))
-            except AttributeError:
-                Lox.had_error = True
-        elif command == 'evaluate':
-            scanner: Scanner = Scanner(source)
-            tokens: List[Token] = scanner.scan_tokens()
-            parser: ExprParser = ExprParser(tokens)
-            try:
-                expr: E = parser.parse()
-                Lox.evaluator.interpret(expr)
-            except AttributeError:
-                Lox.had_error = True
-        elif command == 'run':
-            scanner: Scanner = Scanner(source)
-            tokens: List[Token] = scanner.scan_tokens()
-            parser: Parser = Parser(tokens)
-            try:
-                expr = parser.parse()
-                Lox.interpreter.interpret(expr)
-            except AttributeError:
-                Lox.had_error = True
-        if Lox.had_runtime_error:
+    def configure_output(options: Dict[str, Any]) -> None:
+        """--flush picks the flush policy of the output sink, --log (or LOX_LOG) the level of diagnostics"""
+        if options.get('flush'):
+            Output.use(OutputSink(Output.sink.stream, policy=options['flush']))
+        level = options.get('log') or os.environ.get('LOX_LOG')
+        if level:
+            from app.Log import Log
+            Log.configure('debug' if level is True else level)
+
+    @staticmethod
+    def run(source: Union[str, TextIO], command: str, options: Optional[Dict[str, Any]] = None) -> None:
+        options = options or {}
+        ErrorReporter.reset()
+        Lox.configure_output(options)
+        try:
+            if command == 'tokenize':
+                for token in Lox.tokens(source, dict(options, stream=True)):
+                    Output.sink.write(f"{token}\n")
+            elif command == 'parse':
+                from app.ASTPrinter import AstPrinter
+                from app.ExprParser import ExprParser
+                expr: Any = Lox.parse(source, options, ExprParser)
+                try:
+                    Output.sink.write(AstPrinter().print(expr) + "\n")
+                except AttributeError:
+                    ErrorReporter.had_error = True
+            elif command == 'evaluate':
+                from app.ExprParser import ExprParser
+                try:
+                    expr: Any = Lox.parse(source, options, ExprParser)
+                    if Lox.evaluator is None:
+                        from app.Evaluator import Evaluator
+                        Lox.evaluator = Evaluator()
+                    if options.get('quicken-stats'):
+                        Lox.report_quickening(lambda: Lox.evaluator.interpret(expr))
+                    else:
+                        Lox.evaluator.interpret(expr)
+                except AttributeError:
+                    ErrorReporter.had_error = True
+            elif command in ('run', 'disassemble'):
+                from app.Optimizer import Optimizer
+                from app.Parser import Parser
+                from app.Resolver import Resolver
+                if options.get('engine') == 'stack':
+                    Lox.deep_front_end(source)
+                    options = dict(options, cache=False)
+                try:
+                    stmts = Lox.parse(source, options, Parser)
+                    if not options.get('no-optimize'):
+                        Optimizer().optimize(stmts)
+                    resolver = Resolver()
+                    resolver.resolve(stmts)
+                    if not resolver.had_error:
+                        Lox.execute(stmts, command, options)
+                except AttributeError:
+                    ErrorReporter.had_error = True
+                except RecursionError:
+                    print("Error: program nested too deeply.", file=sys.stderr)
+                    ErrorReporter.had_error = True
+        finally:
+            Output.sink.flush()
+        if ErrorReporter.had_runtime_error:
             exit(70)
-        if Lox.had_error:
+        if ErrorReporter.had_error:
             exit(65)
 
     @staticmethod
-    def error(token: Token, message: str) -> None:
-        if token.token_type == TokenType.EOF:
-            Lox.report(token.line, message=message, where=" at end")
+    def deep_front_end(source: Union[str, TextIO]) -> None:
+        """The parser, Optimizer and Resolver still recurse once per nesting level, at most three frames per source
+        character. Since Python 3.11 Python calls don't take C stack, so the recursion limit grows with the source, up
+        to max_front_end_frames. Code recursing in C (the parse cache's encoder, marshal) is not guarded by that limit
+        and would overflow the C stack instead of raising RecursionError, so this engine runs without the cache."""
+        size = len(source) if isinstance(source, str) else Lox.max_front_end_frames
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), min(3 * size + 1000, Lox.max_front_end_frames)))
+
+    @staticmethod
+    def parse(source: Union[str, TextIO], options: Dict[str, Any], parser_class: Any) -> Any:
+        """Parses with parser_class, with --cache[=dir] reusing the tree from an earlier run of the same
+        source. Only clean parses are cached so a hit never swallows diagnostics."""
+        if not options.get('cache') or not isinstance(source, str):
+            return parser_class(Lox.tokens(source, options)).parse()
+        from app.ParseCache import ParseCache
+        cache = ParseCache(options['cache'] if isinstance(options['cache'], str) else None)
+        tree = cache.load(source, parser_class.__name__)
+        if tree is None:
+            tree = parser_class(Lox.tokens(source, options)).parse()
+            if not ErrorReporter.had_error:
+                cache.store(source, parser_class.__name__, tree)
+        return tree
+
+    @staticmethod
+    def scanner_class(options: Dict[str, Any]) -> Any:
+        """Scanner picked by --scanner, both produce the same tokens and diagnostics"""
+        if options.get('scanner') == 'regex':
+            from app.RegexScanner import RegexScanner
+            return RegexScanner
+        from app.Scanner import Scanner
+        return Scanner
+
+    @staticmethod
+    def tokens(source: Union[str, TextIO], options: Dict[str, Any]) -> Iterable[Token]:
+        """Token list, or with --stream a lazy stream the parser pulls from. Streaming interleaves scanner
+        and parser diagnostics in source order instead of reporting all scanner errors first."""
+        if not isinstance(source, str):
+            from app.TokenStream import stream_tokens
+            return stream_tokens(source, Lox.scanner_class(options))
+        if options.get('scan-jobs'):
+            from app.ParallelScanner import scan_parallel
+            return scan_parallel(source, int(options['scan-jobs']) if isinstance(options['scan-jobs'], str) else None)
+        if options.get('compact-tokens'):
+            from app.RegexScanner import RegexScanner
+            return RegexScanner(source).scan_buffer()
+        scanner = Lox.scanner_class(options)(source)
+        if options.get('stream'):
+            return scanner.iter_tokens()
+        return scanner.scan_tokens()
+
+    @staticmethod
+    def execute(stmts: List[Any], command: str, options: Dict[str, Any]) -> None:
+        """Hands a resolved program to the engine picked by --engine, or prints what it compiles to. Nodes only the
+        tree-walker knows (arrays) make the other engines' compilers raise NotImplementedError, always before
+        anything has run, and the program runs on the tree-walker instead."""
+        engine = options.get('engine', 'tree')
+        if engine == 'tree' and command != 'disassemble' and not options.get('emit-python'):
+            Lox.interpret(stmts, options)
+            return
+        # Only the tree-walkers quicken, a compiling engine says so instead of printing no stats at all
+        no_stats = (options.get('quicken-stats') and command == 'run' and not options.get('emit-python')
+                    and engine in ('vm', 'closure', 'python'))
+        try:
+            if command == 'disassemble':
+                from app.Compiler import Compiler
+                Output.sink.write(Compiler().compile(stmts).disassemble() + "\n")
+            elif options.get('emit-python'):
+                from app.Transpiler import Transpiler
+                Output.sink.write(Transpiler().transpile(stmts))
+            elif engine == 'vm':
+                from app.Compiler import Compiler
+                from app.VM import VM
+                VM().interpret(Compiler().compile(stmts))
+            elif engine == 'closure':
+                from app.ClosureCompiler import ClosureCompiler
+                ClosureCompiler().interpret(stmts)
+            elif engine == 'python':
+                from app.Transpiler import Transpiler
+                Transpiler().run(stmts)
+            elif engine == 'stack':
+                from app.StackInterpreter import StackInterpreter
+                interpreter = StackInterpreter()
+                if options.get('max-depth'):
+                    interpreter.max_depth = int(options['max-depth'])
+                if options.get('quicken-stats'):
+                    Lox.report_quickening(lambda: interpreter.interpret(stmts))
+                else:
+                    interpreter.interpret(stmts)
+            else:
+                Lox.interpret(stmts, options)
+        except NotImplementedError:
+            if command == 'disassemble' or options.get('emit-python'):
+                print("Error: this program uses features only the tree-walker supports.", file=sys.stderr)
+                ErrorReporter.had_error = True
+            else:
+                no_stats = False
+                Lox.interpret(stmts, options)
+        finally:
+            if no_stats:
+                print(f"Quickening: no stats, --engine={engine} does not quicken, only the tree and stack engines do",
+                      file=sys.stderr)
+
+    @staticmethod
+    def interpret(stmts: List[Any], options: Dict[str, Any]) -> None:
+        if Lox.interpreter is None:
+            from app.Interpreter import Interpreter
+            Lox.interpreter = Interpreter()
+        if options.get('max-depth'):
+            Lox.interpreter.max_depth = int(options['max-depth'])
+        if options.get('profile'):
+            Lox.profile(Lox.interpreter, stmts, options['profile'])
+        elif options.get('sample'):
+            Lox.sample(Lox.interpreter, stmts, options)
+        elif options.get('quicken-stats'):
+            Lox.report_quickening(lambda: Lox.interpreter.interpret(stmts))
         else:
-            Lox.report(token.line, message=message, where=" at '" + token.lexeme + "'")
+            Lox.interpreter.interpret(stmts)
+
+    @staticmethod
+    def report_quickening(run: Callable[[], None]) -> None:
+        """Runs run() and prints how many + nodes quickened into which variant and how many deoptimized, to stderr
+        and even when the program stops on a runtime error"""
+        from app.Operators import counters
+        counters.clear()
+        try:
+            run()
+        finally:
+            variants = ", ".join(f"{name} {count}" for name, count in sorted(counters.items())
+                                 if name not in ('specialized', 'deoptimized'))
+            print(f"Quickening: {counters['specialized']} specialized ({variants or 'none'}), "
+                  f"{counters['deoptimized']} deoptimized", file=sys.stderr)
 
     @staticmethod
-    def report(line: int, message: str, char: Optional[str] = None, where: str = '') -> None:
-        Lox.had_error = True
-        print(f"[line {line}] Error{where}: {message}{char if char is not None else ''}", file=sys.stderr)
+    def profile(interpreter: Any, stmts: List[Any], target: Union[bool, str]) -> None:
+        """Runs stmts with the interpreter instrumented, the hot spot table goes to stderr or the --profile=file
+        even when the program stops on a runtime error"""
+        from app.Profiler import NodeProfiler
+        profiler = NodeProfiler()
+        profiler.install(interpreter)
+        try:
+            interpreter.interpret(stmts)
+        finally:
+            NodeProfiler.uninstall(interpreter)
+            if isinstance(target, str):
+                with open(target, 'w') as file:
+                    profiler.report(file)
+            else:
+                profiler.report()
 
     @staticmethod
-    def runtime_error(error: RuntimeException) -> None:
-        print(f"{error}\n[line {error.token.line}]", file=sys.stderr)
-        exit(70)
-        Lox.had_runtime_error = True
+    def sample(interpreter: Any, stmts: List[Any], options: Dict[str, Any]) -> None:
+        """Runs stmts under the sampling profiler, every --sample-interval milliseconds of CPU time (1 by default),
+        and writes the collapsed stacks to the --sample=file (lox.collapsed by default)"""
+        from app.Profiler import SamplingProfiler
+        path = options['sample'] if isinstance(options['sample'], str) else 'lox.collapsed'
+        profiler = SamplingProfiler(float(options.get('sample-interval', 1)) / 1000)
+        profiler.start()
+        try:
+            interpreter.interpret(stmts)
+        finally:
+            profiler.stop()
+            with open(path, 'w') as file:
+                profiler.write(file)
 
 
 if __name__ == "__main__":
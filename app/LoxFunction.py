@@ -0,0 +1,52 @@
+from typing import Any, Callable, List
+
+from app.Environment import LocalEnvironment
+
+
+class LoxCallable:
+    """Anything a Lox call expression can call"""
+    __slots__ = ()
+
+    def arity(self) -> int:
+        raise NotImplementedError()
+
+    def call(self, interpreter: Any, arguments: List[Any]) -> Any:
+        raise NotImplementedError()
+
+
+class LoxFunction(LoxCallable):
+    """A `fun` declaration together with the scope it was declared in"""
+    __slots__ = ('declaration', 'closure')
+
+    def __init__(self, declaration: Any, closure: Any) -> None:
+        self.declaration = declaration
+        self.closure = closure
+
+    def arity(self) -> int:
+        return len(self.declaration.params)
+
+    def call(self, interpreter: Any, arguments: List[Any]) -> Any:
+        declaration = self.declaration
+        frame = LocalEnvironment.frame(arguments, declaration.slot_count, self.closure)
+        return interpreter.execute_function(declaration.body, frame)
+
+    def __str__(self) -> str:
+        return f"<fn {self.declaration.name.lexeme}>"
+
+
+class NativeFunction(LoxCallable):
+    __slots__ = ('name', 'parameters', 'function')
+
+    def __init__(self, name: str, parameters: int, function: Callable[..., Any]) -> None:
+        self.name = name
+        self.parameters = parameters
+        self.function = function
+
+    def arity(self) -> int:
+        return self.parameters
+
+    def call(self, interpreter: Any, arguments: List[Any]) -> Any:
+        return self.function(*arguments)
+
+    def __str__(self) -> str:
+        return "<native fn>"
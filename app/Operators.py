@@ -0,0 +1,187 @@
+"""Lox operator semantics, one function per operator taking the node (its operator token is what errors point
+at) and the operand values. Every Binary and Unary node gets its function as `op` on its first evaluation (it is
+built with a stub from app.LazyOperators, so parsing never imports this module), so evaluating a node calls the
+right operator directly instead of comparing the token type against every operator in turn.
+
+`+` is the one operator with more than one meaning, so its nodes quicken: the first run rewrites node.op into
+the variant for the operand types it saw (add_floats, concat), which checks only for those. When a guard fails
+the node deoptimizes to add_generic for good, which handles everything, errors included, exactly like an
+unspecialized node. Every other operator only accepts numbers (or anything, for == and !=), its op already is
+the fast path with a single guard. `counters` tallies what quickening did.
+
+A Lox string is a str or, once + has made it long, a Rope (app.Rope), concatenation goes through concatenate()
+which picks between them. Arrays (app.Array) go through the scalar guards first and only then to
+vectorized(), so they cost scalar code nothing."""
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+from app.Array import Array
+from app.Errors import RuntimeException
+from app.Rope import Rope, concatenate
+from app.Token import TokenType
+
+
+counters: Counter = Counter()
+strings = (str, Rope)
+
+
+def specialize(node: Any, op: Callable[..., Any]) -> None:
+    counters['specialized'] += 1
+    counters[op.__name__] += 1
+    node.op = op
+
+
+def deoptimize(node: Any, generic: Callable[..., Any], *operands: Any) -> Any:
+    counters['deoptimized'] += 1
+    node.op = generic
+    return generic(node, *operands)
+
+
+def add(node: Any, left: Any, right: Any) -> Any:
+    """+ as the parser builds it, specializes the node on its first run"""
+    if type(left) is float and type(right) is float:
+        specialize(node, add_floats)
+        return left + right
+    if type(left) in strings and type(right) in strings:
+        specialize(node, concat)
+        return concatenate(left, right)
+    return add_generic(node, left, right)
+
+
+def add_floats(node: Any, left: Any, right: Any) -> Any:
+    if type(left) is float and type(right) is float:
+        return left + right
+    return deoptimize(node, add_generic, left, right)
+
+
+def concat(node: Any, left: Any, right: Any) -> Any:
+    if type(left) in strings and type(right) in strings:
+        return concatenate(left, right)
+    return deoptimize(node, add_generic, left, right)
+
+
+def add_generic(node: Any, left: Any, right: Any) -> Any:
+    if type(left) is float and type(right) is float:
+        return left + right
+    if type(left) in strings and type(right) in strings:
+        return concatenate(left, right)
+    return vectorized(node, left, right, "Operands must be two numbers or two strings.")
+
+
+def vectorized(node: Any, left: Any, right: Any, message: str) -> Any:
+    """An arithmetic or comparison operator over a numeric array and a number or another numeric array, message is
+    the operator's error for any other operands"""
+    if type(left) is Array and not left.boolean:
+        if type(right) is float or type(right) is Array and not right.boolean:
+            try:
+                return left.broadcast(node.operator.token_type, right)
+            except ValueError:
+                raise RuntimeException(node.operator, "Arrays must have the same length.")
+    elif type(right) is Array and not right.boolean and type(left) is float:
+        return right.broadcast(node.operator.token_type, left, reflected=True)
+    raise RuntimeException(node.operator, message)
+
+
+def subtract(node: Any, left: Any, right: Any) -> float:
+    if type(left) is float and type(right) is float:
+        return left - right
+    return vectorized(node, left, right, "Operands must be a numbers.")
+
+
+def multiply(node: Any, left: Any, right: Any) -> float:
+    if type(left) is float and type(right) is float:
+        return left * right
+    return vectorized(node, left, right, "Operands must be a numbers.")
+
+
+def divide(node: Any, left: Any, right: Any) -> float:
+    if type(left) is float and type(right) is float:
+        return left / right
+    return vectorized(node, left, right, "Operands must be a numbers.")
+
+
+def greater(node: Any, left: Any, right: Any) -> bool:
+    if type(left) is float and type(right) is float:
+        return left > right
+    return vectorized(node, left, right, "Operands must be a numbers.")
+
+
+def greater_equal(node: Any, left: Any, right: Any) -> bool:
+    if type(left) is float and type(right) is float:
+        return left >= right
+    return vectorized(node, left, right, "Operands must be a numbers.")
+
+
+def less(node: Any, left: Any, right: Any) -> bool:
+    if type(left) is float and type(right) is float:
+        return left < right
+    return vectorized(node, left, right, "Operands must be a numbers.")
+
+
+def less_equal(node: Any, left: Any, right: Any) -> bool:
+    if type(left) is float and type(right) is float:
+        return left <= right
+    return vectorized(node, left, right, "Operands must be a numbers.")
+
+
+def equal(node: Any, left: Any, right: Any) -> bool:
+    # Interpreter.is_equal, nil only equals nil and Python's == already says so for every Lox value
+    return left == right
+
+
+def not_equal(node: Any, left: Any, right: Any) -> bool:
+    return left != right
+
+
+def negate(node: Any, right: Any) -> float:
+    if type(right) is float:
+        return -right
+    if type(right) is Array and not right.boolean:
+        return right.negate()
+    raise RuntimeException(node.operator, "Operand must be a number.")
+
+
+def not_(node: Any, right: Any) -> bool:
+    return right is None or right is False
+
+
+def array(node: Any, elements: List[Any]) -> Array:
+    for element in elements:
+        if type(element) is not float:
+            raise RuntimeException(node.bracket, "Array elements must be numbers.")
+    return Array.of(elements)
+
+
+def index(node: Any, target: Any, position: Any) -> Any:
+    if type(target) is not Array:
+        raise RuntimeException(node.bracket, "Only arrays can be indexed.")
+    if type(position) is not float or not position.is_integer():
+        raise RuntimeException(node.bracket, "Array index must be an integer.")
+    if not 0 <= position < len(target):
+        raise RuntimeException(node.bracket, "Array index out of range.")
+    return target.get(int(position))
+
+
+binary_operators: Dict[str, Callable[[Any, Any, Any], Any]] = {
+    TokenType.PLUS: add,
+    TokenType.MINUS: subtract,
+    TokenType.STAR: multiply,
+    TokenType.SLASH: divide,
+    TokenType.GREATER: greater,
+    TokenType.GREATER_EQUAL: greater_equal,
+    TokenType.LESS: less,
+    TokenType.LESS_EQUAL: less_equal,
+    TokenType.EQUAL_EQUAL: equal,
+    TokenType.BANG_EQUAL: not_equal,
+}
+
+unary_operators: Dict[str, Callable[[Any, Any], Any]] = {
+    TokenType.MINUS: negate,
+    TokenType.BANG: not_,
+}
+
+# Function name -> function, how the parse cache stores an op
+by_name: Dict[str, Callable[..., Any]] = {
+    function.__name__: function
+    for function in (*binary_operators.values(), *unary_operators.values(), add_floats, concat, add_generic)
+}
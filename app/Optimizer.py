@@ -0,0 +1,245 @@
+from typing import Any, Dict, List, Optional, Set
+
+from app.Errors import RuntimeException
+from app.Expr import (ExprVisitor, Expr, Binary, Grouping, Literal, Unary, Variable, Assign, ArrayLiteral, Index,
+                      Call)
+from app.Interpreter import Interpreter
+from app.Rope import Rope
+from app.Stmt import StmtVisitor, Stmt, Expression, Print, Var, Block, Function, Return
+
+
+class Scopes:
+    """Name -> declaration (Var or Function statement, or parameter token), same scoping rules as the Resolver.
+    Lox has no control flow yet, so outside of function bodies textual order is execution order and a reference
+    binds to the closest preceding declaration."""
+
+    def __init__(self) -> None:
+        self._scopes: List[Dict[str, Any]] = [{}]
+
+    def begin(self) -> None:
+        self._scopes.append({})
+
+    def end(self) -> None:
+        self._scopes.pop()
+
+    def depth(self) -> int:
+        return len(self._scopes)
+
+    def declare(self, name: str, declaration: Any) -> None:
+        self._scopes[-1][name] = declaration
+
+    def lookup(self, name: str, base: int = 0) -> Optional[Any]:
+        """Declaration name refers to, None when it is not declared in the scopes from base up"""
+        for scope in reversed(self._scopes[base:]):
+            if name in scope:
+                return scope[name]
+        return None
+
+
+class AssignmentCollector(ExprVisitor, StmtVisitor):
+    """First pass: which declarations are ever assigned to, and which names are assigned in a function body. A
+    function runs when it is called, not where it is written, so those assignments may reach a declaration that
+    comes later in the text."""
+
+    def __init__(self) -> None:
+        self.scopes = Scopes()
+        self.assigned: Set[int] = set()
+        self.assigned_in_functions: Set[str] = set()
+        self._functions = 0
+
+    def collect(self, statements: List[Optional[Stmt]]) -> Set[int]:
+        for stmt in statements:
+            if stmt is not None:
+                stmt.accept(self)
+        return self.assigned
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        self.scopes.begin()
+        self.collect(stmt.statements)
+        self.scopes.end()
+
+    def visit_variable_stm(self, stmt: Var) -> None:
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+        self.scopes.declare(stmt.name.lexeme, stmt)
+
+    def visit_function(self, stmt: Function) -> None:
+        self.scopes.declare(stmt.name.lexeme, stmt)
+        self.scopes.begin()
+        for param in stmt.params:
+            self.scopes.declare(param.lexeme, param)
+        self._functions += 1
+        self.collect(stmt.body)
+        self._functions -= 1
+        self.scopes.end()
+
+    def visit_return(self, stmt: Return) -> None:
+        if stmt.value is not None:
+            stmt.value.accept(self)
+
+    def visit_expression(self, stmt: Expression) -> None:
+        stmt.expression.accept(self)
+
+    def visit_print(self, stmt: Print) -> None:
+        stmt.expression.accept(self)
+
+    def visit_binary(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    def visit_grouping(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    def visit_literal(self, expr: Literal) -> None:
+        return None
+
+    def visit_unary(self, expr: Unary) -> None:
+        expr.right.accept(self)
+
+    def visit_variable_expr(self, expr: Variable) -> None:
+        return None
+
+    def visit_assign(self, expr: Assign) -> None:
+        expr.value.accept(self)
+        declaration = self.scopes.lookup(expr.name.lexeme)
+        if declaration is not None:
+            self.assigned.add(id(declaration))
+        if self._functions:
+            self.assigned_in_functions.add(expr.name.lexeme)
+
+    def visit_array_literal(self, expr: ArrayLiteral) -> None:
+        for element in expr.elements:
+            element.accept(self)
+
+    def visit_index(self, expr: Index) -> None:
+        expr.target.accept(self)
+        expr.index.accept(self)
+
+    def visit_call(self, expr: Call) -> None:
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+
+
+class Optimizer(ExprVisitor, StmtVisitor):
+    """Constant folding and propagation, run on the parsed tree before the Resolver.
+
+    Binary/Unary/Grouping nodes whose operands are Literals are replaced by their value, computed by the
+    Interpreter itself so semantics cannot drift. An operation that would raise is left in place and
+    raises at run time on its original line. Variables whose declaration is never assigned to and
+    whose initializer folds to a Literal are replaced by that Literal. A function body only sees the constants
+    declared inside it, by the time it is called an outer name may have been redeclared."""
+
+    def __init__(self) -> None:
+        self._evaluator = Interpreter()
+        self._scopes = Scopes()
+        self._assigned: Set[int] = set()
+        self._assigned_in_functions: Set[str] = set()
+        self._constants: Dict[int, Any] = {}
+        # First scope of the innermost function body, declarations below it are not propagated into it
+        self._base = 0
+
+    def optimize(self, statements: List[Optional[Stmt]]) -> List[Optional[Stmt]]:
+        collector = AssignmentCollector()
+        self._assigned = collector.collect(statements)
+        self._assigned_in_functions = collector.assigned_in_functions
+        self.optimize_all(statements)
+        return statements
+
+    def optimize_all(self, statements: List[Optional[Stmt]]) -> None:
+        for stmt in statements:
+            if stmt is not None:
+                stmt.accept(self)
+
+    def fold(self, expr: Expr) -> Expr:
+        """Evaluates a node whose operands are already Literals, keeps it if evaluating raises. A long concatenation
+        evaluates to a Rope, the Literal gets its text: the other engines only know str constants."""
+        try:
+            value = self._evaluator.evaluate(expr)
+        except (RuntimeException, ZeroDivisionError):
+            return expr
+        return Literal(str(value) if isinstance(value, Rope) else value)
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        self._scopes.begin()
+        self.optimize_all(stmt.statements)
+        self._scopes.end()
+
+    def visit_variable_stm(self, stmt: Var) -> None:
+        if stmt.initializer is not None:
+            stmt.initializer = stmt.initializer.accept(self)
+        self._scopes.declare(stmt.name.lexeme, stmt)
+        if id(stmt) in self._assigned or stmt.name.lexeme in self._assigned_in_functions:
+            return
+        if stmt.initializer is None:
+            self._constants[id(stmt)] = None
+        elif isinstance(stmt.initializer, Literal):
+            self._constants[id(stmt)] = stmt.initializer.value
+
+    def visit_function(self, stmt: Function) -> None:
+        self._scopes.declare(stmt.name.lexeme, stmt)
+        base = self._base
+        self._scopes.begin()
+        self._base = self._scopes.depth() - 1
+        for param in stmt.params:
+            self._scopes.declare(param.lexeme, param)
+        self.optimize_all(stmt.body)
+        self._scopes.end()
+        self._base = base
+
+    def visit_return(self, stmt: Return) -> None:
+        if stmt.value is not None:
+            stmt.value = stmt.value.accept(self)
+
+    def visit_expression(self, stmt: Expression) -> None:
+        stmt.expression = stmt.expression.accept(self)
+
+    def visit_print(self, stmt: Print) -> None:
+        stmt.expression = stmt.expression.accept(self)
+
+    def visit_binary(self, expr: Binary) -> Expr:
+        expr.left = expr.left.accept(self)
+        expr.right = expr.right.accept(self)
+        if isinstance(expr.left, Literal) and isinstance(expr.right, Literal):
+            return self.fold(expr)
+        return expr
+
+    def visit_grouping(self, expr: Grouping) -> Expr:
+        expr.expression = expr.expression.accept(self)
+        if isinstance(expr.expression, Literal):
+            return expr.expression
+        return expr
+
+    def visit_literal(self, expr: Literal) -> Expr:
+        return expr
+
+    def visit_unary(self, expr: Unary) -> Expr:
+        expr.right = expr.right.accept(self)
+        if isinstance(expr.right, Literal):
+            return self.fold(expr)
+        return expr
+
+    def visit_variable_expr(self, expr: Variable) -> Expr:
+        declaration = self._scopes.lookup(expr.name.lexeme, self._base)
+        if declaration is not None and id(declaration) in self._constants:
+            return Literal(self._constants[id(declaration)])
+        return expr
+
+    def visit_assign(self, expr: Assign) -> Expr:
+        expr.value = expr.value.accept(self)
+        return expr
+
+    def visit_array_literal(self, expr: ArrayLiteral) -> Expr:
+        # Elements fold, the array itself is built at run time so no Literal ever holds one
+        expr.elements = [element.accept(self) for element in expr.elements]
+        return expr
+
+    def visit_index(self, expr: Index) -> Expr:
+        expr.target = expr.target.accept(self)
+        expr.index = expr.index.accept(self)
+        return expr
+
+    def visit_call(self, expr: Call) -> Expr:
+        expr.callee = expr.callee.accept(self)
+        expr.arguments = [argument.accept(self) for argument in expr.arguments]
+        return expr
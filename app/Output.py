@@ -0,0 +1,51 @@
+import sys
+from typing import List, Optional, TextIO
+
+
+class OutputSink:
+    """Buffer between a program's output and a stream, sys.stdout as it is at flush time unless given one.
+
+    The flush policy decides when buffered text is written: "line" after every write, "size" once buffer_size
+    characters are waiting, "exit" only when flushed explicitly. Whatever the policy, the engines flush when a
+    program ends and ErrorReporter flushes before every diagnostic, so output and errors keep their order.
+    Embedding code can collect output in memory with OutputSink(io.StringIO()) and Output.use()."""
+    policies = ('line', 'size', 'exit')
+
+    def __init__(self, stream: Optional[TextIO] = None, policy: str = 'size', buffer_size: int = 1 << 16) -> None:
+        if policy not in self.policies:
+            raise ValueError(f"Unknown flush policy {policy!r}, expected one of {', '.join(self.policies)}")
+        self.stream = stream
+        self.policy = policy
+        self.buffer_size = buffer_size
+        self._parts: List[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        if self.policy == 'size':
+            self._size += len(text)
+            if self._size >= self.buffer_size:
+                self.flush()
+        elif self.policy == 'line':
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            stream = self.stream or sys.stdout
+            stream.write(''.join(self._parts))
+            stream.flush()
+            self._parts.clear()
+            self._size = 0
+
+
+class Output:
+    """The sink every engine and command writes program output to, shared like ErrorReporter's state"""
+    sink = OutputSink()
+
+    @staticmethod
+    def use(sink: OutputSink) -> OutputSink:
+        """Makes sink the current one, returns the one it replaces after flushing it"""
+        previous = Output.sink
+        previous.flush()
+        Output.sink = sink
+        return previous
@@ -0,0 +1,105 @@
+"""`--scan-jobs[=n]`: scans a large source on n worker processes (one per core by default).
+
+The source is cut into chunks at newlines, found with the pre-pass TokenStream uses to keep strings whole: a
+chunk of whole lines scans exactly as it would inside the full source, unless it ends inside a string, and then
+it is cut before that string's opening quote instead. Every worker scans its chunks straight into TokenBuffer
+arrays with offsets and line numbers of the full source, so stitching them is concatenating arrays, and its
+diagnostics come back as the arguments of the ErrorReporter.report calls it would have made, replayed in chunk
+order. The result is a TokenBuffer of the same tokens, lines and diagnostics as Scanner(source).scan_tokens()."""
+import multiprocessing
+import os
+from typing import Any, List, Optional, Tuple
+
+from app.Errors import ErrorReporter
+from app.RegexScanner import RegexScanner
+from app.TokenBuffer import TokenBuffer, TokenKind
+from app.TokenStream import open_string_start
+
+# Sources smaller than this are not worth starting processes for
+min_parallel_size = 1 << 20
+# Chunks per worker, more of them even out chunks that scan slower than others
+chunks_per_job = 4
+
+# The source a worker scans, set by the pool initializer
+_source = ""
+# ErrorReporter.report arguments of the chunk being scanned
+_reports: List[Tuple[Any, ...]] = []
+
+
+def chunk_bounds(source: str, chunk_size: int) -> List[Tuple[int, int]]:
+    """(start, end) of chunks of about chunk_size characters, each ending after a newline or before the opening
+    quote of a string the newline would split. A string longer than a chunk makes its chunk longer."""
+    bounds: List[Tuple[int, int]] = []
+    size = len(source)
+    start = 0
+    while start < size:
+        end = start + chunk_size
+        while True:
+            newline = source.find('\n', end)
+            if newline < 0:
+                end = size
+                break
+            end = newline + 1
+            cut = open_string_start(source, start, end)
+            if cut is None:
+                break
+            if cut > start:
+                end = cut
+                break
+            # The chunk is a single string so far, it has to reach past the closing quote
+            closing = source.find('"', start + 1)
+            if closing < 0:
+                end = size
+                break
+            end = closing + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def record_report(line: int, message: str, char: Optional[str] = None, where: str = '') -> None:
+    _reports.append((line, message, char, where))
+
+
+def initialize(source: str) -> None:
+    """Pool initializer: the source is inherited (or sent once) instead of pickled with every chunk"""
+    global _source
+    _source = source
+    ErrorReporter.report = record_report
+
+
+def scan_chunk(chunk: Tuple[int, int, int]) -> Tuple[TokenBuffer, List[Tuple[Any, ...]]]:
+    """Tokens of source[start:end] starting at line, and the diagnostics scanning them reported"""
+    start, end, line = chunk
+    scanner = RegexScanner(_source)
+    scanner._current = start
+    scanner._line = line
+    buffer = TokenBuffer(_source)
+    scanner.fill_buffer(buffer, end)
+    # Only the arrays go back to the parent, not another copy of the source
+    buffer.source = ""
+    reports = list(_reports)
+    _reports.clear()
+    return buffer, reports
+
+
+def scan_parallel(source: str, jobs: Optional[int] = None) -> TokenBuffer:
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(source) < min_parallel_size:
+        return RegexScanner(source).scan_buffer()
+    chunks = []
+    line = 1
+    for start, end in chunk_bounds(source, len(source) // (jobs * chunks_per_job) + 1):
+        chunks.append((start, end, line))
+        line += source.count('\n', start, end)
+    buffer = TokenBuffer(source)
+    columns = ('kinds', 'starts', 'ends', 'lines')
+    with multiprocessing.Pool(min(jobs, len(chunks)), initializer=initialize, initargs=(source,)) as pool:
+        for part, reports in pool.imap(scan_chunk, chunks):
+            for name in columns:
+                getattr(buffer, name).extend(getattr(part, name))
+            for report in reports:
+                ErrorReporter.report(*report)
+    end = len(source)
+    buffer.add(TokenKind.EOF, end, end, line)
+    return buffer
@@ -0,0 +1,159 @@
+import gc
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from types import FunctionType
+from typing import Any, Dict, List, Optional, Tuple
+
+import app.Expr
+import app.Stmt
+from app.LazyOperators import by_name as operators, operator
+from app.Token import Token
+
+# Every node class the Parser can produce, the index is what the cache stores
+node_classes: List[type] = list(app.Expr.expr_dispatch) + list(app.Stmt.stmt_dispatch)
+class_index: Dict[type, int] = {cls: index for index, cls in enumerate(node_classes)}
+
+# Bumped by hand when the encoding changes, the node layout and Python version are folded in automatically
+FORMAT = 1
+VERSION: bytes = hashlib.sha256(repr((
+    FORMAT, sys.version_info[:2], marshal.version, [(cls.__name__, cls.__slots__) for cls in node_classes],
+    sorted(operators)
+)).encode()).hexdigest()[:16].encode()
+MAGIC = b"LOXC"
+DIGEST_SIZE = 16
+
+
+def digest(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=DIGEST_SIZE).digest()
+
+
+# Encoded form: a node is a tuple of its class index and slot values, a token is a tuple starting with its
+# type name, statement lists stay lists, an operator function is its name as bytes. Lox values are never
+# tuples, lists or bytes, so nothing is ambiguous.
+def encode(value: Any) -> Any:
+    if type(value) is list:
+        return [encode(item) for item in value]
+    if type(value) is FunctionType:
+        return value.__name__.encode()
+    if type(value) is Token:
+        return value.token_type, value.lexeme, value.literal, value.line
+    index = class_index.get(type(value))
+    if index is not None:
+        return (index,) + tuple(encode(getattr(value, name)) for name in node_classes[index].__slots__)
+    return value
+
+
+plain = {float, str, bool, int}
+layouts: List[Tuple[type, Tuple[str, ...]]] = [(cls, cls.__slots__) for cls in node_classes]
+
+
+def decode(value: Any) -> Any:
+    if type(value) is list:
+        return [decode(item) for item in value]
+    if type(value) is bytes:
+        return operator(value.decode())
+    if type(value[0]) is not int:
+        return Token(*value)
+    cls, names = layouts[value[0]]
+    node = cls.__new__(cls)
+    for name, field in zip(names, value[1:]):
+        setattr(node, name, field if field is None or type(field) in plain else decode(field))
+    return node
+
+
+class ParseCache:
+    """Parsed programs on disk, keyed by a hash of the source, what parsed it and VERSION.
+
+    Entries are written to a temporary file and renamed into place, so concurrent writers never expose a
+    partial entry. Loading never trusts an entry: a bad header, a checksum mismatch or anything that fails to decode is
+    deleted and reported as a miss, so the caller parses from scratch. After a write the least recently
+    used entries are evicted until the directory is under max_bytes."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None) -> None:
+        self.directory = directory or os.environ.get("LOX_CACHE_DIR") or os.path.join(
+            os.path.expanduser("~"), ".cache", "lox")
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.environ.get("LOX_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+    def path(self, source: str, kind: str) -> str:
+        key = hashlib.sha256(VERSION + kind.encode() + b"\0" + source.encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(self.directory, key + ".loxc")
+
+    def load(self, source: str, kind: str) -> Optional[Any]:
+        path = self.path(source, kind)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        header = MAGIC + VERSION
+        payload = data[len(header) + DIGEST_SIZE:]
+        try:
+            if not data.startswith(header):
+                raise ValueError("stale or foreign cache entry")
+            if data[len(header):len(header) + DIGEST_SIZE] != digest(payload):
+                raise ValueError("corrupt cache entry")
+            # Decoding allocates the whole tree and no garbage, pausing the collector avoids repeated full
+            # collections over it, as in ClosureCompiler.compile
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                tree = decode(marshal.loads(payload))  # A list of statements or a single expression node
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+        except Exception:
+            self.discard(path)
+            return None
+        try:
+            os.utime(path)  # Recently used, evicted last
+        except OSError:
+            pass
+        return tree
+
+    def store(self, source: str, kind: str, tree: Any) -> None:
+        try:
+            payload = marshal.dumps(encode(tree))
+        except (ValueError, RecursionError):
+            return  # Nested deeper than marshal allows, just not cached
+        data = MAGIC + VERSION + digest(payload) + payload
+        temporary: Optional[str] = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, self.path(source, kind))
+        except OSError:
+            # A full disk must not leave a temporary behind, evict() never sees those
+            if temporary is not None:
+                self.discard(temporary)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        entries: List[Tuple[float, int, str]] = []
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.name.endswith(".loxc"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            total -= size
+
+    @staticmethod
+    def discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,173 @@
+from typing import Any, Callable, Dict, Iterable, List, Tuple, TypeVar
+
+from app.Expr import Binary, Unary, Literal, Grouping, ArrayLiteral, Index
+from app.Errors import ErrorReporter, ParserError
+from app.Token import Token, TokenType
+from app.lexems import statements
+
+E = TypeVar('E')
+
+# Binding powers, loosest first. Binary operators are left associative, their right operand binds one level tighter.
+ASSIGNMENT, EQUALITY, COMPARISON, TERM, FACTOR, UNARY, CALL = range(1, 8)
+
+# Keyword literals, numbers and strings carry their value in the token
+literal_values: Dict[str, Any] = {TokenType.FALSE: False, TokenType.TRUE: True, TokenType.NIL: None}
+
+
+class PrattParser:
+    """Expression grammar shared by Parser and ExprParser. Instead of one method per precedence level, every
+    expression is parsed by parse_precedence(): the current token's kind picks a prefix rule from prefix_rules,
+    then infix_rules is looked up for each following token while its operator binds at least as tight as asked for.
+    A literal is three calls deep instead of nine, and an operator costs one dict lookup instead of a match() per
+    level. The trees and error messages are the ones the recursive descent chain produced."""
+
+    def __init__(self, tokens: Iterable[Token]):
+        """Tokens can be a list or a lazy stream, the parser only keeps the current and previous one"""
+        self._tokens = iter(tokens)
+        self._current: Token = next(self._tokens)
+        self._previous: Token = self._current
+
+    def expression(self) -> E:
+        """Returns expression(Binary, Unary etc)"""
+        return self.parse_precedence(ASSIGNMENT)
+
+    def parse_precedence(self, precedence: int) -> E:
+        """An expression whose operators bind at precedence or tighter"""
+        prefix = self.prefix_rules.get(self._current.token_type)
+        if prefix is None:
+            raise self.error(self._current, "Expect expression.")
+        # A token with a rule is never EOF, so advancing needs no check
+        self._previous = self._current
+        self._current = next(self._tokens)
+        expr: E = prefix(self)
+        infix_rules = self.infix_rules
+        while True:
+            rule = infix_rules.get(self._current.token_type)
+            if rule is None or rule[0] < precedence:
+                return expr
+            self._previous = self._current
+            self._current = next(self._tokens)
+            expr = rule[1](self, expr)
+
+    def literal(self) -> E:
+        token: Token = self._previous
+        return Literal(literal_values.get(token.token_type, token.literal))
+
+    def grouping(self) -> E:
+        expr: E = self.expression()
+        self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
+        return Grouping(expr)
+
+    def array_literal(self) -> E:
+        bracket: Token = self._previous
+        elements: List[E] = []
+        if not self.check(TokenType.RIGHT_BRACKET):
+            elements.append(self.expression())
+            while self.match(TokenType.COMMA):
+                elements.append(self.expression())
+        self.consume(TokenType.RIGHT_BRACKET, "Expect ']' after array elements.")
+        return ArrayLiteral(bracket, elements)
+
+    def unary(self) -> E:
+        """! and -, their operand is another unary or a call: -a(1) negates the call"""
+        operator: Token = self._previous
+        return Unary(operator, self.parse_precedence(UNARY))
+
+    def binary(self, left: E) -> E:
+        operator: Token = self._previous
+        right: E = self.parse_precedence(self.infix_rules[operator.token_type][0] + 1)
+        return Binary(left, operator, right)
+
+    def index(self, target: E) -> E:
+        index: E = self.expression()
+        bracket: Token = self.consume(TokenType.RIGHT_BRACKET, "Expect ']' after index.")
+        return Index(target, bracket, index)
+
+    # Token kind -> rule for an expression starting with it
+    prefix_rules: Dict[str, Callable[['PrattParser'], Any]] = {
+        TokenType.FALSE: literal,
+        TokenType.TRUE: literal,
+        TokenType.NIL: literal,
+        TokenType.NUMBER: literal,
+        TokenType.STRING: literal,
+        TokenType.LEFT_PAREN: grouping,
+        TokenType.LEFT_BRACKET: array_literal,
+        TokenType.BANG: unary,
+        TokenType.MINUS: unary,
+    }
+
+    # Token kind -> (precedence, rule) for an operator following an expression
+    infix_rules: Dict[str, Tuple[int, Callable[['PrattParser', Any], Any]]] = {
+        TokenType.BANG_EQUAL: (EQUALITY, binary),
+        TokenType.EQUAL_EQUAL: (EQUALITY, binary),
+        TokenType.GREATER: (COMPARISON, binary),
+        TokenType.GREATER_EQUAL: (COMPARISON, binary),
+        TokenType.LESS: (COMPARISON, binary),
+        TokenType.LESS_EQUAL: (COMPARISON, binary),
+        TokenType.PLUS: (TERM, binary),
+        TokenType.MINUS: (TERM, binary),
+        TokenType.SLASH: (FACTOR, binary),
+        TokenType.STAR: (FACTOR, binary),
+        TokenType.LEFT_BRACKET: (CALL, index),
+    }
+
+    def match(self, *types) -> bool:
+        """Helper method. Returns True if current Token is of the expected types"""
+        for token_type in types:
+            if self.check(token_type):
+                self.advance()
+                return True
+        return False
+
+    def check(self, token_type: TokenType) -> bool:
+        """Used by match() checks if not EOF and if given type equals to type of the current Token"""
+        if self.is_at_end():
+            return False
+        return self.peek().token_type == token_type
+
+    def advance(self) -> Token:
+        """If not EOF we pull the next Token from the stream, returns previous Token
+            Well actually returns Token that was current"""
+        if not self.is_at_end():
+            self._previous = self._current
+            self._current = next(self._tokens)
+        return self._previous
+
+    def is_at_end(self) -> bool:
+        """Checks for EOF"""
+        return self.peek().token_type == TokenType.EOF
+
+    def peek(self) -> Token:
+        """Returns current token without advance"""
+        return self._current
+
+    def previous(self) -> Token:
+        """Returns previous Token"""
+        return self._previous
+
+    def consume(self, token_type: TokenType, message: str) -> Token:
+        """We consume the token which caused panic and then raise ParseException
+            We try to catch it in parse() and synchronize"""
+        if self.check(token_type):
+            return self.advance()
+
+        raise self.error(self.peek(), message)
+
+    @staticmethod
+    def error(token: Token, message: str) -> ParserError:
+        """Tells our framework that we have a problem"""
+        ErrorReporter.error(token, message)
+        return ParserError()
+
+    def synchronize(self) -> None:
+        """Panic unwind mechanism."""
+        self.advance()
+
+        while not self.is_at_end():
+            if self.previous().token_type == TokenType.SEMICOLON:
+                return
+            if self.peek().token_type in statements:
+                return
+
+            self.advance()
+
@@ -0,0 +1,163 @@
+import signal
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+from app.Token import Token
+
+# Stats entry fields: executions, self seconds, cumulative seconds, calls currently on the stack
+COUNT, SELF, CUMULATIVE, ACTIVE = range(4)
+
+
+def node_line(node: Any, cache: Dict[int, Optional[int]]) -> Optional[int]:
+    """Line of the node's own token, or of the first child that has one, None for a tree without tokens"""
+    key = id(node)
+    if key not in cache:
+        cache[key] = None
+        for name in getattr(type(node), '__slots__', ()):
+            value = getattr(node, name)
+            if isinstance(value, Token):
+                cache[key] = value.line
+                break
+        else:
+            for name in getattr(type(node), '__slots__', ()):
+                value = getattr(node, name)
+                if isinstance(value, list):
+                    value = value[0] if value else None
+                child_line = node_line(value, cache) if hasattr(type(value), 'accept') else None
+                if child_line is not None:
+                    cache[key] = child_line
+                    break
+    return cache[key]
+
+
+class NodeProfiler:
+    """Counts executions and self/cumulative time per AST node type and per source line of one Interpreter.
+
+    install() shadows the interpreter's execute and evaluate with timing wrappers on that instance only, the
+    Interpreter class is never touched, so running without --profile pays nothing. Cumulative time counts
+    only the outermost of nested nodes with the same key, a Binary inside a Binary is not counted twice.
+    Nodes without a token of their own (Literal, Grouping, Block...) take the line of their first token,
+    or of the node they run in."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self.by_type: Dict[str, List[Any]] = {}
+        self.by_line: Dict[Optional[int], List[Any]] = {}
+        self._lines: Dict[int, Optional[int]] = {}
+        # Time spent in the children of every call on the stack, the bottom entry collects top level time
+        self._children: List[float] = [0.0]
+        self._line_stack: List[Optional[int]] = [None]
+
+    def install(self, interpreter: Any) -> None:
+        interpreter.execute = self.wrap(interpreter.execute)
+        interpreter.evaluate = self.wrap(interpreter.evaluate)
+
+    @staticmethod
+    def uninstall(interpreter: Any) -> None:
+        vars(interpreter).pop('execute', None)
+        vars(interpreter).pop('evaluate', None)
+
+    def wrap(self, function: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        clock = self.clock
+        children = self._children
+        line_stack = self._line_stack
+        by_type = self.by_type
+        by_line = self.by_line
+
+        def profiled(node: Any) -> Any:
+            line = node_line(node, self._lines)
+            if line is None:
+                line = line_stack[-1]
+            kind = type(node).__name__
+            type_entry = by_type.get(kind) or by_type.setdefault(kind, [0, 0.0, 0.0, 0])
+            line_entry = by_line.get(line) or by_line.setdefault(line, [0, 0.0, 0.0, 0])
+            type_entry[ACTIVE] += 1
+            line_entry[ACTIVE] += 1
+            children.append(0.0)
+            line_stack.append(line)
+            start = clock()
+            try:
+                return function(node)
+            finally:
+                elapsed = clock() - start
+                line_stack.pop()
+                inner = children.pop()
+                children[-1] += elapsed
+                for entry in (type_entry, line_entry):
+                    entry[ACTIVE] -= 1
+                    entry[COUNT] += 1
+                    entry[SELF] += elapsed - inner
+                    if not entry[ACTIVE]:
+                        entry[CUMULATIVE] += elapsed
+        return profiled
+
+    def report(self, file: Optional[TextIO] = None, limit: int = 20) -> None:
+        """Hot spots by self time, every node type and the top limit lines, to stderr unless given a file"""
+        file = file or sys.stderr
+        total = self._children[0] or 1e-12
+        print(f"Profile: {self._children[0] * 1000:.3f} ms in the interpreter", file=file)
+        for title, stats in (("node type", self.by_type), ("line", self.by_line)):
+            print(f"\n{title:<12} {'count':>10} {'self ms':>10} {'self %':>7} {'cum ms':>10}", file=file)
+            rows = sorted(stats.items(), key=lambda item: -item[1][SELF])
+            for key, entry in rows[:limit if title == "line" else None]:
+                name = "-" if key is None else str(key)
+                print(f"{name:<12} {entry[COUNT]:>10} {entry[SELF] * 1000:>10.3f} {entry[SELF] / total * 100:>6.1f}% "
+                      f"{entry[CUMULATIVE] * 1000:>10.3f}", file=file)
+
+
+class SamplingProfiler:
+    """Statistical profiler of the tree-walker. Every interval seconds of CPU time SIGPROF interrupts the program
+    and the handler walks the Python stack, keeping the frames of Interpreter.execute and evaluate: their node
+    arguments, outermost first, are the Lox stack, blocks included. Samples are counted per stack and written in
+    the collapsed format flame graph tools read ("Block :2;Print :6;Binary + :6 12").
+
+    Nothing runs between samples, so the cost is the handler times the sampling rate, too small to measure at
+    the default 1 ms. The kernel's timer tick bounds that rate, an interval below it is effectively the tick.
+    The handler can only be installed from the main thread, and only where setitimer exists."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        from app.Interpreter import Interpreter
+        self.interval = interval
+        self.samples: Dict[Tuple[str, ...], int] = {}
+        # Code object of a frame we keep -> name of its node argument
+        self._arguments = {Interpreter.execute.__code__: 'stmt', Interpreter.evaluate.__code__: 'expr'}
+        self._labels: Dict[int, str] = {}
+        self._lines: Dict[int, Optional[int]] = {}
+        self._previous: Any = None
+
+    def label(self, node: Any) -> str:
+        label = self._labels.get(id(node))
+        if label is None:
+            label = type(node).__name__
+            for name in ('operator', 'name'):
+                token = getattr(node, name, None)
+                if isinstance(token, Token):
+                    label += ' ' + token.lexeme
+            line = node_line(node, self._lines)
+            label = self._labels[id(node)] = f"{label} :{line if line is not None else '-'}"
+        return label
+
+    def sample(self, signum: int, frame: Any) -> None:
+        arguments = self._arguments
+        stack: List[str] = []
+        while frame is not None:
+            argument = arguments.get(frame.f_code)
+            if argument is not None:
+                stack.append(self.label(frame.f_locals[argument]))
+            frame = frame.f_back
+        if stack:
+            key = tuple(reversed(stack))
+            self.samples[key] = self.samples.get(key, 0) + 1
+
+    def start(self) -> None:
+        self._previous = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous)
+
+    def write(self, file: TextIO) -> None:
+        for stack, count in sorted(self.samples.items()):
+            file.write(f"{';'.join(stack)} {count}\n")
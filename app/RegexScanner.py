@@ -0,0 +1,130 @@
+import re
+from typing import Iterator, List
+
+from app.Errors import ErrorReporter
+from app.Scanner import Scanner
+from app.Token import Token, TokenType
+from app.TokenBuffer import TokenBuffer, TokenKind
+from app.lexems import lexems
+
+# One alternative per token class, tried in order. The last one takes any single character: it is either
+# an unexpected character or the start of a non-ASCII identifier/number, which Scanner.scan_token handles.
+token_pattern = re.compile(r"""
+    (?P<space>[ \t\r\n]+)
+  | (?P<comment>//[^\n]*)
+  | (?P<number>[0-9]+(?:\.[0-9]+)?)
+  | (?P<identifier>[A-Za-z_]\w*)
+  | (?P<string>"[^"]*")
+  | (?P<unterminated>"[^"]*)
+  | (?P<operator>[!=<>]=|[(){}\[\],.*;\-+=<>!/])
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+
+class RegexScanner(Scanner):
+    """Scanner fast path: one master regular expression matches a whole token per step instead of one
+    Python call per character. Produces the same tokens, lines and diagnostics as Scanner.scan_tokens()."""
+
+    def scan_tokens(self) -> List[Token]:
+        tokens: List[Token] = list(self.stream())
+        tokens.append(Token(TokenType.EOF, "", "null", self._line))
+        return tokens
+
+    def stream(self) -> Iterator[Token]:
+        source: str = self._source
+        slow_tokens: List[Token] = self._tokens
+        match = token_pattern.match
+        end = len(source)
+        line = self._line
+        position = self._current
+        while position < end:
+            found = match(source, position)
+            kind = found.lastgroup
+            text = found.group()
+            position = found.end()
+            if kind == 'space':
+                line += text.count('\n')
+            elif kind == 'identifier':
+                yield Token(lexems.get(text, TokenType.IDENTIFIER), text, "null", line)
+            elif kind == 'operator':
+                yield Token(lexems[text], text, "null", line)
+            elif kind == 'number':
+                if source[position:position + 2].isascii():
+                    yield Token(TokenType.NUMBER, text, float(text), line)
+                else:
+                    # isdigit() accepts non-ASCII digits that [0-9] does not
+                    position, line = self.scan_slow(found.start(), line)
+                    yield from slow_tokens
+                    slow_tokens.clear()
+            elif kind == 'string':
+                line += text.count('\n')
+                yield Token(TokenType.STRING, text, text[1:-1], line)
+            elif kind == 'comment':
+                pass
+            elif kind == 'unterminated':
+                line += text.count('\n')
+                ErrorReporter.report(line, message="Unterminated string.")
+            elif text.isascii():
+                ErrorReporter.report(line, message="Unexpected character: ", char=text, where='')
+            else:
+                position, line = self.scan_slow(found.start(), line)
+                yield from slow_tokens
+                slow_tokens.clear()
+        self._current = position
+        self._line = line
+
+    def scan_buffer(self) -> TokenBuffer:
+        """Same scan as stream() written straight into a TokenBuffer, no Token objects are created"""
+        buffer = TokenBuffer(self._source)
+        end = len(self._source)
+        self.fill_buffer(buffer, end)
+        buffer.add(TokenKind.EOF, end, end, self._line)
+        return buffer
+
+    def fill_buffer(self, buffer: TokenBuffer, end: int) -> None:
+        """Scans from the current position up to end into buffer, without EOF. No token is allowed past end, so a
+        range ending at a newline scans like it would inside the whole source."""
+        source: str = self._source
+        add = buffer.add
+        match = token_pattern.match
+        identifier = TokenKind[TokenType.IDENTIFIER]
+        kind_of = {text: TokenKind[token_type] for text, token_type in lexems.items()}
+        line = self._line
+        position = self._current
+        while position < end:
+            found = match(source, position, end)
+            kind = found.lastgroup
+            start = position
+            position = found.end()
+            if kind == 'space':
+                line += source.count('\n', start, position)
+            elif kind == 'identifier':
+                add(kind_of.get(found.group(), identifier), start, position, line)
+            elif kind == 'operator':
+                add(kind_of[found.group()], start, position, line)
+            elif kind == 'number' and source[position:position + 2].isascii():
+                add(TokenKind.NUMBER, start, position, line)
+            elif kind == 'string':
+                line += source.count('\n', start, position)
+                add(TokenKind.STRING, start, position, line)
+            elif kind == 'comment':
+                pass
+            elif kind == 'unterminated':
+                line += source.count('\n', start, position)
+                ErrorReporter.report(line, message="Unterminated string.")
+            elif kind == 'other' and found.group().isascii():
+                ErrorReporter.report(line, message="Unexpected character: ", char=found.group(), where='')
+            else:
+                position, line = self.scan_slow(start, line)
+                for token in self._tokens:
+                    add(TokenKind[token.token_type], start, position, token.line)
+                self._tokens.clear()
+        self._current = position
+        self._line = line
+
+    def scan_slow(self, position: int, line: int):
+        """Scans one token with the character-at-a-time Scanner, returns where to resume"""
+        self._start = self._current = position
+        self._line = line
+        self.scan_token()
+        return self._current, self._line
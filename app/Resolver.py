@@ -0,0 +1,117 @@
+from typing import Dict, List, Optional
+
+from app.Errors import ErrorReporter
+
+from app.Expr import ExprVisitor, Binary, Grouping, Literal, Unary, Variable, Assign, ArrayLiteral, Index, Call
+from app.Stmt import StmtVisitor, Stmt, Expression, Print, Var, Block, Function, Return
+from app.Token import Token
+
+
+class Resolver(ExprVisitor, StmtVisitor):
+    """Static pass run between Parser.parse() and Interpreter.interpret().
+
+    Every local gets a slot number in its block, and every Variable/Assign that refers to a local gets
+    the (depth, slot) of its declaration. Anything not found in a block scope is a global and keeps
+    depth None, so it is still looked up by name and undefined globals fail at runtime as before.
+
+    A function's parameters and its top level locals share one scope, the call frame, parameters first. Misplaced
+    returns and repeated parameter names are reported and set had_error, Lox then does not run the program."""
+
+    def __init__(self) -> None:
+        self._scopes: List[Dict[str, int]] = []
+        self._functions = 0
+        self.had_error = False
+
+    def resolve(self, statements: List[Optional[Stmt]]) -> None:
+        for stmt in statements:
+            # Statements that failed to parse come back as None, interpreter deals with them
+            if stmt is not None:
+                stmt.accept(self)
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        self._scopes.append({})
+        self.resolve(stmt.statements)
+        stmt.slot_count = len(self._scopes.pop())
+
+    def visit_variable_stm(self, stmt: Var) -> None:
+        # Initializer first: `var a = a;` reads the outer `a`
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+        if not self._scopes:
+            return
+        scope: Dict[str, int] = self._scopes[-1]
+        # Redeclaring in the same block overwrites the old value, so it reuses the slot
+        stmt.slot = scope.setdefault(stmt.name.lexeme, len(scope))
+
+    def visit_function(self, stmt: Function) -> None:
+        # Declared before the body is resolved so the function can call itself
+        if self._scopes:
+            scope: Dict[str, int] = self._scopes[-1]
+            stmt.slot = scope.setdefault(stmt.name.lexeme, len(scope))
+        frame: Dict[str, int] = {}
+        for param in stmt.params:
+            if param.lexeme in frame:
+                self.error(param, "Already a variable with this name in this scope.")
+            frame.setdefault(param.lexeme, len(frame))
+        self._functions += 1
+        self._scopes.append(frame)
+        self.resolve(stmt.body)
+        stmt.slot_count = len(self._scopes.pop())
+        self._functions -= 1
+
+    def visit_return(self, stmt: Return) -> None:
+        if not self._functions:
+            self.error(stmt.keyword, "Can't return from top-level code.")
+        if stmt.value is not None:
+            stmt.value.accept(self)
+
+    def error(self, token: Token, message: str) -> None:
+        self.had_error = True
+        ErrorReporter.error(token, message)
+
+    def visit_expression(self, stmt: Expression) -> None:
+        stmt.expression.accept(self)
+
+    def visit_print(self, stmt: Print) -> None:
+        stmt.expression.accept(self)
+
+    def visit_binary(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    def visit_grouping(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    def visit_literal(self, expr: Literal) -> None:
+        return None
+
+    def visit_unary(self, expr: Unary) -> None:
+        expr.right.accept(self)
+
+    def visit_variable_expr(self, expr: Variable) -> None:
+        self.resolve_local(expr, expr.name.lexeme)
+
+    def visit_assign(self, expr: Assign) -> None:
+        expr.value.accept(self)
+        self.resolve_local(expr, expr.name.lexeme)
+
+    def visit_array_literal(self, expr: ArrayLiteral) -> None:
+        for element in expr.elements:
+            element.accept(self)
+
+    def visit_index(self, expr: Index) -> None:
+        expr.target.accept(self)
+        expr.index.accept(self)
+
+    def visit_call(self, expr: Call) -> None:
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    def resolve_local(self, expr, name: str) -> None:
+        """Walks scopes from the innermost one, leaves globals unresolved"""
+        for depth, scope in enumerate(reversed(self._scopes)):
+            if name in scope:
+                expr.depth = depth
+                expr.slot = scope[name]
+                return
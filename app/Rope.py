@@ -0,0 +1,61 @@
+from typing import Any, List, Union
+
+# Concatenations shorter than this stay plain str, copying a short string is cheaper than a Rope
+min_length = 1024
+
+
+class Rope:
+    """A Lox string built by +, kept as the list of its pieces and joined only when something reads the text
+    (stringify, ==, a hash). Appending copies nothing, so building a string of n pieces is linear instead of
+    quadratic.
+
+    Ropes share their list: a rope is the first count chunks of it. Appending to the rope that ends the list
+    extends the list in place, appending to an older rope, whose count is now short of the list's end, copies its
+    own chunks first. `s = s + piece` therefore never copies, and `t = s + a; u = s + b;` still gives two
+    independent strings."""
+    __slots__ = ('chunks', 'count', 'length', '_text')
+
+    def __init__(self, chunks: List[str], count: int, length: int) -> None:
+        self.chunks = chunks
+        self.count = count
+        self.length = length
+        self._text = None
+
+    def concat(self, piece: Union[str, 'Rope']) -> 'Rope':
+        chunks = self.chunks
+        if self.count != len(chunks):
+            chunks = chunks[:self.count]
+        if type(piece) is Rope:
+            chunks.extend(piece.chunks[:piece.count])
+        else:
+            chunks.append(piece)
+        return Rope(chunks, len(chunks), self.length + len(piece))
+
+    def __str__(self) -> str:
+        if self._text is None:
+            chunks = self.chunks
+            self._text = ''.join(chunks if self.count == len(chunks) else chunks[:self.count])
+        return self._text
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is Rope or type(other) is str:
+            return len(other) == self.length and str(other) == str(self)
+        return False
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+
+def concatenate(left: Union[str, Rope], right: Union[str, Rope]) -> Union[str, Rope]:
+    """left + right for two Lox strings, a Rope once the result is long enough to be worth it"""
+    if type(left) is Rope:
+        return left.concat(right)
+    if type(right) is str and len(left) + len(right) < min_length:
+        return left + right
+    return Rope([left], 1, len(left)).concat(right)
@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
-from app.Lox import Lox
+from app.Errors import ErrorReporter
 from app.Token import Token, TokenType
 from app.lexems import lexems
 
@@ -22,6 +22,21 @@ class Scanner:
         self._tokens.append(Token(TokenType.EOF, "", "null", self._line))
         return self._tokens
 
+    def iter_tokens(self) -> Iterator[Token]:
+        """Same tokens as scan_tokens() but produced on demand, the full list never exists"""
+        yield from self.stream()
+        yield Token(TokenType.EOF, "", "null", self._line)
+
+    def stream(self) -> Iterator[Token]:
+        """Yields tokens as they are scanned, without the closing EOF"""
+        tokens: List[Token] = self._tokens
+        while not self.is_at_end():
+            self._start = self._current
+            self.scan_token()
+            if tokens:
+                yield from tokens
+                tokens.clear()
+
     def is_at_end(self) -> bool:
         return self._current >= len(self._source)
 
@@ -59,7 +74,7 @@ class Scanner:
             self.handle_identifier()
             return
         else:
-            Lox.report(self._line, message="Unexpected character: ", char=c, where='')
+            ErrorReporter.report(self._line, message="Unexpected character: ", char=c, where='')
 
     def advance(self) -> str:
         """Returns current symbol in sequence and increments index"""
@@ -102,7 +117,7 @@ class Scanner:
                 self._line += 1
             self.advance()
         if self.is_at_end():
-            Lox.report(self._line, message="Unterminated string.")
+            ErrorReporter.report(self._line, message="Unterminated string.")
             return
         self.advance()  # Closing "
         value = self._source[self._start + 1:self._current - 1]  # Trim the ""
@@ -0,0 +1,97 @@
+import gc
+import io
+import os
+import socketserver
+import sys
+import traceback
+from typing import List, Optional
+
+from app.Client import EXIT, STDERR, STDOUT, decode_request, encode_frame, socket_path
+
+
+class Channel(io.RawIOBase):
+    """Writable stream that sends everything written to it to the client as frames of one kind"""
+
+    def __init__(self, connection, kind: bytes) -> None:
+        super().__init__()
+        self.connection = connection
+        self.kind = kind
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        send(self.connection, self.kind, bytes(data))
+        return len(data)
+
+
+def send(connection, kind: bytes, payload: bytes) -> None:
+    connection.sendall(encode_frame(kind, payload))
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Runs in a child forked for this request, so nothing a script does outlives it"""
+
+    def handle(self) -> None:
+        from app.Lox import Lox
+        cwd, args = decode_request(self.rfile.read(int.from_bytes(self.rfile.read(4), 'big')))
+        stdout = io.BufferedWriter(Channel(self.connection, STDOUT))
+        stderr = io.BufferedWriter(Channel(self.connection, STDERR))
+        sys.stdout = io.TextIOWrapper(stdout, encoding='utf-8', errors='surrogateescape')
+        sys.stderr = io.TextIOWrapper(stderr, encoding='utf-8', errors='surrogateescape', line_buffering=True)
+        code = 0
+        try:
+            os.chdir(cwd)
+            Lox.main(args)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+        send(self.connection, EXIT, str(code).encode())
+
+
+class LoxServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Keeps a process with everything imported and forks it per request. The child starts with warm
+    modules and a fresh Lox.interpreter, exactly like a new CLI invocation minus the startup."""
+
+    def __init__(self, path: str) -> None:
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(path, RequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+
+def warm_up() -> None:
+    import app.ASTPrinter, app.ExprParser, app.Lox, app.Optimizer, app.Parser, app.ParseCache, app.RegexScanner
+    import app.Resolver, app.TokenStream, app.Compiler, app.VM, app.ClosureCompiler, app.Transpiler
+    # Everything allocated so far lives until the server stops, moving it out of the collector's reach keeps
+    # forked children from touching (and so copying) those pages
+    gc.collect()
+    gc.freeze()
+
+
+def main(args: List[str]) -> None:
+    path: Optional[str] = None
+    for arg in args[1:]:
+        if arg.startswith('--socket='):
+            path = arg.partition('=')[2]
+    warm_up()
+    with LoxServer(path or socket_path()) as server:
+        print(f"Listening on {server.server_address}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main(sys.argv)
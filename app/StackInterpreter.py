@@ -0,0 +1,246 @@
+from typing import Any, Callable, List, Tuple
+
+from app import Operators
+from app.Dispatch import DispatchTable
+from app.Environment import LocalEnvironment
+from app.Errors import ErrorReporter, RuntimeException
+from app.Expr import ArrayLiteral, Assign, Binary, Call, Grouping, Index, Literal, Unary, Variable
+from app.Interpreter import Interpreter
+from app.LoxFunction import LoxCallable, LoxFunction
+from app.Output import Output
+from app.Stmt import Block, Expression, Function, Print, Return, Var
+
+# Node class -> method that starts it
+enter_methods = {
+    Literal: 'enter_literal',
+    Grouping: 'enter_grouping',
+    Unary: 'enter_unary',
+    Binary: 'enter_binary',
+    Variable: 'enter_variable',
+    Assign: 'enter_assign',
+    ArrayLiteral: 'enter_array_literal',
+    Index: 'enter_index',
+    Call: 'enter_call',
+    Expression: 'enter_expression',
+    Print: 'enter_print',
+    Var: 'enter_var',
+    Block: 'enter_block',
+    Function: 'enter_function',
+    Return: 'enter_return',
+}
+
+# What is left to do: a method and its argument, a node or the environment to restore
+Work = Tuple[Callable[[Any], None], Any]
+
+
+class StackInterpreter(Interpreter):
+    """`run --engine=stack`: the tree-walker without Python recursion. Work items (a method and a node) wait on
+    one list and operand values on another, so entering a node pushes its continuation and then its children, and
+    no Python frame is kept per nesting level. Depth is bounded by memory, not sys.getrecursionlimit(), and the
+    same Operators, environments and frames as Interpreter give the same results and errors.
+
+    A block or call pushes an item restoring the environment it replaced. `return` pops work up to its call's
+    item, and a runtime error drops the whole stack and restores the top level scope, as the try/finally blocks
+    of execute_block and execute_function leave it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._enter = DispatchTable(self, enter_methods)
+        self._work: List[Work] = []
+        self._values: List[Any] = []
+        # Bound once, return finds its call by identity
+        self._finish_call = self.finish_call
+
+    def interpret(self, statements: List[Any]) -> None:
+        top_level = self.environment
+        try:
+            try:
+                self.push_statements(statements)
+                self.run()
+            finally:
+                self._work.clear()
+                self._values.clear()
+                self.environment = top_level
+                self._depth = 0
+        except RuntimeException as e:
+            ErrorReporter.runtime_error(e)
+        finally:
+            Output.sink.flush()
+
+    def execute(self, stmt) -> None:
+        self._work.append((self._enter[type(stmt)], stmt))
+        self.run()
+
+    def evaluate(self, expr) -> Any:
+        self._work.append((self._enter[type(expr)], expr))
+        self.run()
+        return self._values.pop()
+
+    def run(self) -> None:
+        work = self._work
+        pop = work.pop
+        while work:
+            action, argument = pop()
+            action(argument)
+
+    def push(self, node: Any) -> None:
+        self._work.append((self._enter[type(node)], node))
+
+    def push_statements(self, statements: List[Any]) -> None:
+        enter = self._enter
+        self._work.extend([(enter[type(stmt)], stmt) for stmt in reversed(statements)])
+
+    def enter_literal(self, expr: Literal) -> None:
+        self._values.append(expr.value)
+
+    def enter_grouping(self, expr: Grouping) -> None:
+        self.push(expr.expression)
+
+    def enter_unary(self, expr: Unary) -> None:
+        self._work.append((self.apply_unary, expr))
+        self.push(expr.right)
+
+    def apply_unary(self, expr: Unary) -> None:
+        values = self._values
+        values[-1] = expr.op(expr, values[-1])
+
+    def enter_binary(self, expr: Binary) -> None:
+        self._work.append((self.apply_binary, expr))
+        self.push(expr.right)
+        self.push(expr.left)
+
+    def apply_binary(self, expr: Binary) -> None:
+        values = self._values
+        right = values.pop()
+        values[-1] = expr.op(expr, values[-1], right)
+
+    def enter_variable(self, expr: Variable) -> None:
+        self._values.append(self.visit_variable_expr(expr))
+
+    def enter_assign(self, expr: Assign) -> None:
+        self._work.append((self.apply_assign, expr))
+        self.push(expr.value)
+
+    def apply_assign(self, expr: Assign) -> None:
+        value = self._values[-1]
+        if expr.depth is None:
+            self.globals.assign(expr.name, value)
+        else:
+            self.environment.assign_at(expr.depth, expr.slot, value)
+
+    def enter_array_literal(self, expr: ArrayLiteral) -> None:
+        self._work.append((self.apply_array_literal, expr))
+        self.push_all(expr.elements)
+
+    def apply_array_literal(self, expr: ArrayLiteral) -> None:
+        self._values.append(Operators.array(expr, self.pop_values(len(expr.elements))))
+
+    def enter_index(self, expr: Index) -> None:
+        self._work.append((self.apply_index, expr))
+        self.push(expr.index)
+        self.push(expr.target)
+
+    def apply_index(self, expr: Index) -> None:
+        values = self._values
+        position = values.pop()
+        values[-1] = Operators.index(expr, values[-1], position)
+
+    def enter_call(self, expr: Call) -> None:
+        self._work.append((self.apply_call, expr))
+        self.push_all(expr.arguments)
+        self.push(expr.callee)
+
+    def apply_call(self, expr: Call) -> None:
+        arguments = self.pop_values(len(expr.arguments))
+        callee = self._values.pop()
+        if type(callee) is LoxFunction:
+            declaration = callee.declaration
+            arity = len(declaration.params)
+        elif isinstance(callee, LoxCallable):
+            declaration = None
+            arity = callee.arity()
+        else:
+            raise RuntimeException(expr.paren, "Can only call functions and classes.")
+        if len(arguments) != arity:
+            raise RuntimeException(expr.paren, f"Expected {arity} arguments but got {len(arguments)}.")
+        if self._depth >= self.max_depth:
+            raise RuntimeException(expr.paren, "Stack overflow.")
+        if declaration is None:
+            self._values.append(callee.call(self, arguments))
+            return
+        self._depth += 1
+        self._work.append((self._finish_call, self.environment))
+        self.environment = LocalEnvironment.frame(arguments, declaration.slot_count, callee.closure)
+        self.push_statements(declaration.body)
+
+    def finish_call(self, previous: Any, value: Any = None) -> None:
+        """The end of a call's body, or where its return statement unwinds to"""
+        self.environment = previous
+        self._depth -= 1
+        self._values.append(value)
+
+    def enter_expression(self, stmt: Expression) -> None:
+        self._work.append((self.discard_value, stmt))
+        self.push(stmt.expression)
+
+    def discard_value(self, stmt: Expression) -> None:
+        self._values.pop()
+
+    def enter_print(self, stmt: Print) -> None:
+        self._work.append((self.apply_print, stmt))
+        self.push(stmt.expression)
+
+    def apply_print(self, stmt: Print) -> None:
+        Output.sink.write(self.stringify(self._values.pop()) + "\n")
+
+    def enter_var(self, stmt: Var) -> None:
+        self._work.append((self.apply_var, stmt))
+        if stmt.initializer is not None:
+            self.push(stmt.initializer)
+
+    def apply_var(self, stmt: Var) -> None:
+        value = self._values.pop() if stmt.initializer is not None else None
+        if stmt.slot is None:
+            self.globals.define(stmt.name.lexeme, value)
+        else:
+            self.environment.slots[stmt.slot] = value
+
+    def enter_block(self, stmt: Block) -> None:
+        self._work.append((self.restore_environment, self.environment))
+        self.environment = LocalEnvironment(stmt.slot_count, enclosing=self.environment)
+        self.push_statements(stmt.statements)
+
+    def restore_environment(self, previous: Any) -> None:
+        self.environment = previous
+
+    def enter_function(self, stmt: Function) -> None:
+        self.visit_function(stmt)
+
+    def enter_return(self, stmt: Return) -> None:
+        self._work.append((self.apply_return, stmt))
+        if stmt.value is not None:
+            self.push(stmt.value)
+
+    def apply_return(self, stmt: Return) -> None:
+        value = self._values.pop() if stmt.value is not None else None
+        work = self._work
+        finish_call = self._finish_call
+        # Blocks left on the way restore nothing, the call's item puts back the caller's environment
+        while True:
+            action, previous = work.pop()
+            if action is finish_call:
+                finish_call(previous, value)
+                return
+
+    def push_all(self, nodes: List[Any]) -> None:
+        """Pushes nodes so that they run in order, their values end up on the value stack in order"""
+        enter = self._enter
+        self._work.extend([(enter[type(node)], node) for node in reversed(nodes)])
+
+    def pop_values(self, count: int) -> List[Any]:
+        if not count:
+            return []
+        values = self._values
+        popped = values[-count:]
+        del values[-count:]
+        return popped
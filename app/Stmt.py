@@ -1,56 +1,131 @@
-from typing import Any, List
+# Generated by tools/tools.py from tools/ast_spec.py, do not edit by hand.
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
 
 from app.Expr import Expr
 from app.Token import Token
 
 
 class Stmt:
-    def accept(self, visitor: 'StmtVisitor') -> Any:
+    __slots__ = ()
+
+    def accept(self, visitor: StmtVisitor) -> Any:
         raise NotImplementedError()
 
 
 class StmtVisitor:
-    def visit_expression(self, stmt: 'Expression') -> Any:
-        pass
+    def visit_expression(self, stmt: Expression) -> Any:
+        raise NotImplementedError()
+
+    def visit_print(self, stmt: Print) -> Any:
+        raise NotImplementedError()
+
+    def visit_variable_stm(self, stmt: Var) -> Any:
+        raise NotImplementedError()
 
-    def visit_print(self, stmt: 'Print') -> Any:
-        pass
+    def visit_block_stmt(self, stmt: Block) -> Any:
+        raise NotImplementedError()
 
-    def visit_variable_stm(self, stmt: 'Var') -> Any:
-        pass
+    def visit_function(self, stmt: Function) -> Any:
+        raise NotImplementedError()
 
-    def visit_block_stmt(self, stmt: 'Block'):
-        pass
+    def visit_return(self, stmt: Return) -> Any:
+        raise NotImplementedError()
 
 
 class Expression(Stmt):
-    def __init__(self, expression: 'Expr') -> None:
+    __slots__ = ('expression',)
+
+    def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
-    def accept(self, visitor: 'StmtVisitor') -> Any:
+    def accept(self, visitor: StmtVisitor) -> Any:
         return visitor.visit_expression(self)
 
+    def __repr__(self) -> str:
+        return f"Expression(expression={self.expression!r})"
+
 
 class Print(Stmt):
-    def __init__(self, expression: 'Expr') -> None:
+    __slots__ = ('expression',)
+
+    def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
-    def accept(self, visitor: 'StmtVisitor') -> Any:
+    def accept(self, visitor: StmtVisitor) -> Any:
         return visitor.visit_print(self)
 
+    def __repr__(self) -> str:
+        return f"Print(expression={self.expression!r})"
+
 
 class Var(Stmt):
-    def __init__(self, name: Token, initializer: 'Expr') -> None:
+    __slots__ = ('name', 'initializer', 'slot')
+
+    def __init__(self, name: Token, initializer: Expr) -> None:
         self.name = name
         self.initializer = initializer
+        self.slot: Optional[int] = None
 
-    def accept(self, visitor: 'StmtVisitor') -> Any:
+    def accept(self, visitor: StmtVisitor) -> Any:
         return visitor.visit_variable_stm(self)
 
+    def __repr__(self) -> str:
+        return f"Var(name={self.name!r}, initializer={self.initializer!r})"
+
 
 class Block(Stmt):
-    def __init__(self, statements: List['Stmt']):
+    __slots__ = ('statements', 'slot_count')
+
+    def __init__(self, statements: List[Stmt]) -> None:
         self.statements = statements
+        self.slot_count: int = 0
 
-    def accept(self, visitor: 'StmtVisitor') -> Any:
+    def accept(self, visitor: StmtVisitor) -> Any:
         return visitor.visit_block_stmt(self)
+
+    def __repr__(self) -> str:
+        return f"Block(statements={self.statements!r})"
+
+
+class Function(Stmt):
+    __slots__ = ('name', 'params', 'body', 'slot', 'slot_count')
+
+    def __init__(self, name: Token, params: List[Token], body: List[Stmt]) -> None:
+        self.name = name
+        self.params = params
+        self.body = body
+        self.slot: Optional[int] = None
+        self.slot_count: int = 0
+
+    def accept(self, visitor: StmtVisitor) -> Any:
+        return visitor.visit_function(self)
+
+    def __repr__(self) -> str:
+        return f"Function(name={self.name!r}, params={self.params!r}, body={self.body!r})"
+
+
+class Return(Stmt):
+    __slots__ = ('keyword', 'value')
+
+    def __init__(self, keyword: Token, value: Optional[Expr]) -> None:
+        self.keyword = keyword
+        self.value = value
+
+    def accept(self, visitor: StmtVisitor) -> Any:
+        return visitor.visit_return(self)
+
+    def __repr__(self) -> str:
+        return f"Return(keyword={self.keyword!r}, value={self.value!r})"
+
+
+# Node class -> visitor method name, for visitors that dispatch on type(node) instead of accept()
+stmt_dispatch: Dict[type, str] = {
+    Expression: 'visit_expression',
+    Print: 'visit_print',
+    Var: 'visit_variable_stm',
+    Block: 'visit_block_stmt',
+    Function: 'visit_function',
+    Return: 'visit_return',
+}
@@ -3,6 +3,8 @@ class TokenType:
     RIGHT_PAREN = "RIGHT_PAREN"
     LEFT_BRACE = "LEFT_BRACE"
     RIGHT_BRACE = "RIGHT_BRACE"
+    LEFT_BRACKET = "LEFT_BRACKET"
+    RIGHT_BRACKET = "RIGHT_BRACKET"
     COMMA = "COMMA"
     DOT = "DOT"
     STAR = "STAR"
@@ -41,6 +43,8 @@ class TokenType:
 
 
 class Token:
+    __slots__ = ('token_type', 'lexeme', 'literal', 'line')
+
     def __init__(self, token_type: TokenType, lexeme: str, literal: object, line: int) -> None:
         self.token_type = token_type
         self.lexeme = lexeme
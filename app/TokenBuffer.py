@@ -0,0 +1,55 @@
+from array import array
+from enum import IntEnum
+from typing import Iterator, List
+
+from app.Token import Token, TokenType
+
+# TokenType constants are strings, the buffer stores their index instead
+token_types: List[str] = [value for name, value in vars(TokenType).items() if not name.startswith('_')]
+TokenKind = IntEnum('TokenKind', {token_type: index for index, token_type in enumerate(token_types)})
+
+
+class TokenBuffer:
+    """Struct-of-arrays token storage: one byte of kind and three integers per token, with the lexeme
+    kept as a (start, end) range into the source. Literals are not stored at all, a NUMBER or STRING
+    literal is recomputed from its lexeme exactly like the scanner computes it. Token objects are
+    built only when somebody asks for one."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        offset = 'I' if len(source) < 2 ** 32 else 'Q'
+        self.kinds: array = array('B')
+        self.starts: array = array(offset)
+        self.ends: array = array(offset)
+        self.lines: array = array('I')
+
+    def add(self, kind: int, start: int, end: int, line: int) -> None:
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        return self.token(index)
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.kinds)):
+            yield self.token(index)
+
+    def token(self, index: int) -> Token:
+        token_type = token_types[self.kinds[index]]
+        lexeme = self.source[self.starts[index]:self.ends[index]]
+        if token_type == TokenType.NUMBER:
+            literal = float(lexeme)
+        elif token_type == TokenType.STRING:
+            literal = lexeme[1:-1]
+        else:
+            literal = "null"
+        return Token(token_type, lexeme, literal, self.lines[index])
+
+    def nbytes(self) -> int:
+        """Memory held by the arrays, the source is not counted"""
+        return sum(column.itemsize * len(column) for column in (self.kinds, self.starts, self.ends, self.lines))
@@ -0,0 +1,108 @@
+import re
+import tempfile
+from typing import IO, Iterator, List, Optional, TextIO, Type
+
+from app.Scanner import Scanner
+from app.Token import Token, TokenType
+
+# Strings and comments are the only tokens that can contain '"' or '//', matching them left to right
+# tracks exactly what the scanner will see as string or comment
+string_or_comment = re.compile(r'//[^\n]*|"[^"]*"?')
+
+
+def open_string_start(text: str, start: int = 0, end: Optional[int] = None) -> Optional[int]:
+    """Index of the '"' opening a string that is still unterminated at the end of text[start:end], if any. start
+    has to be outside any string or comment, the beginning of a line or just past a closing quote."""
+    end = len(text) if end is None else end
+    if text.find('"', start, end) < 0:
+        return None
+    last = None
+    for last in string_or_comment.finditer(text, start, end):
+        pass
+    if last is not None and last.group()[0] == '"' and (len(last.group()) == 1 or last.group()[-1] != '"'):
+        return last.start()
+    return None
+
+
+class OpenString:
+    """Text of a string left open at the end of a chunk, from its opening quote. Past spill_size characters it moves
+    to a temporary file, so a quote that is never closed takes constant memory however much of the file follows it.
+    Only a string that does close is read back, its token needs the whole text anyway."""
+
+    def __init__(self, text: str, spill_size: int) -> None:
+        self._pieces: List[str] = [text]
+        self._size = len(text)
+        self._spill_size = spill_size
+        self._file: Optional[IO[str]] = None
+        self.newlines = text.count('\n')
+
+    def append(self, text: str) -> None:
+        self.newlines += text.count('\n')
+        if self._file is None and self._size + len(text) > self._spill_size:
+            self._file = tempfile.TemporaryFile('w+', encoding='utf-8', errors='surrogatepass', newline='')
+            self._file.writelines(self._pieces)
+            self._pieces = []
+        if self._file is not None:
+            self._file.write(text)
+        else:
+            self._pieces.append(text)
+            self._size += len(text)
+
+    def text(self) -> str:
+        if self._file is None:
+            return "".join(self._pieces)
+        self._file.seek(0)
+        text = self._file.read()
+        self.close()
+        return text
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def stream_tokens(file: TextIO, scanner_class: Type[Scanner] = Scanner, chunk_size: int = 1 << 20) -> Iterator[Token]:
+    """Tokens of a file in constant memory: reads about chunk_size characters of whole lines at a time.
+
+    No token spans a newline except a string, so a chunk of whole lines scans the same as it would inside
+    the full source. A chunk that ends inside a string is cut before its opening quote, which never
+    continues the token before it, and the rest is held as an OpenString. Following chunks are only searched
+    for the closing quote, then scanning resumes just past it: every chunk is looked at once, not again with
+    each chunk added to the string."""
+    line = 1
+    held: Optional[OpenString] = None
+    try:
+        while True:
+            lines = file.readlines(chunk_size)
+            text = "".join(lines)
+            resume = 0
+            if held is not None:
+                close = text.find('"')
+                if close >= 0:
+                    opened = held.text()
+                    text, resume = opened + text, len(opened) + close + 1
+                elif lines:
+                    held.append(text)
+                    continue
+                else:
+                    # The file ends inside the string. A lone quote on the string's last line reports the same
+                    # "Unterminated string." as its whole text would.
+                    text, line = '"', line + held.newlines
+                    held.close()
+                held = None
+            if lines:
+                cut = open_string_start(text, resume)
+                if cut is not None:
+                    held = OpenString(text[cut:], chunk_size)
+                    text = text[:cut]
+            scanner = scanner_class(text)
+            scanner._line = line
+            yield from scanner.stream()
+            line = scanner._line
+            if not lines:
+                break
+        yield Token(TokenType.EOF, "", "null", line)
+    finally:
+        if held is not None:
+            held.close()
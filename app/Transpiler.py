@@ -0,0 +1,174 @@
+import math
+from typing import Any, Callable, Dict, List, Optional
+
+from app.Errors import ErrorReporter, RuntimeException
+from app.Expr import ExprVisitor, Binary, Grouping, Literal, Unary, Variable, Assign
+from app.Interpreter import Interpreter
+from app.Output import Output
+from app.Stmt import StmtVisitor, Stmt, Expression, Print, Var, Block
+from app.Token import Token, TokenType
+
+comparisons = {
+    TokenType.MINUS: "-",
+    TokenType.STAR: "*",
+    TokenType.SLASH: "/",
+    TokenType.GREATER: ">",
+    TokenType.GREATER_EQUAL: ">=",
+    TokenType.LESS: "<",
+    TokenType.LESS_EQUAL: "<=",
+}
+
+
+def runtime_error(line: int, message: str) -> None:
+    """Generated code knows lines, not tokens, ErrorReporter.runtime_error only needs the line"""
+    raise RuntimeException(Token(TokenType.EOF, "", None, line), message)
+
+
+def set_global(values: Dict[str, Any], name: str, value: Any, line: int) -> Any:
+    if name not in values:
+        runtime_error(line, f"Undefined variable '{name}'.")
+    values[name] = value
+    return value
+
+
+class Transpiler(ExprVisitor, StmtVisitor):
+    """Turns a resolved Stmt list into Python source for one function, so arithmetic, comparisons and
+    local variables run in CPython's own eval loop.
+
+    Lox semantics are spelled out inline: operands are type-checked with `type(x) is float` before the
+    Python operator runs, and a failed check calls back into the runtime for the Interpreter's error
+    message. Block locals become uniquely named Python locals, globals live in the `_G` dict."""
+
+    def __init__(self) -> None:
+        self._lines: List[str] = []
+        self._blocks: List[List[str]] = []
+        self._temps = 0
+        # Set at a parse error, the tree-walker stops the whole program there
+        self._stopped = False
+
+    def transpile(self, statements: List[Optional[Stmt]]) -> str:
+        self._lines = ["def _lox_main(_G):"]
+        self.transpile_all(statements)
+        self._lines.append("    return None")
+        return '\n'.join(self._lines) + '\n'
+
+    def transpile_all(self, statements: List[Optional[Stmt]]) -> None:
+        """Emits the statements up to a parse error's None. Once one is seen, no statement after it is emitted,
+        in its own block or any enclosing one."""
+        for stmt in statements:
+            if stmt is None:
+                self._stopped = True
+            if self._stopped:
+                return
+            stmt.accept(self)
+
+    @staticmethod
+    def namespace() -> Dict[str, Callable]:
+        """Helpers the generated source calls on its slow paths"""
+        return {
+            "_stringify": Interpreter.stringify,
+            "_write": Output.sink.write,
+            "_error": runtime_error,
+            "_set_global": set_global,
+        }
+
+    def run(self, statements: List[Optional[Stmt]]) -> None:
+        source = self.transpile(statements)
+        try:
+            code = compile(source, "<lox>", "exec")
+        except (SyntaxError, RecursionError, MemoryError):
+            # Nesting deeper than CPython's parser accepts, the tree-walker has no such limit
+            Interpreter().interpret(statements)
+            return
+        namespace = self.namespace()
+        exec(code, namespace)
+        try:
+            namespace["_lox_main"]({})
+        except RuntimeException as e:
+            ErrorReporter.runtime_error(e)
+        finally:
+            Output.sink.flush()
+
+    def temp(self) -> str:
+        self._temps += 1
+        return f"_t{self._temps}"
+
+    def emit(self, line: str) -> None:
+        self._lines.append("    " + line)
+
+    def local_name(self, depth: int, slot: int) -> str:
+        return self._blocks[-1 - depth][slot]
+
+    def visit_expression(self, stmt: Expression) -> None:
+        self.emit(stmt.expression.accept(self))
+
+    def visit_print(self, stmt: Print) -> None:
+        self.emit(f"_write(_stringify({stmt.expression.accept(self)}) + '\\n')")
+
+    def visit_variable_stm(self, stmt: Var) -> None:
+        value = stmt.initializer.accept(self) if stmt.initializer is not None else "None"
+        if stmt.slot is None:
+            self.emit(f"_G[{stmt.name.lexeme!r}] = {value}")
+            return
+        names = self._blocks[-1]
+        if stmt.slot == len(names):
+            lexeme = stmt.name.lexeme
+            suffix = f"_{lexeme}" if lexeme.isascii() and lexeme.isidentifier() else ""
+            self._temps += 1
+            names.append(f"l{self._temps}{suffix}")
+        self.emit(f"{names[stmt.slot]} = {value}")
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        self._blocks.append([])
+        self.transpile_all(stmt.statements)
+        self._blocks.pop()
+
+    def visit_literal(self, expr: Literal) -> str:
+        if isinstance(expr.value, float) and not math.isfinite(expr.value):
+            # A literal with hundreds of digits scans as inf, which has no Python literal
+            return f"float({str(expr.value)!r})"
+        return repr(expr.value)
+
+    def visit_grouping(self, expr: Grouping) -> str:
+        return f"({expr.expression.accept(self)})"
+
+    def visit_unary(self, expr: Unary) -> str:
+        right = expr.right.accept(self)
+        value = self.temp()
+        if expr.operator.token_type == TokenType.BANG:
+            return f"(({value} := {right}) is None or {value} is False)"
+        return (f"(-{value} if type({value} := {right}) is float "
+                f"else _error({expr.operator.line}, 'Operand must be a number.'))")
+
+    def visit_binary(self, expr: Binary) -> str:
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        token_type = expr.operator.token_type
+        line = expr.operator.line
+        if token_type == TokenType.EQUAL_EQUAL:
+            # is_equal is plain == for nil, booleans, numbers and strings
+            return f"({left} == {right})"
+        if token_type == TokenType.BANG_EQUAL:
+            return f"({left} != {right})"
+        a = self.temp()
+        b = self.temp()
+        if token_type == TokenType.PLUS:
+            kind = self.temp()
+            return (f"({a} + {b} if ({kind} := type({a} := {left})) is type({b} := {right}) "
+                    f"and ({kind} is float or {kind} is str) "
+                    f"else _error({line}, 'Operands must be two numbers or two strings.'))")
+        # & rather than `and`: both operands are evaluated before the check, like the Interpreter does
+        return (f"({a} {comparisons[token_type]} {b} if (type({a} := {left}) is float) & "
+                f"(type({b} := {right}) is float) else _error({line}, 'Operands must be a numbers.'))")
+
+    def visit_variable_expr(self, expr: Variable) -> str:
+        if expr.depth is None:
+            name = expr.name.lexeme
+            return f"(_G[{name!r}] if {name!r} in _G else _error({expr.name.line}, {f'Undefined variable {name!r}.'!r}))"
+        return self.local_name(expr.depth, expr.slot)
+
+    def visit_assign(self, expr: Assign) -> str:
+        value = expr.value.accept(self)
+        if expr.depth is None:
+            return f"_set_global(_G, {expr.name.lexeme!r}, {value}, {expr.name.line})"
+        return f"({self.local_name(expr.depth, expr.slot)} := {value})"
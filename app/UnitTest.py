@@ -2,11 +2,14 @@ import io
 import unittest
 from unittest.mock import patch
 
-from app.Expr import Binary, Literal, Unary
+from app.Errors import ErrorReporter
+from app.Expr import Binary, Literal, Unary, Variable
 from app.Interpreter import Interpreter
 from app.Lox import Lox
 from app.Parser import Parser
+from app.Resolver import Resolver
 from app.Scanner import Scanner
+from app.Stmt import Block, Print, Var
 from app.Token import TokenType, Token
 from app.ASTPrinter import AstPrinter
 
@@ -60,6 +63,79 @@ class TestInterpreter(unittest.TestCase):
         result = self.evaluate_expression(expr)
         self.assertEqual(result, "Hello, World!")
 
+    def test_long_concatenation_builds_rope(self):
+        from app.Rope import Rope
+        source = 'var s = "";\nvar p = "0123456789";\n' + "s = s + p;\n" * 200 + \
+                 'var t = s + "X";\nvar u = s + "Y";\nprint t == u;\nprint t == s + "X";\nprint u;\nprint s + nil;'
+        out, err, code = run_program(source)
+        self.assertEqual(out, f"false\ntrue\n{'0123456789' * 200}Y\n")
+        self.assertEqual((err, code), ("Operands must be two numbers or two strings.\n[line 208]\n", 70))
+        self.assertIs(type(Lox.interpreter.globals.get(Token(TokenType.IDENTIFIER, "s", None, 1))), Rope)
+
+    def test_rope_shares_chunks(self):
+        from app.Rope import Rope, concatenate
+        base = concatenate("a" * 1024, "b")
+        t, u = concatenate(base, "c"), concatenate(base, "d")
+        self.assertIs(type(base), Rope)
+        self.assertIs(t.chunks, base.chunks)
+        self.assertIsNot(u.chunks, base.chunks)
+        self.assertEqual((str(base)[-1], str(t)[-2:], str(u)[-2:]), ("b", "bc", "bd"))
+        self.assertEqual(concatenate(t, t), str(t) * 2)
+        self.assertEqual(concatenate("x", "y"), "xy")
+        self.assertNotEqual(t, 1.0)
+
+    def test_operator_resolved_on_first_evaluation(self):
+        from app import LazyOperators
+        from app.Operators import negate, subtract
+        difference = Binary(Literal(3.0), Token(TokenType.MINUS, "-", None, 1), Literal(2.0))
+        negation = Unary(Token(TokenType.MINUS, "-", None, 1), Literal(2.0))
+        self.assertEqual((difference.op, negation.op), (LazyOperators.binary, LazyOperators.unary))
+        self.assertEqual((self.evaluate_expression(difference), self.evaluate_expression(negation)), (1.0, -2.0))
+        self.assertEqual((difference.op, negation.op), (subtract, negate))
+
+    def test_parse_does_not_load_the_runtime(self):
+        import subprocess
+        import sys
+        code = ("import sys\nfrom app.Lox import Lox\nLox.run('-1 + 2 * [3][0]', 'parse')\n"
+                "print(sorted(name for name in ('app.Operators', 'app.Array', 'app.Rope', 'app.Interpreter')"
+                " if name in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.splitlines(), ["(+ (- 1.0) (* 2.0 (index (array 3.0) 0.0)))", "[]"])
+
+    def test_plus_quickens_and_deoptimizes(self):
+        from app.Errors import RuntimeException
+        from app import LazyOperators
+        from app.Operators import add_floats, add_generic, concat, counters
+        counters.clear()
+        left, right = Literal(1.0), Literal(2.0)
+        expr = Binary(left, Token(TokenType.PLUS, "+", None, 1), right)
+        self.assertIs(expr.op, LazyOperators.binary)
+        self.assertEqual(self.evaluate_expression(expr), 3.0)
+        self.assertIs(expr.op, add_floats)
+        left.value, right.value = "a", "b"
+        self.assertEqual(self.evaluate_expression(expr), "ab")
+        self.assertIs(expr.op, add_generic)
+        self.assertEqual(self.evaluate_expression(expr), "ab")
+        right.value = 1.0
+        with self.assertRaises(RuntimeException) as raised:
+            self.evaluate_expression(expr)
+        self.assertEqual(raised.exception.message, "Operands must be two numbers or two strings.")
+        self.assertEqual(dict(counters), {"specialized": 1, "add_floats": 1, "deoptimized": 1})
+        strings = Binary(Literal("a"), Token(TokenType.PLUS, "+", None, 1), Literal("b"))
+        self.evaluate_expression(strings)
+        self.assertIs(strings.op, concat)
+
+    def test_operand_errors(self):
+        from app.Errors import RuntimeException
+        cases = [(TokenType.PLUS, "+", 1.0, "a", "Operands must be two numbers or two strings."),
+                 (TokenType.LESS, "<", "a", "b", "Operands must be a numbers."),
+                 (TokenType.SLASH, "/", True, 1.0, "Operands must be a numbers.")]
+        for token_type, lexeme, left, right, message in cases:
+            with self.subTest(lexeme=lexeme):
+                with self.assertRaises(RuntimeException) as raised:
+                    self.evaluate_expression(Binary(Literal(left), Token(token_type, lexeme, None, 1), Literal(right)))
+                self.assertEqual(raised.exception.message, message)
+
 
 class TestScanner(unittest.TestCase):
     def test_something(self):
@@ -145,6 +221,139 @@ class TestScanner(unittest.TestCase):
         self.assertIn(expected, output)
 
 
+class TestRegexScanner(unittest.TestCase):
+    sources = [
+        "",
+        "(){},.;-+*/ != == <= >= < > ! =",
+        "var x_1 = 12.5 + 3. * .4; print x_1;",
+        '"multi\nline" // comment\nand or EOF nil',
+        "caf\u00e9 = 12\u0663.5; \u00e9x",
+        '@ # print "unterminated\n',
+    ]
+
+    def scan(self, scanner_class, source):
+        with patch('sys.stderr', new_callable=io.StringIO) as err:
+            tokens = scanner_class(source).scan_tokens()
+        return [(t.token_type, t.lexeme, t.literal, t.line) for t in tokens], err.getvalue()
+
+    def test_same_tokens_and_diagnostics(self):
+        from app.RegexScanner import RegexScanner
+        for source in self.sources:
+            with self.subTest(source=source):
+                self.assertEqual(self.scan(RegexScanner, source), self.scan(Scanner, source))
+
+    def test_unterminated_string_line(self):
+        from app.RegexScanner import RegexScanner
+        _, err = self.scan(RegexScanner, 'print 1;\n"open\nstill open')
+        self.assertEqual(err.strip(), "[line 3] Error: Unterminated string.")
+
+
+class TestTokenStream(unittest.TestCase):
+    source = 'var a = "multi\nline // not a comment";\n// "not a string\nprint a + "x"; @\n{ print 1.5; }\n"open'
+
+    def as_tuples(self, tokens):
+        return [(t.token_type, t.lexeme, t.literal, t.line) for t in tokens]
+
+    def test_iter_tokens_matches_scan_tokens(self):
+        expected = self.as_tuples(Scanner(self.source).scan_tokens())
+        self.assertEqual(self.as_tuples(Scanner(self.source).iter_tokens()), expected)
+
+    def test_file_chunks_match_scan_tokens(self):
+        from app.TokenStream import stream_tokens
+        with patch('sys.stderr', new_callable=io.StringIO) as err:
+            expected = self.as_tuples(Scanner(self.source).scan_tokens())
+        for chunk_size in (1, 7, 1 << 20):
+            with self.subTest(chunk_size=chunk_size), patch('sys.stderr', new_callable=io.StringIO) as chunked_err:
+                tokens = self.as_tuples(stream_tokens(io.StringIO(self.source), Scanner, chunk_size))
+                self.assertEqual(tokens, expected)
+                self.assertEqual(chunked_err.getvalue(), err.getvalue())
+
+    def test_open_string_start(self):
+        from app.TokenStream import open_string_start
+        self.assertIsNone(open_string_start('print "done";\n'))
+        self.assertIsNone(open_string_start('// "comment\n'))
+        self.assertEqual(open_string_start('print "a" + "b\n'), 12)
+        self.assertEqual(open_string_start('"a" // "x\nprint "b', 3), 16)
+        self.assertIsNone(open_string_start('print "a" + "b\n', 0, 10))
+
+    def test_string_across_many_chunks(self):
+        """Held as it grows, spilled to a file past a chunk, read back only when it closes"""
+        from app.RegexScanner import RegexScanner
+        from app.TokenStream import stream_tokens
+        for tail in ('";\nprint "x" + 2;', ''):
+            source = 'print 1;\nprint "' + 'text\n' * 50 + tail
+            for scanner_class in (Scanner, RegexScanner):
+                with self.subTest(closed=bool(tail), scanner=scanner_class.__name__):
+                    with patch('sys.stderr', new_callable=io.StringIO) as err:
+                        expected = self.as_tuples(scanner_class(source).scan_tokens())
+                    with patch('sys.stderr', new_callable=io.StringIO) as chunked_err:
+                        tokens = self.as_tuples(stream_tokens(io.StringIO(source), scanner_class, 8))
+                    self.assertEqual(tokens, expected)
+                    self.assertEqual(chunked_err.getvalue(), err.getvalue())
+
+    def test_parser_pulls_from_generator(self):
+        statements = Parser(Scanner("var a = 1; { print a; }").iter_tokens()).parse()
+        self.assertIsInstance(statements[0], Var)
+        self.assertIsInstance(statements[1], Block)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_stream_option(self, mock_stdout):
+        Lox.interpreter = Interpreter()
+        Lox.run("var a = 1;\n{ var b = a + 1; print b; }", "run", {"stream": True})
+        self.assertEqual(mock_stdout.getvalue(), "2\n")
+
+
+class TestTokenBuffer(unittest.TestCase):
+    source = 'var a = 12.5;\n"two\nlines" EOF caf\u00e9 @ { print a >= 1; } // done'
+
+    def test_same_tokens_as_scanner(self):
+        from app.RegexScanner import RegexScanner
+        with patch('sys.stderr', new_callable=io.StringIO) as err:
+            expected = [(t.token_type, t.lexeme, t.literal, t.line) for t in Scanner(self.source).scan_tokens()]
+        with patch('sys.stderr', new_callable=io.StringIO) as buffer_err:
+            buffer = RegexScanner(self.source).scan_buffer()
+        self.assertEqual([(t.token_type, t.lexeme, t.literal, t.line) for t in buffer], expected)
+        self.assertEqual(buffer_err.getvalue(), err.getvalue())
+        self.assertEqual(len(buffer), len(expected))
+        self.assertEqual(buffer[0].lexeme, "var")
+
+    def test_compact_storage(self):
+        from app.RegexScanner import RegexScanner
+        buffer = RegexScanner("print 1 + 2;").scan_buffer()
+        self.assertEqual(buffer.nbytes(), 6 * 13)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_compact_tokens_option(self, mock_stdout):
+        Lox.interpreter = Interpreter()
+        Lox.run('var a = "x";\n{ print a + "y"; }', "run", {"compact-tokens": True})
+        self.assertEqual(mock_stdout.getvalue(), "xy\n")
+
+
+class TestParallelScanner(unittest.TestCase):
+    source = ('var a = "one\ntwo // not a comment";\n// a "quote\nprint a + "x"; @\n' * 40
+              + '"spans\n\nlines";\ncaf\u00e9;\n"unterminated\n')
+
+    def test_chunks_end_at_newlines_outside_strings(self):
+        from app.ParallelScanner import chunk_bounds
+        bounds = chunk_bounds(self.source, 50)
+        self.assertGreater(len(bounds), 10)
+        self.assertEqual((bounds[0][0], bounds[-1][1]), (0, len(self.source)))
+        for (_, end), (start, _) in zip(bounds, bounds[1:]):
+            self.assertEqual(end, start)
+            self.assertIn(self.source[end - 1:end + 1], ('\nv', '\n/', '\np', '\n"', '\nc', ' "'))
+
+    def test_same_tokens_and_diagnostics_as_scanner(self):
+        from app.ParallelScanner import scan_parallel
+        with patch('sys.stderr', new_callable=io.StringIO) as err:
+            expected = [(t.token_type, t.lexeme, t.literal, t.line) for t in Scanner(self.source).scan_tokens()]
+        with patch('app.ParallelScanner.min_parallel_size', 0), patch('app.ParallelScanner.chunks_per_job', 8), \
+                patch('sys.stderr', new_callable=io.StringIO) as parallel_err:
+            buffer = scan_parallel(self.source, 2)
+        self.assertEqual([(t.token_type, t.lexeme, t.literal, t.line) for t in buffer], expected)
+        self.assertEqual(parallel_err.getvalue(), err.getvalue())
+        ErrorReporter.had_error = False
+
+
 # class TestParser(unittest.TestCase):
 #
 #     def test_parse_term(self):
@@ -197,11 +406,683 @@ class TestScanner(unittest.TestCase):
 #         self.assertEqual(expr.value, "nil")
 
 
+class TestPrattParser(unittest.TestCase):
+
+    def parse_expression(self, source):
+        from app.ExprParser import ExprParser
+        return AstPrinter().print(ExprParser(Scanner(source).scan_tokens()).parse())
+
+    def test_precedence_and_associativity(self):
+        cases = [("1 - 2 - 3", "(- (- 1.0 2.0) 3.0)"),
+                 ("1 + 2 * 3 == 7 > 6", "(== (+ 1.0 (* 2.0 3.0)) (> 7.0 6.0))"),
+                 ("!-1 < -(2) / 3", "(< (! (- 1.0)) (/ (- (group 2.0)) 3.0))"),
+                 ("-[3][0] * [1, 2][1]", "(* (- (index (array 3.0) 0.0)) (index (array 1.0 2.0) 1.0))"),
+                 ("true != nil == false", "(== (!= true nil) false)")]
+        for source, tree in cases:
+            with self.subTest(source):
+                self.assertEqual(self.parse_expression(source), tree)
+
+    def test_assignment_is_right_associative(self):
+        expr = Parser(Scanner("a = b = 1 + 2;").scan_tokens()).parse()[0].expression
+        self.assertEqual((expr.name.lexeme, expr.value.name.lexeme), ("a", "b"))
+        self.assertEqual(AstPrinter().print(expr.value.value), "(+ 1.0 2.0)")
+
+    def test_errors(self):
+        cases = [("print 1 +;", "[line 1] Error at ';': Expect expression.\n"),
+                 ("print (1;", "[line 1] Error at ';': Expect ')' after expression.\n"),
+                 ("a + b = 1;", "[line 1] Error at '=': Invalid assignment target.\n"),
+                 ("print [1, 2;", "[line 1] Error at ';': Expect ']' after array elements.\n"),
+                 ("print", "[line 1] Error at end: Expect expression.\n")]
+        for source, message in cases:
+            with self.subTest(source), patch('sys.stderr', new_callable=io.StringIO) as err:
+                Parser(Scanner(source).scan_tokens()).parse()
+                self.assertEqual(err.getvalue(), message)
+        ErrorReporter.had_error = False
+
+
+class TestResolver(unittest.TestCase):
+
+    def setUp(self) -> None:
+        Lox.interpreter = Interpreter()
+
+    def resolve(self, source):
+        statements = Parser(Scanner(source).scan_tokens()).parse()
+        Resolver().resolve(statements)
+        return statements
+
+    def test_globals_stay_unresolved(self):
+        statements = self.resolve("var a = 1; print a;")
+        self.assertIsNone(statements[0].slot)
+        self.assertIsNone(statements[1].expression.depth)
+
+    def test_locals_get_depth_and_slot(self):
+        statements = self.resolve("{ var a = 1; var b = 2; { print b; } }")
+        outer = statements[0]
+        self.assertIsInstance(outer, Block)
+        self.assertEqual(outer.slot_count, 2)
+        self.assertEqual(outer.statements[1].slot, 1)
+        inner_print = outer.statements[2].statements[0]
+        self.assertIsInstance(inner_print, Print)
+        self.assertEqual((inner_print.expression.depth, inner_print.expression.slot), (1, 1))
+
+    def test_redeclaration_reuses_slot(self):
+        statements = self.resolve("{ var a = 1; var a = a; }")
+        block = statements[0]
+        self.assertEqual(block.slot_count, 1)
+        self.assertIsInstance(block.statements[1], Var)
+        self.assertEqual((block.statements[1].initializer.depth, block.statements[1].initializer.slot), (0, 0))
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_shadowing_output(self, mock_stdout):
+        with open("app/test.lox") as file:
+            Lox.run(file.read(), "run")
+        self.assertEqual(mock_stdout.getvalue().split(),
+                         ["inner", "a", "outer", "b", "global", "c", "outer", "a", "outer", "b", "global", "c",
+                          "global", "a", "global", "b", "global", "c"])
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    def test_undefined_variable_in_block(self, mock_stderr):
+        with self.assertRaises(SystemExit) as cm:
+            Lox.run("var a = 1;\n{\n  b = a;\n}", "run")
+        self.assertEqual(cm.exception.code, 70)
+        self.assertIn("Undefined variable 'b'.\n[line 3]", mock_stderr.getvalue())
+
+
+def run_program(source, options=None):
+    """Runs source with the run command, returns (stdout, stderr, exit code)"""
+    Lox.interpreter = Interpreter()
+    code = 0
+    with patch('sys.stdout', new_callable=io.StringIO) as out, patch('sys.stderr', new_callable=io.StringIO) as err:
+        try:
+            Lox.run(source, "run", options)
+        except SystemExit as e:
+            code = e.code
+    return out.getvalue(), err.getvalue(), code
+
+
+class EngineParity:
+    """Runs the same programs on an alternative engine and on the tree-walker"""
+    engine = None
+    program = """var a = 1;
+var s = "x";
+{
+  var a = 2;
+  var b;
+  print b;
+  a = a * 3 - -1;
+  { var c = a / 2; print c; print a >= c; print !nil; print c == 3.5; }
+  print a;
+  s = s + "y" + s;
+}
+print a != 1;
+print s;
+print (1 + 2) * 3 <= 9;
+"""
+
+    def assert_same_as_tree(self, source):
+        expected = run_program(source)
+        actual = run_program(source, {"engine": self.engine})
+        self.assertEqual(actual[0], expected[0])
+        self.assertEqual(actual[2], expected[2])
+        return actual
+
+    def test_program_output(self):
+        out, _, code = self.assert_same_as_tree(self.program)
+        self.assertEqual(out.split(), ["nil", "3.5", "true", "true", "true", "7", "false", "xyx", "true"])
+        self.assertEqual(code, 0)
+
+    def test_long_folded_string(self):
+        source = 'var y = "z";\ny = "w";\nvar s = "' + "a" * 1100 + '" + "b";\nprint s + y;'
+        out, _, code = self.assert_same_as_tree(source)
+        self.assertEqual((out, code), ("a" * 1100 + "bw\n", 0))
+
+    def test_runtime_error(self):
+        _, err, code = self.assert_same_as_tree('print 1;\nprint "a" + 1;\nprint 2;')
+        self.assertEqual(code, 70)
+        self.assertIn("Operands must be two numbers or two strings.\n[line 2]", err)
+
+    def test_undefined_global(self):
+        _, err, code = self.assert_same_as_tree('{\n  print b;\n}')
+        self.assertEqual(code, 70)
+        self.assertIn("Undefined variable 'b'.\n[line 2]", err)
+
+    def test_parse_error_stops_execution(self):
+        out, _, code = self.assert_same_as_tree('print 1;\nprint 2 +;\nprint 3;')
+        self.assertEqual(out, "1\n")
+        self.assertEqual(code, 65)
+        out, _, code = self.assert_same_as_tree('print 1;\n{ print 2; print ; print 3; }\nprint 4;')
+        self.assertEqual((out, code), ("1\n2\n", 65))
+
+
+class TestVM(EngineParity, unittest.TestCase):
+    engine = "vm"
+
+    def test_signed_zero_constants(self):
+        out, _, _ = self.assert_same_as_tree("print 0;\nprint -0;")
+        self.assertEqual(out, "0\n-0\n")
+
+    def test_disassemble(self):
+        from app.Compiler import Compiler
+        statements = Parser(Scanner("{ var a = 1; print -a; }").scan_tokens()).parse()
+        Resolver().resolve(statements)
+        listing = Compiler().compile(statements).disassemble()
+        self.assertIn("OP_RESERVE", listing)
+        self.assertIn("OP_NEGATE", listing)
+        self.assertTrue(listing.rstrip().endswith("OP_RETURN"))
+
+
+class TestClosureCompiler(EngineParity, unittest.TestCase):
+    engine = "closure"
+
+    def test_deep_scope_assignment(self):
+        out, _, _ = self.assert_same_as_tree("{ var a = 1; { { a = a + 1; } } print a; }")
+        self.assertEqual(out, "2\n")
+
+
+class TestTranspiler(EngineParity, unittest.TestCase):
+    engine = "python"
+
+    def test_operands_evaluated_before_type_check(self):
+        _, err, code = self.assert_same_as_tree('print "a" - (-"b");')
+        self.assertEqual(code, 70)
+        self.assertIn("Operand must be a number.", err)
+
+    def test_emit_python(self):
+        with patch('sys.stdout', new_callable=io.StringIO) as out:
+            Lox.run("var a = 1; { var b = a + 2; print b; }", "run", {"emit-python": True})
+        source = out.getvalue()
+        self.assertTrue(source.startswith("def _lox_main(_G):"))
+        self.assertIn("_G['a'] = 1.0", source)
+        compile(source, "<lox>", "exec")
+
+
+class TestStackInterpreter(EngineParity, unittest.TestCase):
+    engine = "stack"
+
+    def test_functions_and_arrays(self):
+        source = TestFunction.source + "\nvar a = [1, 2, 3];\nprint (a * 2)[2] + a[0];"
+        out, _, code = self.assert_same_as_tree(source)
+        self.assertEqual((out, code), (TestFunction.output + "7\n", 0))
+
+    def test_nesting_beyond_the_recursion_limit(self):
+        depth = 50000
+        source = ("var x = " + "(" * depth + "1" + ")" * depth + ";\n" + "{" * depth + "x = -x;" + "}" * depth
+                  + "\nprint x;")
+        self.assertEqual(run_program(source, {"engine": self.engine}), ("-1\n", "", 0))
+
+    def test_recursion_beyond_the_recursion_limit(self):
+        source = "fun f(n) { print n; return f(n); }\nf(1);"
+        out, err, code = run_program(source, {"engine": self.engine, "max-depth": "30000"})
+        self.assertEqual((out.count("1\n"), err, code), (30000, "Stack overflow.\n[line 1]\n", 70))
+
+    def test_deep_program_skips_the_cache(self):
+        """The cache's encoder recurses in C, a subprocess because at this depth it used to crash the interpreter"""
+        import os
+        import subprocess
+        import sys
+        import tempfile
+        depth = 20000
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "deep.lox")
+            with open(path, "w") as file:
+                file.write("print " + "(" * depth + "1" + ")" * depth + ";")
+            result = subprocess.run([sys.executable, "-m", "app.main", "run", path, "--engine=stack",
+                                     f"--cache={os.path.join(directory, 'cache')}"], capture_output=True, text=True)
+            self.assertEqual((result.stdout, result.stderr, result.returncode), ("1\n", "", 0))
+            self.assertFalse(os.path.exists(os.path.join(directory, "cache")))
+
+    def test_error_restores_environment(self):
+        from app.StackInterpreter import StackInterpreter
+        statements = Parser(Scanner("var a = 1;\nfun f(x) { { var y = x; return -y; } }\n"
+                                    "{ var b = 2; print f(b) + f(\"c\"); }").scan_tokens()).parse()
+        Resolver().resolve(statements)
+        interpreter = StackInterpreter()
+        with patch('sys.stderr', new_callable=io.StringIO) as err, self.assertRaises(SystemExit):
+            interpreter.interpret(statements)
+        self.assertEqual(err.getvalue(), "Operand must be a number.\n[line 2]\n")
+        self.assertIs(interpreter.environment, interpreter.globals)
+        self.assertEqual((interpreter._depth, interpreter._work, interpreter._values), (0, [], []))
+        self.assertEqual(interpreter.globals.get(Token(TokenType.IDENTIFIER, "a", None, 1)), 1.0)
+
+
+class TestOptimizer(unittest.TestCase):
+
+    def optimize(self, source):
+        from app.Optimizer import Optimizer
+        return Optimizer().optimize(Parser(Scanner(source).scan_tokens()).parse())
+
+    def test_folds_literal_arithmetic(self):
+        statements = self.optimize('print (60 * 60 * 24); print "a" + "b" + "c"; print !(1 < 2);')
+        self.assertEqual([stmt.expression.value for stmt in statements], [86400.0, "abc", False])
+
+    def test_propagates_unassigned_variables(self):
+        statements = self.optimize("var a = 2; var b = a * 3; { print b + a; }")
+        self.assertEqual(statements[1].initializer.value, 6.0)
+        self.assertEqual(statements[2].statements[0].expression.value, 8.0)
+
+    def test_keeps_assigned_variables(self):
+        statements = self.optimize("var a = 2; a = 3; print a;")
+        self.assertIsInstance(statements[2].expression, Variable)
+
+    def test_respects_shadowing(self):
+        statements = self.optimize("var a = 1; { var a = 2; a = a + 1; print a; } print a;")
+        self.assertIsInstance(statements[1].statements[2].expression, Variable)
+        self.assertEqual(statements[2].expression.value, 1.0)
+
+    def test_use_before_declaration_is_not_propagated(self):
+        statements = self.optimize("print a; var a = 1;")
+        self.assertIsInstance(statements[0].expression, Variable)
+
+    def test_failing_operation_is_not_folded(self):
+        statements = self.optimize('print 1;\nprint -(1 + 2) * "x";')
+        self.assertIsInstance(statements[1].expression, Binary)
+        self.assertEqual(statements[1].expression.left.value, -3.0)
+        _, err, code = run_program('print 1;\nprint -(1 + 2) * "x";')
+        self.assertEqual(code, 70)
+        self.assertIn("Operands must be a numbers.\n[line 2]", err)
+
+
+class TestParseCache(unittest.TestCase):
+    source = 'var a = "hi";\n{ var b = a + "!"; print b; b = nil; print b == nil; }\nprint -(2 * 3);'
+
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def entries(self):
+        import os
+        return [os.path.join(self.directory.name, name) for name in os.listdir(self.directory.name)]
+
+    def test_round_trip(self):
+        from app.ParseCache import ParseCache
+        cache = ParseCache(self.directory.name)
+        statements = Parser(Scanner(self.source).scan_tokens()).parse()
+        self.assertIsNone(cache.load(self.source, "Parser"))
+        cache.store(self.source, "Parser", statements)
+        loaded = cache.load(self.source, "Parser")
+        self.assertEqual(repr(loaded), repr(statements))
+        self.assertIs(loaded[1].statements[0].initializer.op, statements[1].statements[0].initializer.op)
+        self.assertIsNone(cache.load(self.source, "ExprParser"))
+
+    def test_failed_store_leaves_no_temporary(self):
+        from app.ParseCache import ParseCache
+        cache = ParseCache(self.directory.name)
+        statements = Parser(Scanner(self.source).scan_tokens()).parse()
+        with patch('os.replace', side_effect=OSError("No space left on device")):
+            cache.store(self.source, "Parser", statements)
+        self.assertEqual(self.entries(), [])
+        self.assertIsNone(cache.load(self.source, "Parser"))
+
+    def test_cached_run_matches_fresh_run(self):
+        options = {"cache": self.directory.name}
+        fresh = run_program(self.source)
+        self.assertEqual(run_program(self.source, options), fresh)
+        self.assertEqual(len(self.entries()), 1)
+        self.assertEqual(run_program(self.source, options), fresh)
+
+    def test_errors_are_not_cached(self):
+        options = {"cache": self.directory.name}
+        self.assertEqual(run_program("print ;", options)[2], 65)
+        self.assertEqual(self.entries(), [])
+        self.assertEqual(run_program("print ;", options)[2], 65)
+
+    def test_corrupt_entry_falls_back_to_parse(self):
+        options = {"cache": self.directory.name}
+        fresh = run_program(self.source, options)
+        for path in self.entries():
+            with open(path, "r+b") as file:
+                file.seek(-3, 2)
+                file.write(b"\xff\xff\xff")
+        self.assertEqual(run_program(self.source, options), fresh)
+        self.assertEqual(run_program(self.source, options), fresh)
+
+    def test_eviction_keeps_directory_bounded(self):
+        from app.ParseCache import ParseCache
+        cache = ParseCache(self.directory.name, max_bytes=400)
+        for n in range(20):
+            source = f"print {n};"
+            cache.store(source, "Parser", Parser(Scanner(source).scan_tokens()).parse())
+        import os
+        self.assertLessEqual(sum(os.path.getsize(path) for path in self.entries()), 400)
+        self.assertIsNotNone(cache.load("print 19;", "Parser"))
+
+
+class TestServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import os
+        import tempfile
+        import threading
+        from app.Server import LoxServer
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "lox.sock")
+        cls.server = LoxServer(cls.path)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        Lox.interpreter = Interpreter()
+
+    def request(self, command, source):
+        import os
+        from app.Client import request
+        path = os.path.join(self.directory.name, "script.lox")
+        with open(path, "w") as file:
+            file.write(source)
+        return request(["./your_program.sh", command, path], self.path, echo=False)
+
+    def test_matches_cli(self):
+        for source in ('var a = "x";\n{ var b = a + a; print b; }', 'print 1;\nprint -"a";', "print (;"):
+            with self.subTest(source=source):
+                self.assertEqual(self.request("run", source), run_program(source))
+
+    def test_tokenize(self):
+        out, err, code = self.request("tokenize", "1 @")
+        self.assertEqual(out, "NUMBER 1 1.0\nEOF  null\n")
+        self.assertEqual(err, "[line 1] Error: Unexpected character: @\n")
+        self.assertEqual(code, 65)
+
+    def test_scripts_do_not_share_state(self):
+        self.assertEqual(self.request("run", "var a = 1;")[2], 0)
+        out, err, code = self.request("run", "print a;")
+        self.assertEqual((code, err), (70, "Undefined variable 'a'.\n[line 1]\n"))
+
+
+class TestBatch(unittest.TestCase):
+    files = {
+        "a.lox": "var shared = 1;\nprint shared;",
+        "b.lox": "print shared;",
+        "c.lox": "print (;",
+        "sub/d.lox": 'print "d" + "!";',
+    }
+
+    def setUp(self):
+        import os
+        import tempfile
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        for name, source in self.files.items():
+            path = os.path.join(self.directory.name, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                file.write(source)
+
+    def check(self, results):
+        self.assertEqual([r["path"][len(self.directory.name) + 1:] for r in results], list(self.files))
+        self.assertEqual([r["exit_code"] for r in results], [0, 70, 65, 0])
+        self.assertEqual(results[0]["stdout"], "1\n")
+        self.assertEqual(results[1]["stderr"], "Undefined variable 'shared'.\n[line 1]\n")
+        self.assertEqual(results[2]["stderr"], "[line 1] Error at ';': Expect expression.\n")
+        self.assertEqual(results[3]["stdout"], "d!\n")
+
+    def test_in_process(self):
+        from app.Batch import find_files, run_files
+        self.check(list(run_files(find_files(self.directory.name), {}, jobs=1)))
+
+    def test_pool(self):
+        from app.Batch import find_files, run_files
+        self.check(list(run_files(find_files(self.directory.name), {"engine": "vm"}, jobs=2)))
+
+    def test_report(self):
+        import json
+        import os
+        from app.Batch import run_batch
+        report = os.path.join(self.directory.name, "report.jsonl")
+        with patch('sys.stderr', new_callable=io.StringIO) as err:
+            code = run_batch(self.directory.name, {"report": report, "jobs": "2"})
+        self.assertEqual(code, 1)
+        self.assertEqual(err.getvalue().split(",")[:2], ["4 files", " 2 failed"])
+        with open(report) as file:
+            self.check([json.loads(line) for line in file])
+
+
+class TestProfiler(unittest.TestCase):
+    source = "var a = 1;\n{\n  var b = a + 2;\n  a = a * b - (b / 3);\n}\nprint -a;\nprint a + nil;"
+
+    def test_counts_per_type_and_line(self):
+        from app.Profiler import NodeProfiler, COUNT
+        statements = Parser(Scanner(self.source).scan_tokens()).parse()
+        Resolver().resolve(statements)
+        interpreter = Interpreter()
+        profiler = NodeProfiler()
+        profiler.install(interpreter)
+        with patch('sys.stdout', new_callable=io.StringIO), patch('sys.stderr', new_callable=io.StringIO):
+            with self.assertRaises(SystemExit):
+                interpreter.interpret(statements)
+        NodeProfiler.uninstall(interpreter)
+        counts = {kind: entry[COUNT] for kind, entry in profiler.by_type.items()}
+        self.assertEqual(counts, {"Var": 2, "Literal": 4, "Block": 1, "Binary": 5, "Variable": 6, "Expression": 1,
+                                  "Assign": 1, "Grouping": 1, "Print": 2, "Unary": 1})
+        lines = {line: entry[COUNT] for line, entry in profiler.by_line.items()}
+        self.assertEqual(lines, {1: 2, 3: 5, 4: 10, 6: 3, 7: 4})
+        self.assertNotIn("execute", vars(interpreter))
+
+    def test_report_survives_runtime_error(self):
+        out, err, code = run_program(self.source, {"profile": True})
+        self.assertEqual(code, 70)
+        self.assertIn("Operands must be two numbers or two strings.\n[line 7]", err)
+        self.assertIn("node type", err)
+        self.assertRegex(err, r"\nBinary +5 ")
+        self.assertNotIn("execute", vars(Lox.interpreter))
+
+    def test_sampled_stack_follows_blocks(self):
+        import sys
+        from app.Profiler import SamplingProfiler
+        profiler = SamplingProfiler()
+        statements = Parser(Scanner("var a = 1;\n{\n  var b = 2;\n  {\n    print a + b;\n  }\n}").scan_tokens()).parse()
+        Resolver().resolve(statements)
+        sample = lambda value: profiler.sample(0, sys._getframe()) or "3"
+        with patch.object(Interpreter, "stringify", side_effect=sample), patch('sys.stdout', new_callable=io.StringIO):
+            Interpreter().interpret(statements)
+        self.assertEqual(profiler.samples, {("Block :3", "Block :5", "Print :5"): 1})
+        out = io.StringIO()
+        profiler.write(out)
+        self.assertEqual(out.getvalue(), "Block :3;Block :5;Print :5 1\n")
+
+    def test_sample_option_writes_collapsed_stacks(self):
+        import os
+        import tempfile
+        from benchmarks.bench_engines import generate
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "out.collapsed")
+            _, _, code = run_program(generate(300), {"sample": path, "sample-interval": "0.5", "no-optimize": True})
+            self.assertEqual(code, 0)
+            with open(path) as file:
+                for line in file:
+                    stack, count = line.rsplit(" ", 1)
+                    self.assertRegex(count, r"^\d+\n$")
+                    for frame in stack.split(";"):
+                        self.assertRegex(frame, r"^[A-Z]\w*( \S+)? :(\d+|-)$")
+
+    def test_quicken_stats(self):
+        _, err, code = run_program('var a = 1;\n{ var b = a + 2; print "x" + "y"; }', {"quicken-stats": True, "no-optimize": True})
+        self.assertEqual(code, 0)
+        self.assertIn("Quickening: 2 specialized (add_floats 1, concat 1), 0 deoptimized\n", err)
+
+    def test_quicken_stats_by_engine(self):
+        source = 'var a = 1;\n{ var b = a + 2; print "x" + "y"; }'
+        _, err, _ = run_program(source, {"quicken-stats": True, "no-optimize": True, "engine": "stack"})
+        self.assertIn("Quickening: 2 specialized (add_floats 1, concat 1), 0 deoptimized\n", err)
+        for engine in ("vm", "closure", "python"):
+            with self.subTest(engine):
+                out, err, code = run_program(source, {"quicken-stats": True, "engine": engine})
+                self.assertEqual((out, code), ("xy\n", 0))
+                self.assertEqual(err, f"Quickening: no stats, --engine={engine} does not quicken, only the tree and "
+                                      f"stack engines do\n")
+
+    def test_off_by_default(self):
+        from app.Profiler import NodeProfiler
+        with patch.object(NodeProfiler, "install") as install:
+            run_program("print 1;")
+        install.assert_not_called()
+
+
+class TestOutput(unittest.TestCase):
+
+    def test_policies(self):
+        from app.Output import OutputSink
+        for policy, flushed in (("line", "a\nb\n"), ("size", "a\nb\n"), ("exit", "")):
+            with self.subTest(policy):
+                stream = io.StringIO()
+                sink = OutputSink(stream, policy=policy, buffer_size=4)
+                sink.write("a\n")
+                self.assertEqual(stream.getvalue(), "a\n" if policy == "line" else "")
+                sink.write("b\n")
+                self.assertEqual(stream.getvalue(), flushed)
+                sink.flush()
+                self.assertEqual(stream.getvalue(), "a\nb\n")
+        with self.assertRaises(ValueError):
+            OutputSink(policy="never")
+
+    def test_in_memory_sink(self):
+        from app.Output import Output, OutputSink
+        buffer = io.StringIO()
+        previous = Output.use(OutputSink(buffer, policy="exit"))
+        try:
+            for engine in ("tree", "vm", "closure", "python"):
+                _, _, code = run_program('print "x" + "y";', {"engine": engine})
+                self.assertEqual(code, 0)
+        finally:
+            Output.use(previous)
+        self.assertEqual(buffer.getvalue(), "xy\n" * 4)
+
+    def test_output_precedes_runtime_error(self):
+        both = io.StringIO()
+        Lox.interpreter = Interpreter()
+        with patch('sys.stdout', both), patch('sys.stderr', both), self.assertRaises(SystemExit):
+            Lox.run('print 1;\nprint 2;\nprint -"x";', "run")
+        self.assertEqual(both.getvalue(), "1\n2\nOperand must be a number.\n[line 3]\n")
+
+    def test_diagnostics_off_by_default(self):
+        from app.Log import Log, OFF
+        out, err, code = run_program("print 1;")
+        self.assertEqual((out, err, code), ("1\n", "", 0))
+        try:
+            out, err, code = run_program("print 1;", {"log": "debug"})
+            self.assertEqual(out, "1\n")
+            self.assertIn("lox DEBUG: stringify called with 1.0 of type float", err)
+        finally:
+            Log.configure("off")
+        self.assertEqual(Log.level, OFF)
+
+
+class TestArray(unittest.TestCase):
+    source = "var a = [1, 2, 3.5];\nprint a * 2 + 1;\nprint 10 - a;\nprint a[2];\nprint a > 1.5;\nprint -a;\n" \
+             "print a == [1, 2, 3.5];\nprint [];\nprint [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12] / 2;"
+    output = "[3, 5, 8]\n[9, 8, 6.5]\n3.5\n[false, true, true]\n[-1, -2, -3.5]\ntrue\n[]\n" \
+             "[0.5, 1, 1.5, ..., 5, 5.5, 6]\n"
+
+    def test_vectorized_operations(self):
+        for engine in ("tree", "vm", "closure", "python"):
+            with self.subTest(engine):
+                self.assertEqual(run_program(self.source, {"engine": engine}), (self.output, "", 0))
+
+    def test_errors(self):
+        cases = [("print [1, 2] + [1, 2, 3];", "Arrays must have the same length."),
+                 ('print [1, "a"];', "Array elements must be numbers."),
+                 ("print [1, 2][2];", "Array index out of range."),
+                 ("print [1, 2][0.5];", "Array index must be an integer."),
+                 ("print 1[0];", "Only arrays can be indexed."),
+                 ("print ([1] > 0) + 1;", "Operands must be two numbers or two strings."),
+                 ('print [1] * "a";', "Operands must be a numbers."),
+                 ('print -([1] < 2);', "Operand must be a number.")]
+        for source, message in cases:
+            with self.subTest(source):
+                self.assertEqual(run_program(source), ("", message + "\n[line 1]\n", 70))
+
+    def test_division_by_zero_is_ieee(self):
+        out, _, _ = run_program("print [1, -1, 0] / 0;")
+        self.assertEqual(out, "[inf, -inf, nan]\n")
+
+    def test_parse(self):
+        tokens = Scanner("[1, 2][0] * [[3]]").scan_tokens()
+        from app.ExprParser import ExprParser
+        self.assertEqual(AstPrinter().print(ExprParser(tokens).parse()),
+                         "(* (index (array 1.0 2.0) 0.0) (array (array 3.0)))")
+        with patch('sys.stderr', new_callable=io.StringIO) as err:
+            Parser(Scanner("print [1, 2;").scan_tokens()).parse()
+        self.assertEqual(err.getvalue(), "[line 1] Error at ';': Expect ']' after array elements.\n")
+
+
+class TestFunction(unittest.TestCase):
+    source = """fun add(a, b) { return a + b; }
+print add(1, 2);
+fun counter() {
+  var count = 0;
+  fun increment() { count = count + 1; return count; }
+  return increment;
+}
+var c = counter();
+c();
+print c();
+print counter()();
+print c;
+fun early(x) { { return x; } print "not reached"; }
+print early("e");
+fun nothing() {}
+print nothing();
+print clock() > 0;"""
+    output = "3\n2\n1\n<fn increment>\ne\nnil\ntrue\n"
+
+    def test_closures_and_return(self):
+        for engine in ("tree", "vm", "closure", "python"):
+            with self.subTest(engine):
+                self.assertEqual(run_program(self.source, {"engine": engine}), (self.output, "", 0))
+
+    def test_frame_holds_parameters_then_locals(self):
+        statements = Parser(Scanner("fun f(a, b) { var c = a; { var d = b; } }").scan_tokens()).parse()
+        Resolver().resolve(statements)
+        self.assertEqual(statements[0].slot_count, 3)
+        self.assertEqual(statements[0].body[0].slot, 2)
+
+    def test_runtime_errors(self):
+        cases = [("fun f(a) {}\nf(1, 2);", "Expected 1 arguments but got 2.\n[line 2]"),
+                 ('"a"(1);', "Can only call functions and classes.\n[line 1]"),
+                 ("fun f(n) { return f(n + 1); }\nf(0);", "Stack overflow.\n[line 1]")]
+        for source, message in cases:
+            with self.subTest(source):
+                self.assertEqual(run_program(source), ("", message + "\n", 70))
+
+    def test_max_depth(self):
+        source = "fun f(n) { print n; return f(n + 1); }\nf(1);"
+        out, err, code = run_program(source, {"max-depth": "5"})
+        self.assertEqual((out, err, code), ("1\n2\n3\n4\n5\n", "Stack overflow.\n[line 1]\n", 70))
+        self.assertEqual(Lox.interpreter._depth, 0)
+        self.assertIs(Lox.interpreter.environment, Lox.interpreter.globals)
+
+    def test_static_errors_stop_the_program(self):
+        cases = [('print "x";\nreturn 1;', "[line 2] Error at 'return': Can't return from top-level code.\n"),
+                 ("fun f(a, a) {}", "[line 1] Error at 'a': Already a variable with this name in this scope.\n"),
+                 ("fun f(a {}", "[line 1] Error at '{': Expect ')' after parameters.\n"),
+                 ("f(1;", "[line 1] Error at ';': Expect ')' after arguments.\n")]
+        for source, message in cases:
+            with self.subTest(source):
+                self.assertEqual(run_program(source), ("", message, 65))
+
+    def test_optimizer_keeps_late_bound_names(self):
+        source = "var a = 1;\nfun show() { print a; }\nfun set() { b = 3; }\nvar a = 2;\nvar b = 1;\nset();\nshow();\nprint b;"
+        self.assertEqual(run_program(source), ("2\n3\n", "", 0))
+
+    def test_parse(self):
+        from app.ExprParser import ExprParser
+        statements = Parser(Scanner('"f"(1, "g"())[0];').scan_tokens()).parse()
+        self.assertEqual(AstPrinter().print(statements[0].expression), "(index (call f 1.0 (call g)) 0.0)")
+        # The parse and evaluate commands take no calls, the expression ends before the parenthesis
+        self.assertEqual(AstPrinter().print(ExprParser(Scanner("(1)(2)").scan_tokens()).parse()), "(group 1.0)")
+
+
 class TestSystemExit(unittest.TestCase):
 
     @patch('sys.exit')
     def test_exit_code_65_on_error(self, mock_exit):
-        Lox.had_error = True
+        ErrorReporter.had_error = True
 
         with self.assertRaises(SystemExit) as cm:
             Lox.run("(73 +)", "parse")
@@ -0,0 +1,128 @@
+from typing import Any, Dict, List
+
+from app.Chunk import Chunk, OpCode
+from app.Errors import ErrorReporter, RuntimeException
+from app.Interpreter import Interpreter
+from app.Output import Output
+from app.Token import Token, TokenType
+
+
+class VM:
+    """Stack machine running a Chunk produced by the Compiler. Values, truthiness, equality and
+    stringify are the Interpreter's own, so output and runtime errors match the tree-walker."""
+
+    def __init__(self) -> None:
+        self.globals: Dict[str, Any] = {}
+        self.stack: List[Any] = []
+
+    def interpret(self, chunk: Chunk) -> None:
+        try:
+            self.run(chunk)
+        except RuntimeException as e:
+            ErrorReporter.runtime_error(e)
+        finally:
+            Output.sink.flush()
+
+    @staticmethod
+    def error(chunk: Chunk, ip: int, message: str) -> RuntimeException:
+        """The chunk keeps lines, not tokens, error reporting only needs the line"""
+        return RuntimeException(Token(TokenType.EOF, "", None, chunk.lines[ip]), message)
+
+    def run(self, chunk: Chunk) -> None:
+        code = chunk.code
+        constants = chunk.constants
+        global_values = self.globals
+        stack = self.stack
+        push = stack.append
+        pop = stack.pop
+        is_truthy = Interpreter.is_truthy
+        is_equal = Interpreter.is_equal
+        stringify = Interpreter.stringify
+        write = Output.sink.write
+        ip = 0
+        while True:
+            op = code[ip]
+            ip += 1
+            # Most frequent opcodes first, the chain is the dispatch
+            if op == OpCode.GET_LOCAL:
+                push(stack[code[ip]])
+                ip += 1
+            elif op == OpCode.CONSTANT:
+                push(constants[code[ip]])
+                ip += 1
+            elif op == OpCode.GET_GLOBAL:
+                name = constants[code[ip]]
+                if name not in global_values:
+                    raise self.error(chunk, ip, f"Undefined variable '{name}'.")
+                push(global_values[name])
+                ip += 1
+            elif op == OpCode.SET_LOCAL:
+                stack[code[ip]] = stack[-1]
+                ip += 1
+            elif op == OpCode.POP:
+                pop()
+            elif op == OpCode.ADD:
+                right = pop()
+                left = stack[-1]
+                if isinstance(left, str) and isinstance(right, str):
+                    stack[-1] = left + right
+                elif isinstance(left, float) and isinstance(right, float):
+                    stack[-1] = left + right
+                else:
+                    raise self.error(chunk, ip - 1, "Operands must be two numbers or two strings.")
+            elif op <= OpCode.DIVIDE and op >= OpCode.GREATER:
+                right = pop()
+                left = stack[-1]
+                if not (isinstance(left, float) and isinstance(right, float)):
+                    raise self.error(chunk, ip - 1, "Operands must be a numbers.")
+                if op == OpCode.SUBTRACT:
+                    stack[-1] = left - right
+                elif op == OpCode.MULTIPLY:
+                    stack[-1] = left * right
+                elif op == OpCode.DIVIDE:
+                    stack[-1] = left / right
+                elif op == OpCode.GREATER:
+                    stack[-1] = left > right
+                elif op == OpCode.GREATER_EQUAL:
+                    stack[-1] = left >= right
+                elif op == OpCode.LESS:
+                    stack[-1] = left < right
+                else:
+                    stack[-1] = left <= right
+            elif op == OpCode.EQUAL:
+                right = pop()
+                stack[-1] = is_equal(stack[-1], right)
+            elif op == OpCode.NOT_EQUAL:
+                right = pop()
+                stack[-1] = not is_equal(stack[-1], right)
+            elif op == OpCode.PRINT:
+                write(stringify(pop()) + "\n")
+            elif op == OpCode.NIL:
+                push(None)
+            elif op == OpCode.TRUE:
+                push(True)
+            elif op == OpCode.FALSE:
+                push(False)
+            elif op == OpCode.NOT:
+                stack[-1] = not is_truthy(stack[-1])
+            elif op == OpCode.NEGATE:
+                if not isinstance(stack[-1], float):
+                    raise self.error(chunk, ip - 1, "Operand must be a number.")
+                stack[-1] = -stack[-1]
+            elif op == OpCode.DEFINE_GLOBAL:
+                global_values[constants[code[ip]]] = pop()
+                ip += 1
+            elif op == OpCode.SET_GLOBAL:
+                name = constants[code[ip]]
+                if name not in global_values:
+                    raise self.error(chunk, ip, f"Undefined variable '{name}'.")
+                global_values[name] = stack[-1]
+                ip += 1
+            elif op == OpCode.RESERVE:
+                stack.extend([None] * code[ip])
+                ip += 1
+            elif op == OpCode.POPN:
+                del stack[-code[ip]:]
+                ip += 1
+            elif op == OpCode.RETURN:
+                return
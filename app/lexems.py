@@ -6,6 +6,8 @@ lexems: Dict[str, TokenType] = {
     ")": TokenType.RIGHT_PAREN,
     "{": TokenType.LEFT_BRACE,
     "}": TokenType.RIGHT_BRACE,
+    "[": TokenType.LEFT_BRACKET,
+    "]": TokenType.RIGHT_BRACKET,
     ",": TokenType.COMMA,
     ".": TokenType.DOT,
     "*": TokenType.STAR,
@@ -45,5 +47,7 @@ statements: Set[TokenType] = {
     TokenType.RETURN
 }
 
+# Most arguments a call and parameters a function can have
+max_arguments = 255
 
 special: Set[str] = {"//", }
@@ -0,0 +1,81 @@
+"""Parse time and AST memory with the generated __slots__ node classes against the same classes generated
+without __slots__ (how Expr.py/Stmt.py used to be), on a large generated script.
+
+    python -m benchmarks.bench_ast [megabytes]
+"""
+import gc
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import app.Parser
+from app.RegexScanner import RegexScanner
+from benchmarks.bench_scanner import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+from tools import define_ast  # noqa: E402
+
+node_names = ["Binary", "Unary", "Literal", "Grouping", "Variable", "Assign", "Print", "Expression", "Var", "Block"]
+
+
+def dict_nodes() -> dict:
+    """Node classes generated without __slots__, loaded from a temporary directory"""
+    directory = tempfile.mkdtemp()
+    classes = {}
+    for base_name in ("Expr", "Stmt"):
+        define_ast(directory, base_name, slots=False)
+        module_spec = importlib.util.spec_from_file_location(f"dict_{base_name}",
+                                                             os.path.join(directory, base_name + ".py"))
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+        classes.update({name: getattr(module, name) for name in node_names if hasattr(module, name)})
+    return classes
+
+
+def measure(tokens, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        app.Parser.Parser(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    statements = app.Parser.Parser(tokens).parse()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return best, size, statements
+
+
+def count_nodes(node) -> int:
+    if isinstance(node, list):
+        return sum(count_nodes(item) for item in node)
+    slots = getattr(type(node), "__slots__", None)
+    names = slots if slots else getattr(node, "__dict__", {}).keys()
+    total = 1
+    for name in names:
+        value = getattr(node, name)
+        if isinstance(value, list) or hasattr(value, "accept"):
+            total += count_nodes(value)
+    return total
+
+
+def main(megabytes: float = 2.0, repeat: int = 3) -> None:
+    tokens = RegexScanner(generate(megabytes)).scan_tokens()
+    with patch.multiple(app.Parser, **dict_nodes()):
+        dict_time, dict_size, statements = measure(tokens, repeat)
+    nodes = count_nodes(statements)
+    del statements
+    slot_time, slot_size, _ = measure(tokens, repeat)
+    print(f"{nodes} AST nodes from {len(tokens)} tokens")
+    print(f"{'':<12} {'parse':>9} {'AST memory':>11} {'bytes/node':>11}")
+    print(f"{'__dict__':<12} {dict_time:8.2f}s {dict_size / 1e6:9.1f}MB {dict_size / nodes:11.1f}")
+    print(f"{'__slots__':<12} {slot_time:8.2f}s {slot_size / 1e6:9.1f}MB {slot_size / nodes:11.1f}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0)
@@ -0,0 +1,90 @@
+"""Execution time of the run engines on a generated arithmetic-heavy script.
+
+Lox has no loops yet, so "loop-heavy" is approximated by unrolling: the script repeats a block of
+local arithmetic many times. Scanning, parsing and resolving are done once and excluded. Each engine is
+split into prepare (compiling, once per program) and execute (what a loop body would pay per iteration),
+both reported as the best of several runs.
+
+    python -m benchmarks.bench_engines [iterations]
+"""
+import contextlib
+import io
+import sys
+import time
+
+from app.Parser import Parser
+from app.Resolver import Resolver
+from app.Scanner import Scanner
+
+
+def generate(iterations: int) -> str:
+    lines = ["var total = 0;"]
+    for i in range(iterations):
+        lines.append("{")
+        lines.append(f"  var a = {i}; var b = a * 2 + 1; var c = (a - b) / 3;")
+        lines.append("  { var d = a * b - c * c + (a + b) * (b - c); total = total + d / (b + 1); }")
+        lines.append("  total = total - c * 2 + -a;")
+        lines.append("}")
+    lines.append("print total;")
+    return "\n".join(lines)
+
+
+def prepare_tree(statements):
+    from app.Interpreter import Interpreter
+    return lambda: Interpreter().interpret(statements)
+
+
+def prepare_vm(statements):
+    from app.Compiler import Compiler
+    from app.VM import VM
+    chunk = Compiler().compile(statements)
+    return lambda: VM().interpret(chunk)
+
+
+def prepare_closure(statements):
+    from app.ClosureCompiler import ClosureCompiler
+    program = ClosureCompiler().compile(statements)
+    return program
+
+
+def prepare_python(statements):
+    from app.Transpiler import Transpiler
+    namespace = Transpiler.namespace()
+    exec(compile(Transpiler().transpile(statements), "<lox>", "exec"), namespace)
+    return lambda: namespace["_lox_main"]({})
+
+
+engines = {
+    "tree": prepare_tree,
+    "vm": prepare_vm,
+    "closure": prepare_closure,
+    "python": prepare_python,
+}
+
+
+def best_of(repeat: int, function):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            start = time.perf_counter()
+            result = function()
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(iterations: int = 2000, repeat: int = 7) -> None:
+    source = generate(iterations)
+    statements = Parser(Scanner(source).scan_tokens()).parse()
+    Resolver().resolve(statements)
+    baseline = None
+    print(f"{'engine':<10} {'prepare':>10} {'execute':>10} {'speedup':>8}")
+    for name, prepare in engines.items():
+        prepare_time, program = best_of(repeat, lambda: prepare(statements))
+        execute_time, _ = best_of(repeat, program)
+        baseline = baseline or execute_time
+        print(f"{name:<10} {prepare_time * 1000:8.2f}ms {execute_time * 1000:8.2f}ms {baseline / execute_time:7.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
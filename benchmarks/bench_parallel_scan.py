@@ -0,0 +1,40 @@
+"""Scanning a large generated source into a TokenBuffer on one process (RegexScanner.scan_buffer) and with
+--scan-jobs on 2, 4, ... worker processes up to the number of cores. The parallel time includes the chunking
+pre-pass, starting the pool and stitching the arrays, so small sources or a single core show only the overhead.
+
+    python -m benchmarks.bench_parallel_scan [megabytes]
+"""
+import os
+import sys
+import time
+from typing import Callable
+
+from app.ParallelScanner import scan_parallel
+from app.RegexScanner import RegexScanner
+from benchmarks.bench_scanner import generate
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(megabytes: float = 32.0, repeat: int = 3) -> None:
+    source = generate(megabytes)
+    cores = os.cpu_count() or 1
+    sequential = best_time(lambda: RegexScanner(source).scan_buffer(), repeat)
+    print(f"{len(source) / 1e6:.1f}M chars, {cores} cores")
+    print(f"{'sequential':<12} {sequential:7.2f}s {len(source) / sequential / 1e6:7.2f} Mchars/s")
+    jobs = 2
+    while jobs <= max(2, cores):
+        best = best_time(lambda: scan_parallel(source, jobs), repeat)
+        print(f"{f'{jobs} jobs':<12} {best:7.2f}s {len(source) / best / 1e6:7.2f} Mchars/s  {sequential / best:5.2f}x")
+        jobs *= 2
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 32.0)
@@ -0,0 +1,66 @@
+"""Parse throughput, tokens per second, of Parser on a file of print statements with generated expressions and of
+ExprParser on one long expression. Tokens are scanned once beforehand, only parsing is timed.
+
+    python -m benchmarks.bench_parser [megabytes]
+"""
+import random
+import sys
+from typing import List
+
+from app.ExprParser import ExprParser
+from app.Parser import Parser
+from app.Scanner import Scanner
+from benchmarks.bench_engines import best_of
+
+binary_operators = ["+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">="]
+
+
+def expression(depth: int, rng: random.Random) -> str:
+    """Random expression mixing every precedence level, groupings, unary operators, arrays and indexing"""
+    if depth == 0:
+        return rng.choice([str(rng.randint(0, 999)), '"text"', "true", "nil", f"v{rng.randint(0, 9)}"])
+    kind = rng.random()
+    if kind < 0.6:
+        return f"{expression(depth - 1, rng)} {rng.choice(binary_operators)} {expression(depth - 1, rng)}"
+    if kind < 0.75:
+        return f"({expression(depth - 1, rng)})"
+    if kind < 0.85:
+        return f"{rng.choice('-!')}{expression(depth - 1, rng)}"
+    if kind < 0.95:
+        return f"[{expression(depth - 1, rng)}, {expression(depth - 1, rng)}][0]"
+    return f"f({expression(depth - 1, rng)}, {expression(depth - 1, rng)})"
+
+
+def generate(megabytes: float, seed: int = 24) -> str:
+    rng = random.Random(seed)
+    lines: List[str] = [f"var v{i} = {i};" for i in range(10)]
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        line = f"print {expression(5, rng)};"
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def flat_expression(megabytes: float) -> str:
+    """One expression for ExprParser: terms joined by operators of every level, no nesting"""
+    rng = random.Random(24)
+    parts: List[str] = [str(rng.randint(0, 999))]
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        part = f" {rng.choice(binary_operators)} {rng.choice(['-', '!', ''])}{rng.randint(0, 999)}"
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def main(megabytes: float = 2.0, repeat: int = 3) -> None:
+    print(f"{'parser':<12} {'tokens':>10} {'best ms':>10} {'tokens/s':>12}")
+    for parser, source in ((Parser, generate(megabytes)), (ExprParser, flat_expression(megabytes))):
+        tokens = Scanner(source).scan_tokens()
+        best = best_of(repeat, lambda: parser(tokens).parse())[0]
+        print(f"{parser.__name__:<12} {len(tokens):>10} {best * 1000:10.1f} {len(tokens) / best:12,.0f}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0)
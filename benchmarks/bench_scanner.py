@@ -0,0 +1,48 @@
+"""Characters per second of Scanner and RegexScanner on a generated multi-megabyte source.
+
+    python -m benchmarks.bench_scanner [megabytes]
+"""
+import sys
+import time
+
+from app.RegexScanner import RegexScanner
+from app.Scanner import Scanner
+
+
+def generate(megabytes: float) -> str:
+    block = """// generated block {i}
+var total_{i} = (60 * 60 * 24) + {i}.5;
+{{
+  var name = "item number {i}";
+  total_{i} = total_{i} * 2 - -1 >= 3 != !false;
+  print name + "suffix";
+}}
+"""
+    parts = []
+    size = 0
+    i = 0
+    while size < megabytes * 1024 * 1024:
+        part = block.format(i=i)
+        parts.append(part)
+        size += len(part)
+        i += 1
+    return "".join(parts)
+
+
+def main(megabytes: float = 4.0, repeat: int = 3) -> None:
+    source = generate(megabytes)
+    results = {}
+    for scanner in (Scanner, RegexScanner):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tokens = scanner(source).scan_tokens()
+            best = min(best, time.perf_counter() - start)
+        results[scanner.__name__] = best
+        print(f"{scanner.__name__:<14} {len(source) / best / 1e6:7.2f} Mchars/s  {len(tokens) / best / 1e6:6.2f} "
+              f"Mtokens/s  ({best:.2f}s for {len(source) / 1e6:.1f}M chars)")
+    print(f"speedup {results['Scanner'] / results['RegexScanner']:.2f}x")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 4.0)
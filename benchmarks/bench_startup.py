@@ -0,0 +1,70 @@
+"""Startup cost of each command: wall time until the first line of output (the first token for tokenize) and until
+exit, the median of several fresh processes, next to a bare `python -c pass`. A second pass runs the command under
+`-X importtime` and reports the app modules it loaded and the slowest imports.
+
+    python -m benchmarks.bench_startup [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+commands = ["tokenize", "parse", "evaluate", "run"]
+sources = {
+    "tokenize": 'var a = "x";\nprint a + "y";\n',
+    "parse": "(1 + 2) * -3 == 4",
+    "evaluate": "(1 + 2) * -3 == 4",
+    "run": 'var a = "x";\nprint a + "y";\n',
+}
+
+
+def time_process(args: List[str]) -> Tuple[float, float]:
+    """Seconds until the first line on stdout and until the process exits"""
+    start = time.perf_counter()
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    process.stdout.readline()
+    first = time.perf_counter() - start
+    process.stdout.read()
+    process.wait()
+    return first, time.perf_counter() - start
+
+
+def import_times(args: List[str]) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every import `-X importtime` reports"""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "self [us]" not in line:
+            own, cumulative, name = line[len("import time:"):].split("|")
+            rows.append((name.strip(), int(own), int(cumulative)))
+    return rows
+
+
+def main(runs: int = 15) -> None:
+    directory = tempfile.mkdtemp()
+    baseline = statistics.median(time_process([sys.executable, "-c", "print()"])[0] for _ in range(runs))
+    print(f"python -c 'print()'   {baseline * 1000:6.1f} ms\n")
+    print(f"{'command':<10} {'first line':>10} {'exit':>8} {'imports':>8}  app modules")
+    slowest: Dict[str, List[Tuple[str, int, int]]] = {}
+    for command in commands:
+        path = os.path.join(directory, command + ".lox")
+        with open(path, "w") as file:
+            file.write(sources[command])
+        args = ["-m", "app.main", command, path]
+        timings = [time_process([sys.executable] + args) for _ in range(runs)]
+        rows = import_times(args)
+        modules = [name for name, _, _ in rows if name.startswith("app.")]
+        total = sum(own for _, own, _ in rows)
+        slowest[command] = sorted(rows, key=lambda row: -row[1])[:5]
+        print(f"{command:<10} {statistics.median(t[0] for t in timings) * 1000:8.1f}ms "
+              f"{statistics.median(t[1] for t in timings) * 1000:6.1f}ms {total / 1000:6.1f}ms  {' '.join(modules)}")
+    print("\nslowest imports (self time)")
+    for command, rows in slowest.items():
+        print(f"{command:<10} " + ", ".join(f"{name} {own / 1000:.1f}ms" for name, own, _ in rows))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
@@ -0,0 +1,44 @@
+"""Cost of building a string from n pieces with `s = s + piece;` on the tree-walker, with ropes and with plain str
+concatenation (app.Rope.min_length raised so + never builds a rope). Plain concatenation copies the whole string
+every time, its time per piece grows with n; a rope's stays flat. The string is printed once at the end, so the
+join is included.
+
+    python -m benchmarks.bench_strings [largest n]
+"""
+import sys
+
+import app.Rope
+from app.Interpreter import Interpreter
+from app.Parser import Parser
+from app.Resolver import Resolver
+from app.Scanner import Scanner
+from benchmarks.bench_engines import best_of
+
+
+def generate(pieces: int) -> str:
+    lines = ['var s = "";', 'var piece = "lorem ipsum dolor sit amet, ";']
+    lines.extend("s = s + piece;" for _ in range(pieces))
+    lines.append("print s;")
+    return "\n".join(lines)
+
+
+def main(largest: int = 32000, repeat: int = 5) -> None:
+    print(f"{'pieces':>8} {'str ms':>10} {'us/piece':>9} {'rope ms':>10} {'us/piece':>9} {'speedup':>8}")
+    default = app.Rope.min_length
+    pieces = largest // 16
+    while pieces <= largest:
+        statements = Parser(Scanner(generate(pieces)).scan_tokens()).parse()
+        Resolver().resolve(statements)
+        times = []
+        for min_length in (sys.maxsize, default):
+            app.Rope.min_length = min_length
+            times.append(best_of(repeat, lambda: Interpreter().interpret(statements))[0])
+        app.Rope.min_length = default
+        plain, rope = times
+        print(f"{pieces:>8} {plain * 1000:8.2f}ms {plain / pieces * 1e6:9.2f} {rope * 1000:8.2f}ms "
+              f"{rope / pieces * 1e6:9.2f} {plain / rope:7.2f}x")
+        pieces *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 32000)
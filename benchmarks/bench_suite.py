@@ -0,0 +1,165 @@
+"""Benchmark suite: every workload of benchmarks/workloads.py through each phase of the pipeline.
+
+    scan      Scanner, tokens/s (every workload)
+    parse     Parser or ExprParser, nodes/s
+    resolve   Resolver, nodes/s
+    execute   Interpreter statements/s, or Evaluator nodes/s for expressions
+
+Every measurement is warmed up, repeated, and summarized (min, median, mean, standard deviation); rates use the
+median. --json writes the results with the commit and Python version, --compare prints the change in rate
+between two such files.
+
+    python -m benchmarks.bench_suite [--scale=1] [--repeat=5] [--warmup=1] [--only=name,...] [--json=file]
+    python -m benchmarks.bench_suite --compare old.json new.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.Evaluator import Evaluator
+from app.ExprParser import ExprParser
+from app.Interpreter import Interpreter
+from app.Parser import Parser
+from app.Resolver import Resolver
+from app.Scanner import Scanner
+from app.Expr import expr_dispatch
+from app.Stmt import Block, stmt_dispatch
+from benchmarks.workloads import workloads
+
+node_types = set(expr_dispatch) | set(stmt_dispatch)
+
+
+def walk(value: Any) -> Iterator[Any]:
+    """Every node of a tree or a list of trees"""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if type(value) is list:
+            stack.extend(value)
+        elif type(value) in node_types:
+            yield value
+            stack.extend(getattr(value, name) for name in type(value).__slots__)
+
+
+def count_statements(statements: List[Any]) -> int:
+    """Statements executed by a straight-line program, the ones inside blocks included"""
+    return sum(1 + (count_statements(stmt.statements) if type(stmt) is Block else 0) for stmt in statements)
+
+
+def timed(function: Callable[[], Any], number: int) -> float:
+    """Seconds per call of number back to back calls, output swallowed, collector settled first"""
+    gc.collect()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        return (time.perf_counter() - start) / number
+
+
+def measure(function: Callable[[], Any], repeat: int, warmup: int, min_time: float = 0.02) -> List[float]:
+    """Seconds per call over repeat timed runs. Like timeit's autorange, small workloads are called enough
+    times per run to last min_time, so timer resolution and noise do not swamp them. Calibrating counts as
+    the first warmup run."""
+    number = 1
+    while timed(function, number) * number < min_time and number < 1_000_000:
+        number *= 10
+    for _ in range(warmup - 1):
+        timed(function, number)
+    return [timed(function, number) for _ in range(repeat)]
+
+
+def summarize(workload: str, phase: str, unit: str, count: int, times: List[float]) -> Dict[str, Any]:
+    median = statistics.median(times)
+    return {
+        "workload": workload, "phase": phase, "unit": unit, "count": count, "times": times,
+        "min": min(times), "median": median, "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "rate": count / median if median else float("inf"),
+    }
+
+
+def run_workload(name: str, kind: str, source: str, repeat: int, warmup: int) -> List[Dict[str, Any]]:
+    tokens = Scanner(source).scan_tokens()
+    results = [summarize(name, "scan", "tokens/s", len(tokens),
+                         measure(lambda: Scanner(source).scan_tokens(), repeat, warmup))]
+    if kind == "source":
+        return results
+    parser = ExprParser if kind == "expression" else Parser
+    tree = parser(tokens).parse()
+    nodes = sum(1 for _ in walk(tree))
+    results.append(summarize(name, "parse", "nodes/s", nodes,
+                             measure(lambda: parser(tokens).parse(), repeat, warmup)))
+    if kind == "expression":
+        results.append(summarize(name, "execute", "nodes/s", nodes,
+                                 measure(lambda: Evaluator().interpret(tree), repeat, warmup)))
+        return results
+    # Resolving only annotates Variable and Assign nodes, so resolving the same tree again costs the same
+    results.append(summarize(name, "resolve", "nodes/s", nodes,
+                             measure(lambda: Resolver().resolve(tree), repeat, warmup)))
+    results.append(summarize(name, "execute", "statements/s", count_statements(tree),
+                             measure(lambda: Interpreter().interpret(tree), repeat, warmup)))
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path) as file:
+        old = {(r["workload"], r["phase"]): r for r in json.load(file)["results"]}
+    with open(new_path) as file:
+        new = json.load(file)["results"]
+    print(f"{'workload':<18} {'phase':<8} {'old':>12} {'new':>12} {'change':>8}")
+    for result in new:
+        before = old.get((result["workload"], result["phase"]))
+        if before is None:
+            continue
+        print(f"{result['workload']:<18} {result['phase']:<8} {before['rate']:12,.0f} {result['rate']:12,.0f} "
+              f"{(result['rate'] / before['rate'] - 1) * 100:+7.1f}%")
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description="Lox benchmark suite")
+    parser.add_argument("--scale", type=float, default=1.0, help="size of generated workloads")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--only", help="comma separated workload names")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return
+    # The recursive Parser and Interpreter need a little headroom on the deepest workloads
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    selected = workloads(args.scale)
+    if args.only:
+        selected = {name: selected[name] for name in args.only.split(",")}
+    results = []
+    print(f"{'workload':<18} {'phase':<8} {'count':>9} {'median':>10} {'stdev':>8} {'rate':>16}")
+    for name, (kind, source) in selected.items():
+        for result in run_workload(name, kind, source, args.repeat, args.warmup):
+            results.append(result)
+            print(f"{name:<18} {result['phase']:<8} {result['count']:9} {result['median'] * 1000:8.2f}ms "
+                  f"{result['stdev'] / result['median'] * 100:7.1f}% {result['rate']:12,.0f} {result['unit']}")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"commit": git_commit(), "python": platform.python_version(), "scale": args.scale,
+                       "repeat": args.repeat, "warmup": args.warmup, "results": results}, file, indent=1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,49 @@
+"""Memory per token: a list of Token objects (with a __dict__ as they used to be, and with __slots__)
+against a TokenBuffer. Measured with tracemalloc on a generated source, the source itself not counted.
+
+    python -m benchmarks.bench_token_memory [megabytes]
+"""
+import sys
+import tracemalloc
+
+from app.RegexScanner import RegexScanner
+from benchmarks.bench_scanner import generate
+
+
+class DictToken:
+    """Token as it was before __slots__: every instance carries a __dict__"""
+
+    def __init__(self, token_type, lexeme, literal, line) -> None:
+        self.token_type = token_type
+        self.lexeme = lexeme
+        self.literal = literal
+        self.line = line
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(megabytes: float = 2.0) -> None:
+    source = generate(megabytes)
+    tokens = RegexScanner(source).scan_tokens()
+    count = len(tokens)
+    del tokens
+    rows = {
+        "Token (__dict__)": measure(
+            lambda: [DictToken(t.token_type, t.lexeme, t.literal, t.line) for t in RegexScanner(source).stream()]),
+        "Token (__slots__)": measure(lambda: RegexScanner(source).scan_tokens()),
+        "TokenBuffer": measure(lambda: RegexScanner(source).scan_buffer()),
+    }
+    print(f"{count} tokens from {len(source) / 1e6:.1f}M chars ({len(source.encode()) / count:.1f} source bytes/token)")
+    for name, size in rows.items():
+        print(f"{name:<18} {size / 1e6:8.1f} MB  {size / count:6.1f} bytes/token")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0)
@@ -0,0 +1,104 @@
+"""Lox programs for the benchmark suite. Generated workloads are scaled by a factor so a quick run can use a
+fraction of the full size; hand-written programs live in benchmarks/programs and are used as they are.
+
+Lox has no loops yet, so every workload is straight-line code: its size is its running time.
+Trees are kept within what the recursive Parser and Interpreter handle at the default recursion limit."""
+import math
+import os
+import random
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.bench_engines import generate as arithmetic_program
+from benchmarks.bench_scanner import generate as scanner_source
+
+programs_dir = os.path.join(os.path.dirname(__file__), "programs")
+
+
+def balanced_expression(depth: int, rng: random.Random) -> str:
+    """Complete binary tree of arithmetic and comparisons with 2 ** depth number leaves"""
+    if depth == 0:
+        return str(rng.randint(1, 99))
+    operator = rng.choice("+-*")
+    return f"({balanced_expression(depth - 1, rng)} {operator} {balanced_expression(depth - 1, rng)})"
+
+
+def deep_expressions(scale: float) -> str:
+    rng = random.Random(14)
+    count = max(1, int(200 * scale))
+    return "\n".join(f"print {balanced_expression(8, rng)} > {rng.randint(0, 99)};" for _ in range(count))
+
+
+def deep_expression(scale: float) -> str:
+    """One expression for ExprParser and Evaluator, as deep as scale allows"""
+    return balanced_expression(max(1, min(14, 12 + round(math.log2(scale)))), random.Random(14))
+
+
+def var_chains(scale: float) -> str:
+    count = max(1, int(20000 * scale))
+    lines = ["var v0 = 1;"]
+    for i in range(1, count):
+        lines.append(f"var v{i} = v{i - 1} + {i % 7};")
+        if i % 3 == 0:
+            lines.append(f"v{i - 1} = v{i} * 2 - v{i - 2};")
+    lines.append(f"print v{count - 1};")
+    return "\n".join(lines)
+
+
+def nested_blocks(scale: float, depth: int = 40) -> str:
+    """Blocks nested depth deep, each declaring and shadowing locals of the enclosing blocks"""
+    parts: List[str] = []
+    for n in range(max(1, int(100 * scale))):
+        opening = "".join(f"{{ var a = {i}; var b{i} = a + {n}; a = a * b{i}; " for i in range(depth))
+        parts.append("var a = 0;" + opening + "print a;" + "}" * depth)
+    return "\n".join(parts)
+
+
+def string_building(scale: float) -> str:
+    count = max(1, int(5000 * scale))
+    lines = ['var s = "";', 'var piece = "lorem ipsum ";']
+    for i in range(count):
+        lines.append(f's = s + piece + "{i}";' if i % 2 else "s = s + piece;")
+    lines.append('print s == "";')
+    return "\n".join(lines)
+
+
+def function_calls(scale: float) -> str:
+    """Calls with arguments, locals and closures, each call a fresh frame"""
+    count = max(1, int(5000 * scale))
+    lines = ["fun mix(a, b) { var c = a * 2; { var d = c - b; return d / 2 + b; } }",
+             "fun adder(n) { fun add(x) { return x + n; } return add; }",
+             "var plus3 = adder(3);", "var total = 0;"]
+    for i in range(count):
+        lines.append(f"total = mix(total, {i % 11}) + plus3({i % 5});" if i % 2 else f"total = plus3(mix({i}, total));")
+    lines.append("print total;")
+    return "\n".join(lines)
+
+
+def hand_written() -> Dict[str, str]:
+    result = {}
+    for name in sorted(os.listdir(programs_dir)):
+        if name.endswith(".lox"):
+            with open(os.path.join(programs_dir, name)) as file:
+                result[name[:-len(".lox")]] = file.read()
+    return result
+
+
+# Name -> (kind, source for a scale), kind "program" runs through Parser and Interpreter, "expression" through
+# ExprParser and Evaluator, "source" is only scanned
+generated: Dict[str, Tuple[str, Callable[[float], str]]] = {
+    "deep_expressions": ("program", deep_expressions),
+    "deep_expression": ("expression", deep_expression),
+    "var_chains": ("program", var_chains),
+    "nested_blocks": ("program", nested_blocks),
+    "string_building": ("program", string_building),
+    "function_calls": ("program", function_calls),
+    "arithmetic": ("program", lambda scale: arithmetic_program(max(1, int(2000 * scale)))),
+    "scanner_4mb": ("source", lambda scale: scanner_source(4 * scale)),
+}
+
+
+def workloads(scale: float = 1.0) -> Dict[str, Tuple[str, str]]:
+    """Name -> (kind, source) of every workload at scale"""
+    result = {name: (kind, make(scale)) for name, (kind, make) in generated.items()}
+    result.update({name: ("program", source) for name, source in hand_written().items()})
+    return result
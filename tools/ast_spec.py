@@ -0,0 +1,36 @@
+"""The one description of the AST. tools.py generates app/Expr.py and app/Stmt.py from it.
+
+Every node is (class name, visitor method, fields, annotations). Fields are constructor arguments,
+annotations are slots with their initial value, an expression over the fields. Some are filled in later by
+a pass (the Resolver), some are derived from the fields once when the node is built."""
+
+expr_nodes = [
+    ("Binary", "visit_binary", ["left: Expr", "operator: Token", "right: Expr"],
+     ["op: Any = LazyOperators.binary"]),
+    ("Grouping", "visit_grouping", ["expression: Expr"], []),
+    ("Literal", "visit_literal", ["value: Any"], []),
+    ("Unary", "visit_unary", ["operator: Token", "right: Expr"], ["op: Any = LazyOperators.unary"]),
+    ("Variable", "visit_variable_expr", ["name: Token"], ["depth: Optional[int] = None", "slot: Optional[int] = None"]),
+    ("Assign", "visit_assign", ["name: Token", "value: Expr"],
+     ["depth: Optional[int] = None", "slot: Optional[int] = None"]),
+    ("ArrayLiteral", "visit_array_literal", ["bracket: Token", "elements: List[Expr]"], []),
+    ("Index", "visit_index", ["target: Expr", "bracket: Token", "index: Expr"], []),
+    ("Call", "visit_call", ["callee: Expr", "paren: Token", "arguments: List[Expr]"], []),
+]
+
+stmt_nodes = [
+    ("Expression", "visit_expression", ["expression: Expr"], []),
+    ("Print", "visit_print", ["expression: Expr"], []),
+    ("Var", "visit_variable_stm", ["name: Token", "initializer: Expr"], ["slot: Optional[int] = None"]),
+    ("Block", "visit_block_stmt", ["statements: List[Stmt]"], ["slot_count: int = 0"]),
+    ("Function", "visit_function", ["name: Token", "params: List[Token]", "body: List[Stmt]"],
+     ["slot: Optional[int] = None", "slot_count: int = 0"]),
+    ("Return", "visit_return", ["keyword: Token", "value: Optional[Expr]"], []),
+]
+
+# Base name -> (nodes, what an unimplemented visitor method does, modules the generated file imports)
+spec = {
+    "Expr": (expr_nodes, "raise NotImplementedError()",
+             ["from app import LazyOperators", "from app.Token import Token"]),
+    "Stmt": (stmt_nodes, "raise NotImplementedError()", ["from app.Expr import Expr", "from app.Token import Token"]),
+}
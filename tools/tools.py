@@ -1,36 +1,70 @@
 import os
 import sys
+from typing import List, TextIO, Tuple
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ast_spec import spec  # noqa: E402
 
-def define_ast(output, base_name, types):
-    path = os.path.join(output + f"{base_name}.py")
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
 
-    with open(path, 'w') as file:
-        file.write(f"from typing import Any\n\n")
-        file.write(f"class {base_name}:\n")
-        file.write(f"    def accept(self, visitor: 'Visitor') -> Any:\n")
-        file.write(f"        raise NotImplementedError()\n\n")
 
-        for type_name in types:
-            file.write(f"class {type_name}({base_name}):\n")
-            file.write(f"    def __init__(self, ")
+def define_ast(output_dir: str, base_name: str, slots: bool = True) -> None:
+    """Writes <base_name>.py with the base class, its visitor, every node class and the dispatch table"""
+    nodes, default_body, imports = spec[base_name]
+    path = os.path.join(output_dir, base_name + ".py")
+    with open(path, 'w') as f:
+        f.write(f"# Generated by tools/tools.py from tools/ast_spec.py, do not edit by hand.\n")
+        f.write("from __future__ import annotations\n\n")
+        f.write("from typing import Any, Dict, List, Optional\n\n")
+        for line in imports:
+            f.write(line + "\n")
+        f.write("\n\n")
+        f.write(f"class {base_name}:\n")
+        if slots:
+            f.write("    __slots__ = ()\n\n")
+        f.write(f"    def accept(self, visitor: {base_name}Visitor) -> Any:\n")
+        f.write("        raise NotImplementedError()\n\n\n")
+        define_visitor(f, base_name, nodes, default_body)
+        for class_name, method, fields, annotations in nodes:
+            define_type(f, base_name, class_name, method, fields, annotations, slots)
+        f.write("# Node class -> visitor method name, for visitors that dispatch on type(node) instead of accept()\n")
+        f.write(f"{base_name.lower()}_dispatch: Dict[type, str] = {{\n")
+        for class_name, method, _, _ in nodes:
+            f.write(f"    {class_name}: '{method}',\n")
+        f.write("}\n")
 
-            file.write(f"*args) -> None:\n")
-            file.write(f"        super().__init__()\n")
 
-            file.write(f"\n")
+def define_visitor(f: TextIO, base_name: str, nodes: List[Tuple], default_body: str) -> None:
+    f.write(f"class {base_name}Visitor:\n")
+    for index, (class_name, method, _, _) in enumerate(nodes):
+        if index:
+            f.write("\n")
+        f.write(f"    def {method}(self, {base_name.lower()}: {class_name}) -> Any:\n")
+        f.write(f"        {default_body}\n")
+    f.write("\n\n")
 
-            file.write(f"    def accept(self, visitor: 'Visitor') -> Any:\n")
-            file.write(f"        return visitor.visit_{type_name.lower()}(self)\n\n")
+
+def define_type(f: TextIO, base_name: str, class_name: str, method: str, fields: List[str],
+                annotations: List[str], slots: bool) -> None:
+    names = [field.split(":")[0].strip() for field in fields]
+    annotated = [annotation.split(":")[0].strip() for annotation in annotations]
+    f.write(f"class {class_name}({base_name}):\n")
+    if slots:
+        f.write(f"    __slots__ = {tuple(names + annotated)!r}\n\n")
+    f.write(f"    def __init__(self, {', '.join(fields)}) -> None:\n")
+    for name in names:
+        f.write(f"        self.{name} = {name}\n")
+    for annotation in annotations:
+        declaration, value = annotation.split("=")
+        f.write(f"        self.{declaration.strip()} = {value.strip()}\n")
+    f.write("\n")
+    f.write(f"    def accept(self, visitor: {base_name}Visitor) -> Any:\n")
+    f.write(f"        return visitor.{method}(self)\n\n")
+    f.write("    def __repr__(self) -> str:\n")
+    arguments = ", ".join(f"{name}={{self.{name}!r}}" for name in names)
+    f.write(f"        return f\"{class_name}({arguments})\"\n\n\n")
 
 
 if __name__ == "__main__":
-    output_dir = "../app/"
-
-    define_ast(output_dir, "Expr", [
-        "Binary",
-        "Grouping",
-        "Literal",
-        "Unary",
-        "Variable",
-    ])
+    define_ast(APP_DIR, "Expr")
+    define_ast(APP_DIR, "Stmt")